@@ -9,7 +9,7 @@ import sys
 # Add the src directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
 
-from src.models.database import Base, Article, Comment, ApiKey
+from src.models.database import Base, Article, Comment, ApiKey, TagCount
 from src.config import settings
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,45 @@
+"""Add GIN index on articles.tag_list and tag_counts table
+
+Revision ID: 007_tag_index_counts
+Revises: 006_api_keys
+Create Date: 2025-02-03 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_tag_index_counts'
+down_revision = '006_api_keys'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GIN index for tag filters (overlap / containment)
+    op.create_index('ix_articles_tag_list', 'articles', ['tag_list'], postgresql_using='gin')
+
+    # Per-tag counters for the tag cloud (PUBLISHED articles only)
+    op.create_table(
+        'tag_counts',
+        sa.Column('tag', sa.Text(), primary_key=True),
+        sa.Column('article_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.text('NOW()')),
+    )
+
+    # Backfill counters once from existing articles
+    op.execute(
+        """
+        INSERT INTO tag_counts (tag, article_count, updated_at)
+        SELECT t.tag, COUNT(DISTINCT a.id), NOW()
+        FROM articles a
+        CROSS JOIN LATERAL unnest(a.tag_list) AS t(tag)
+        WHERE a.status = 'PUBLISHED'
+        GROUP BY t.tag
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('tag_counts')
+    op.drop_index('ix_articles_tag_list', table_name='articles')
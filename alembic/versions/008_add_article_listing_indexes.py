@@ -0,0 +1,35 @@
+"""Add composite indexes for author and public article listings
+
+Revision ID: 008_article_listing_indexes
+Revises: 007_tag_index_counts
+Create Date: 2025-02-05 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_article_listing_indexes'
+down_revision = '007_tag_index_counts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Author pages: WHERE author_id = ? AND status = ? ORDER BY created_at DESC
+    op.create_index(
+        'ix_articles_author_status_created', 'articles', ['author_id', 'status', 'created_at']
+    )
+    # Public listings: WHERE status = 'PUBLISHED' ORDER BY created_at DESC
+    op.create_index('ix_articles_status_created', 'articles', ['status', 'created_at'])
+    
+    # Single-column indexes are now prefixes of the composite ones
+    op.drop_index('ix_articles_author_id', table_name='articles')
+    op.drop_index('ix_articles_status', table_name='articles')
+
+
+def downgrade():
+    op.create_index('ix_articles_status', 'articles', ['status'])
+    op.create_index('ix_articles_author_id', 'articles', ['author_id'])
+    op.drop_index('ix_articles_status_created', table_name='articles')
+    op.drop_index('ix_articles_author_status_created', table_name='articles')
@@ -0,0 +1,46 @@
+"""Add article_workflow_events for publication latency tracking
+
+Revision ID: 009_article_workflow_events
+Revises: 008_article_listing_indexes
+Create Date: 2025-03-10 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009_article_workflow_events'
+down_revision = '008_article_listing_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'article_workflow_events',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('article_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('step', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('task_id', sa.String(length=64), nullable=True),
+        sa.Column('attempt', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('enqueued_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('queue_wait_ms', sa.Float(), nullable=True),
+        sa.Column('run_ms', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # Per-article timeline and per-step windows for latency reports
+    op.create_index(
+        'ix_workflow_events_article_created', 'article_workflow_events', ['article_id', 'created_at']
+    )
+    op.create_index('ix_workflow_events_step_created', 'article_workflow_events', ['step', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_workflow_events_step_created', table_name='article_workflow_events')
+    op.drop_index('ix_workflow_events_article_created', table_name='article_workflow_events')
+    op.drop_table('article_workflow_events')
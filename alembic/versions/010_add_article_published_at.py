@@ -0,0 +1,41 @@
+"""Add articles.published_at (first publication time)
+
+Revision ID: 010_article_published_at
+Revises: 009_article_workflow_events
+Create Date: 2025-03-17 10:00:00.000000
+
+Set once when an article first becomes PUBLISHED and never changed afterwards; it is the
+partition key of notification_logs in the users DB. Already published articles take the
+time of their first published milestone, or updated_at when there is none.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010_article_published_at'
+down_revision = '009_article_workflow_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('articles', sa.Column('published_at', sa.DateTime(), nullable=True))
+    op.execute(
+        """
+        UPDATE articles
+        SET published_at = COALESCE(
+            (
+                SELECT min(created_at)
+                FROM article_workflow_events
+                WHERE article_workflow_events.article_id = articles.id AND step = 'published'
+            ),
+            updated_at,
+            created_at
+        )
+        WHERE status = 'PUBLISHED'
+        """
+    )
+
+
+def downgrade():
+    op.drop_column('articles', 'published_at')
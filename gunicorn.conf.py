@@ -0,0 +1,78 @@
+"""Production server: gunicorn master with uvicorn workers, one per available CPU.
+
+    gunicorn -c gunicorn.conf.py src.main:app
+
+The app is imported once in the master (preload_app) and forked into workers. Workers are
+replaced gracefully: SIGHUP re-reads this file and starts new workers before stopping old
+ones (with preload the application code itself is only reloaded by restarting the master,
+i.e. rolling the container), SIGTERM lets in-flight requests finish within graceful_timeout.
+
+Environment:
+    WEB_CONCURRENCY     number of workers (default: CPUs available to the container)
+    PORT                listen port (default 8000)
+    DB_MAX_CONNECTIONS  DB connections this container may open in total; split evenly into
+                        DB_POOL_SIZE per worker (with no overflow, minus the readiness probe's
+                        connection) unless DB_POOL_SIZE is set
+"""
+import logging
+import os
+import sys
+
+logger = logging.getLogger("gunicorn.error")
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: cgroup v2 quota, else CPU affinity"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+workers = int(os.getenv("WEB_CONCURRENCY") or 0) or available_cpus()
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+preload_app = True
+reload = False
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then (staggered) to bound memory growth
+max_requests = 10000
+max_requests_jitter = 1000
+# Worker heartbeat files in memory, not on the container's overlay filesystem
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = None  # the app writes its own JSON access log
+errorlog = "-"
+
+# Must be decided before the app (and its engines) are imported by preload
+if os.getenv("DB_MAX_CONNECTIONS") and not os.getenv("DB_POOL_SIZE"):
+    # One connection per worker is reserved for the readiness probe (src/utils/readiness.py)
+    os.environ["DB_POOL_SIZE"] = str(max(1, int(os.environ["DB_MAX_CONNECTIONS"]) // workers - 1))
+    os.environ["DB_MAX_OVERFLOW"] = "0"
+
+
+def when_ready(server):
+    logger.info(
+        "Serving with %s workers, DB pool per worker: %s (+%s overflow)",
+        workers,
+        os.getenv("DB_POOL_SIZE", "default"),
+        os.getenv("DB_MAX_OVERFLOW", "default"),
+    )
+
+
+def post_fork(server, worker):
+    # Connections opened by the master during preload must not be shared with workers
+    for module_name, attribute in (("src.models.database", "engine"), ("src.tasks.users_db", "users_engine")):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            getattr(module, attribute).dispose(close=False)
@@ -0,0 +1,147 @@
+"""Benchmark list endpoint serialization: Pydantic round trips vs compiled serializers + orjson.
+
+Legacy path mirrors what a route returning SuccessResponse with response_model=SuccessResponse
+costs: from_orm().dict() per item, SuccessResponse construction, FastAPI re-validation against
+response_model, JSON-mode dump and json.dumps in JSONResponse.render.
+No database is needed: rows are in-memory objects shaped like the ORM results.
+
+Usage:
+    python scripts/bench_serialization.py [--items 100] [--body-size 20000] [--repeat 200] [--json out.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.schemas import (  # noqa: E402
+    ArticleResponse,
+    ArticleSummaryResponse,
+    CommentResponse,
+    SuccessResponse,
+)
+from src.utils.serializers import (  # noqa: E402
+    serialize_article,
+    serialize_article_summary,
+    serialize_comment,
+    serialize_many,
+    success_response,
+)
+
+
+def make_article(body_size: int, excerpt: bool = False) -> SimpleNamespace:
+    now = datetime.utcnow()
+    article = SimpleNamespace(
+        id=uuid.uuid4(),
+        slug=f"article-{uuid.uuid4().hex[:8]}",
+        title="Benchmark article",
+        description="Article used for serialization benchmark",
+        body="x" * body_size,
+        tag_list=["python", "fastapi", "benchmark"],
+        author_id=uuid.uuid4(),
+        status="PUBLISHED",
+        preview_url="https://preview.example.com/preview.png",
+        created_at=now,
+        updated_at=now,
+    )
+    if excerpt:
+        article.excerpt = article.body[:200]
+    return article
+
+
+def make_comment() -> SimpleNamespace:
+    now = datetime.utcnow()
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        body="Great article, thanks!",
+        article_id=uuid.uuid4(),
+        author_id=uuid.uuid4(),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def legacy_path(schema, items, key: str) -> bytes:
+    response = SuccessResponse(
+        message="Items retrieved successfully",
+        data={key: [schema.from_orm(item).dict() for item in items], "count": len(items)},
+    )
+    # FastAPI serialize_response: dump, validate against response_model, dump in JSON mode
+    validated = SuccessResponse.model_validate(response.model_dump())
+    content = validated.model_dump(mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(serializer, items, key: str) -> bytes:
+    return success_response(
+        message="Items retrieved successfully",
+        data={key: serialize_many(serializer, items), "count": len(items)},
+    ).body
+
+
+def measure(func, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "p50_ms": round(statistics.median(timings), 4),
+        "p99_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 4),
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "payload_bytes": len(payload),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100, help="items per list response")
+    parser.add_argument("--body-size", type=int, default=20000, help="article body length")
+    parser.add_argument("--repeat", type=int, default=200, help="iterations per case")
+    parser.add_argument("--json", dest="json_path", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    articles = [make_article(args.body_size) for _ in range(args.items)]
+    summaries = [make_article(args.body_size, excerpt=True) for _ in range(args.items)]
+    comments = [make_comment() for _ in range(args.items)]
+
+    cases = {
+        "GET /api/articles (full)": (ArticleResponse, serialize_article, articles, "articles"),
+        "GET /api/articles (summary)": (ArticleSummaryResponse, serialize_article_summary, summaries, "articles"),
+        "GET /api/articles/{slug}/comments": (CommentResponse, serialize_comment, comments, "comments"),
+    }
+
+    results = {}
+    for name, (schema, serializer, items, key) in cases.items():
+        # Both paths must produce the same document
+        assert json.loads(legacy_path(schema, items, key)) == json.loads(fast_path(serializer, items, key))
+        legacy = measure(lambda: legacy_path(schema, items, key), args.repeat)
+        fast = measure(lambda: fast_path(serializer, items, key), args.repeat)
+        results[name] = {
+            "legacy": legacy,
+            "fast": fast,
+            "speedup_p50": round(legacy["p50_ms"] / fast["p50_ms"], 2) if fast["p50_ms"] else None,
+        }
+        print(
+            f"{name:40s} legacy p50 {legacy['p50_ms']:8.3f} ms | fast p50 {fast['p50_ms']:8.3f} ms "
+            f"| x{results[name]['speedup_p50']}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(
+                {"items": args.items, "body_size": args.body_size, "repeat": args.repeat, "results": results},
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""Load test both services with seeded, reproducible mixed workloads.
+
+Runs against a deployment seeded by scripts/seed_data.py (reads its manifest). Each virtual
+client is a thread with its own RNG derived from --seed, so the same seed, workload and
+concurrency issue the same request sequence. Per endpoint (route template) the report has
+request/error counts, status codes, p50/p90/p99/max latency, throughput and DB query counts
+(taken from the X-DB-Query-Count response header when the server exposes it).
+
+Workloads: read_heavy (listings, article pages, feeds, follower lists), publish_burst
+(create + publish articles), fanout (popular authors publish while followers read feeds),
+mixed (all of the above).
+
+Rate limiting counts all virtual clients as one IP: run targets with RATE_LIMIT_ENABLED=false.
+Tokens are minted locally with --secret-key, so it must match the services' SECRET_KEY.
+
+Usage:
+    python scripts/load_test.py --manifest seed.json --workload mixed --clients 16 --duration 60 \
+        --json results.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from jose import jwt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import settings  # noqa: E402
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+# (endpoint key, method, path, request kwargs, auth required)
+Request = Tuple[str, str, str, dict, bool]
+
+
+class Client:
+    """State of one virtual client: RNG, identity and HTTP session"""
+
+    def __init__(self, index: int, seed: int, manifest: dict, base_url: str, users_url: str, secret_key: str):
+        self.rng = random.Random(seed * 1000 + index)
+        self.manifest = manifest
+        self.base_url = base_url.rstrip("/")
+        self.users_url = users_url.rstrip("/")
+        self.user = self.rng.choice(manifest["users"])
+        self.secret_key = secret_key
+        self.session = requests.Session()
+        self.auth_headers = self.auth_headers_for(self.user)
+
+    def auth_headers_for(self, user: dict) -> dict:
+        token = jwt.encode(
+            {"sub": user["email"], "user_id": user["id"], "exp": datetime.utcnow() + timedelta(hours=12)},
+            self.secret_key,
+            algorithm=settings.algorithm,
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+
+def op_list_articles(client: Client) -> List[Request]:
+    params = {"limit": client.rng.choice([10, 20, 50]), "view": client.rng.choice(["full", "summary"])}
+    if client.rng.random() < 0.3:
+        params["tag"] = client.rng.choice(client.manifest["tags"])
+    if client.rng.random() < 0.3:
+        params["include_author"] = "true"
+    return [("GET /api/articles", "GET", "/api/articles/", {"params": params}, False)]
+
+
+def op_get_article(client: Client) -> List[Request]:
+    slug = client.rng.choice(client.manifest["published_slugs"])
+    return [
+        ("GET /api/articles/{slug}", "GET", f"/api/articles/{slug}", {}, False),
+        ("GET /api/articles/{slug}/comments", "GET", f"/api/articles/{slug}/comments", {}, False),
+    ]
+
+
+def op_tags(client: Client) -> List[Request]:
+    return [("GET /api/tags", "GET", "/api/tags/", {}, False)]
+
+
+def op_author_articles(client: Client) -> List[Request]:
+    author_id = client.rng.choice(client.manifest["popular_authors"] + [client.user["id"]])
+    return [(
+        "GET /api/profiles/{author_id}/articles",
+        "GET",
+        f"/api/profiles/{author_id}/articles",
+        {"params": {"limit": 20, "view": "summary"}},
+        False,
+    )]
+
+
+def op_feed(client: Client) -> List[Request]:
+    params = {"limit": 20, "view": client.rng.choice(["full", "summary"])}
+    return [("GET /api/feed", "GET", "/api/feed/", {"params": params}, True)]
+
+
+def op_followers(client: Client) -> List[Request]:
+    user_id = client.rng.choice(client.manifest["popular_authors"])
+    kind = client.rng.choice(["followers", "following"])
+    return [(
+        f"GET /api/users/{{user_id}}/{kind}",
+        "GET",
+        f"/api/users/{user_id}/{kind}",
+        {"params": {"limit": 50}},
+        False,
+    )]
+
+
+def op_batch_profiles(client: Client) -> List[Request]:
+    ids = [user["id"] for user in client.rng.sample(client.manifest["users"], 20)]
+    return [("POST /api/users/batch", "POST", "/api/users/batch", {"json": {"ids": ids}}, False)]
+
+
+def _publish(client: Client, as_user: Optional[dict] = None) -> List[Request]:
+    extra = {"as_user": as_user} if as_user else {}
+    title = f"Load test {client.rng.getrandbits(48):012x}"
+    article = {
+        "title": title,
+        "description": "Article created by scripts/load_test.py",
+        "body": "benchmark " * client.rng.randint(50, 500),
+        "tag_list": client.rng.sample(client.manifest["tags"], 2),
+    }
+    # Publish step needs the slug returned by the create step, see run_client
+    return [
+        ("POST /api/articles", "POST", "/api/articles/", {"json": article, **extra}, True),
+        ("POST /api/articles/{slug}/publish", "POST", "/api/articles/{slug}/publish", dict(extra), True),
+    ]
+
+
+def op_publish(client: Client) -> List[Request]:
+    return _publish(client)
+
+
+def op_popular_author_publish(client: Client) -> List[Request]:
+    # Publish as a popular author so fan-out reaches many followers
+    author_id = client.rng.choice(client.manifest["popular_authors"])
+    author = next(user for user in client.manifest["users"] if user["id"] == author_id)
+    return _publish(client, as_user=author)
+
+
+WORKLOADS: Dict[str, Dict[Callable, int]] = {
+    "read_heavy": {
+        op_list_articles: 30,
+        op_get_article: 20,
+        op_tags: 5,
+        op_author_articles: 10,
+        op_feed: 20,
+        op_followers: 10,
+        op_batch_profiles: 5,
+    },
+    "publish_burst": {
+        op_publish: 80,
+        op_list_articles: 20,
+    },
+    "fanout": {
+        op_popular_author_publish: 20,
+        op_feed: 80,
+    },
+    "mixed": {
+        op_list_articles: 25,
+        op_get_article: 15,
+        op_tags: 5,
+        op_author_articles: 10,
+        op_feed: 20,
+        op_followers: 8,
+        op_batch_profiles: 5,
+        op_publish: 8,
+        op_popular_author_publish: 4,
+    },
+}
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[dict]] = defaultdict(list)
+
+    def add(self, endpoint: str, status: Optional[int], latency_ms: float, queries: Optional[int]) -> None:
+        with self._lock:
+            self.samples[endpoint].append({"status": status, "latency_ms": latency_ms, "queries": queries})
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(samples: List[dict], elapsed: float) -> dict:
+    latencies = sorted(sample["latency_ms"] for sample in samples)
+    queries = sorted(sample["queries"] for sample in samples if sample["queries"] is not None)
+    statuses = Counter(str(sample["status"]) for sample in samples)
+    errors = sum(1 for sample in samples if sample["status"] is None or sample["status"] >= 500)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "status_counts": dict(sorted(statuses.items())),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p90": round(percentile(latencies, 0.90), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+            "mean": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        },
+        "db_queries": {
+            "mean": round(statistics.fmean(queries), 2),
+            "p99": percentile(queries, 0.99),
+            "max": queries[-1],
+        } if queries else None,
+    }
+
+
+def send(client: Client, recorder: Optional[Recorder], request: Request, timeout: float) -> Optional[requests.Response]:
+    endpoint, method, path, kwargs, auth = request
+    kwargs = dict(kwargs)
+    as_user = kwargs.pop("as_user", None)
+    headers = {}
+    if auth:
+        headers = client.auth_headers_for(as_user) if as_user else client.auth_headers
+    base = client.users_url if path.startswith("/api/users") else client.base_url
+
+    start = time.perf_counter()
+    try:
+        response = client.session.request(method, base + path, headers=headers, timeout=timeout, **kwargs)
+    except requests.RequestException:
+        response = None
+    latency_ms = (time.perf_counter() - start) * 1000
+    if recorder is not None:
+        queries = response.headers.get(QUERY_COUNT_HEADER) if response is not None else None
+        recorder.add(
+            endpoint,
+            response.status_code if response is not None else None,
+            latency_ms,
+            int(queries) if queries is not None else None,
+        )
+    return response
+
+
+def run_client(client: Client, workload: Dict[Callable, int], recorder: Recorder, deadline: float,
+               measure_from: float, max_operations: Optional[int], timeout: float) -> None:
+    operations, weights = list(workload), list(workload.values())
+    done = 0
+    while time.monotonic() < deadline and (max_operations is None or done < max_operations):
+        operation = client.rng.choices(operations, weights=weights)[0]
+        slug = None
+        for request in operation(client):
+            endpoint, method, path, kwargs, auth = request
+            if "{slug}" in path:
+                if slug is None:
+                    break
+                path = path.replace("{slug}", slug)
+            measuring = time.monotonic() >= measure_from
+            response = send(client, recorder if measuring else None, (endpoint, method, path, kwargs, auth), timeout)
+            if response is None or response.status_code >= 400:
+                break
+            if endpoint == "POST /api/articles":
+                slug = response.json().get("data", {}).get("slug")
+        done += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--manifest", default="seed.json", help="manifest written by seed_data.py")
+    parser.add_argument("--base-url", default="http://localhost", help="backend (or gateway) URL")
+    parser.add_argument("--users-url", help="users service URL (default: --base-url)")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="mixed")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent virtual clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds before measuring")
+    parser.add_argument("--operations", type=int, help="stop each client after this many operations")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--secret-key", default=os.getenv("SECRET_KEY", settings.secret_key))
+    parser.add_argument("--json", dest="json_path", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+
+    recorder = Recorder()
+    clients = [
+        Client(index, args.seed, manifest, args.base_url, args.users_url or args.base_url, args.secret_key)
+        for index in range(args.clients)
+    ]
+
+    started = time.monotonic()
+    measure_from = started + args.warmup
+    deadline = measure_from + args.duration
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(client, WORKLOADS[args.workload], recorder, deadline, measure_from, args.operations, args.timeout),
+            daemon=True,
+        )
+        for client in clients
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = max(0.001, time.monotonic() - max(measure_from, started))
+
+    endpoints = {endpoint: summarize(samples, elapsed) for endpoint, samples in sorted(recorder.samples.items())}
+    all_samples = [sample for samples in recorder.samples.values() for sample in samples]
+    results = {
+        "meta": {
+            "workload": args.workload,
+            "clients": args.clients,
+            "duration_s": round(elapsed, 2),
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+            "dataset": {"seed": manifest.get("seed"), "scale": manifest.get("scale"), "counts": manifest.get("counts")},
+            "base_url": args.base_url,
+            "started_at": datetime.utcnow().isoformat() + "Z",
+        },
+        "summary": summarize(all_samples, elapsed),
+        "endpoints": endpoints,
+    }
+
+    for endpoint, stats in endpoints.items():
+        queries = stats["db_queries"]["mean"] if stats["db_queries"] else "-"
+        print(
+            f"{endpoint:45s} n={stats['requests']:6d} err={stats['errors']:4d} "
+            f"p50={stats['latency_ms']['p50']:8.2f}ms p99={stats['latency_ms']['p99']:8.2f}ms "
+            f"rps={stats['throughput_rps']:8.2f} queries={queries}"
+        )
+    if any(str(status) == "429" for stats in endpoints.values() for status in stats["status_counts"]):
+        print("WARNING: got 429 responses, disable rate limiting on the target (RATE_LIMIT_ENABLED=false)")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
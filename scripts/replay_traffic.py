@@ -0,0 +1,247 @@
+"""Replay captured HTTP traffic (JSONL) against one or two builds and compare them.
+
+Each input line is a JSON object with at least "method" and "path" (query string included,
+or in a separate "query" field) and a timestamp "ts" (epoch seconds or ISO 8601). Optional
+"headers" and "body" (JSON value or string) are sent as captured. Lines without method/path
+are skipped, so access logs with extra fields can be replayed directly.
+
+Arrivals are open-loop: request i is sent at start + (ts_i - ts_0) / speed whether or not
+earlier requests have completed, so a slow build builds up queueing instead of silently
+lowering the offered load. Latency is measured from the scheduled send time (includes
+client-side queueing when --max-in-flight is reached) and reported together with service
+time. Endpoints are grouped by path template (UUIDs, numbers and article slugs replaced).
+
+With --candidate the same traffic is replayed against --baseline and then --candidate; the
+report compares status distributions and latency percentiles per endpoint and the command
+exits with status 1 if any endpoint regresses beyond --max-p99-regression or
+--max-error-rate-increase.
+
+Usage:
+    python scripts/replay_traffic.py traffic.jsonl --baseline http://old:8000 \
+        --candidate http://new:8000 --speed 2 --json replay.json
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import requests
+
+from load_test import summarize
+
+UUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+NUMBER_SEGMENT_RE = re.compile(r"/\d+(?=/|$)")
+ARTICLE_SLUG_RE = re.compile(r"^/api/articles/(?!\{id\})[^/]+")
+
+# Hop-by-hop and per-connection headers are never replayed
+SKIPPED_HEADERS = {"host", "content-length", "connection", "accept-encoding", "transfer-encoding"}
+
+
+def parse_ts(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def endpoint_template(method: str, path: str) -> str:
+    path = path.split("?", 1)[0].rstrip("/") or "/"
+    path = UUID_RE.sub("{id}", path)
+    path = NUMBER_SEGMENT_RE.sub("/{n}", path)
+    path = ARTICLE_SLUG_RE.sub("/api/articles/{slug}", path)
+    return f"{method.upper()} {path}"
+
+
+def load_requests(path: str, limit: Optional[int]) -> List[dict]:
+    entries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict) or "method" not in record or "path" not in record:
+                continue
+            request_path = record["path"]
+            if record.get("query") and "?" not in request_path:
+                request_path = f"{request_path}?{record['query']}"
+            entries.append({
+                "ts": parse_ts(record.get("ts", 0)),
+                "method": record["method"].upper(),
+                "path": request_path,
+                "headers": {
+                    name: value for name, value in (record.get("headers") or {}).items()
+                    if name.lower() not in SKIPPED_HEADERS
+                },
+                "body": record.get("body"),
+            })
+            if limit and len(entries) >= limit:
+                break
+    entries.sort(key=lambda entry: entry["ts"])
+    return entries
+
+
+def replay(entries: List[dict], target: str, speed: float, max_in_flight: int, timeout: float,
+           extra_headers: Dict[str, str]) -> Dict[str, List[dict]]:
+    """Replay entries open-loop; returns samples grouped by endpoint template"""
+    target = target.rstrip("/")
+    samples: Dict[str, List[dict]] = {}
+    lock = threading.Lock()
+    local = threading.local()
+
+    def session() -> requests.Session:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    def send(entry: dict, scheduled: float) -> None:
+        started = time.monotonic()
+        kwargs = {"headers": {**entry["headers"], **extra_headers}, "timeout": timeout}
+        body = entry["body"]
+        if isinstance(body, (dict, list)):
+            kwargs["json"] = body
+        elif body is not None:
+            kwargs["data"] = body
+        try:
+            response = session().request(entry["method"], target + entry["path"], **kwargs)
+            status = response.status_code
+            queries = response.headers.get("X-DB-Query-Count")
+        except requests.RequestException:
+            status, queries = None, None
+        finished = time.monotonic()
+        sample = {
+            "status": status,
+            "latency_ms": (finished - scheduled) * 1000,
+            "service_ms": (finished - started) * 1000,
+            "queries": int(queries) if queries is not None else None,
+        }
+        with lock:
+            samples.setdefault(endpoint_template(entry["method"], entry["path"]), []).append(sample)
+
+    first_ts = entries[0]["ts"] if entries else 0.0
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for entry in entries:
+            scheduled = start + (entry["ts"] - first_ts) / speed
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, entry, scheduled)
+    return samples
+
+
+def summarize_run(samples: Dict[str, List[dict]], elapsed: float) -> dict:
+    endpoints = {}
+    for endpoint, endpoint_samples in sorted(samples.items()):
+        stats = summarize(endpoint_samples, elapsed)
+        service = sorted(sample["service_ms"] for sample in endpoint_samples)
+        stats["service_ms_p50"] = round(service[len(service) // 2], 2) if service else 0.0
+        endpoints[endpoint] = stats
+    all_samples = [sample for endpoint_samples in samples.values() for sample in endpoint_samples]
+    return {"summary": summarize(all_samples, elapsed), "endpoints": endpoints}
+
+
+def compare(baseline: dict, candidate: dict, max_p99_regression: float, max_error_rate_increase: float) -> dict:
+    """Per-endpoint deltas; an endpoint regresses if p99 or error rate grows beyond limits"""
+    result = {}
+    for endpoint in sorted(set(baseline["endpoints"]) | set(candidate["endpoints"])):
+        before = baseline["endpoints"].get(endpoint)
+        after = candidate["endpoints"].get(endpoint)
+        if not before or not after:
+            result[endpoint] = {"missing_in": "baseline" if not before else "candidate"}
+            continue
+        p99_before, p99_after = before["latency_ms"]["p99"], after["latency_ms"]["p99"]
+        p99_change = (p99_after - p99_before) / p99_before if p99_before else 0.0
+        error_change = after["error_rate"] - before["error_rate"]
+        reasons = []
+        if p99_change > max_p99_regression:
+            reasons.append(f"p99 +{p99_change:.0%}")
+        if error_change > max_error_rate_increase:
+            reasons.append(f"error rate +{error_change:.2%}")
+        if before["status_counts"].keys() != after["status_counts"].keys():
+            reasons.append("status codes differ")
+        result[endpoint] = {
+            "p50_ms": [before["latency_ms"]["p50"], after["latency_ms"]["p50"]],
+            "p99_ms": [p99_before, p99_after],
+            "p99_change": round(p99_change, 4),
+            "error_rate": [before["error_rate"], after["error_rate"]],
+            "status_counts": [before["status_counts"], after["status_counts"]],
+            # Status code changes are reported but only latency/errors fail the comparison
+            "regression": any(not reason.startswith("status") for reason in reasons),
+            "notes": reasons,
+        }
+    return result
+
+
+def run(entries: List[dict], target: str, args, extra_headers: Dict[str, str]) -> dict:
+    print(f"Replaying {len(entries)} requests against {target} at {args.speed}x")
+    started = time.monotonic()
+    samples = replay(entries, target, args.speed, args.max_in_flight, args.timeout, extra_headers)
+    result = summarize_run(samples, time.monotonic() - started)
+    result["target"] = target
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("traffic", help="JSONL file with captured requests")
+    parser.add_argument("--baseline", required=True, help="base URL of the reference build")
+    parser.add_argument("--candidate", help="base URL of the build to compare")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (2 = twice as fast)")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="client-side concurrency cap")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--limit", type=int, help="replay only the first N requests")
+    parser.add_argument("--header", action="append", default=[], help="extra header 'Name: value'")
+    parser.add_argument("--max-p99-regression", type=float, default=0.2, help="allowed relative p99 growth")
+    parser.add_argument("--max-error-rate-increase", type=float, default=0.01)
+    parser.add_argument("--json", dest="json_path", help="write report as JSON to this file")
+    args = parser.parse_args()
+
+    entries = load_requests(args.traffic, args.limit)
+    if not entries:
+        print("No replayable requests found (need method, path and ts fields)")
+        sys.exit(2)
+    extra_headers = dict(header.split(":", 1) for header in args.header)
+    extra_headers = {name.strip(): value.strip() for name, value in extra_headers.items()}
+
+    report = {"speed": args.speed, "requests": len(entries), "baseline": run(entries, args.baseline, args, extra_headers)}
+    regressions = []
+    if args.candidate:
+        report["candidate"] = run(entries, args.candidate, args, extra_headers)
+        report["comparison"] = compare(
+            report["baseline"], report["candidate"], args.max_p99_regression, args.max_error_rate_increase
+        )
+        for endpoint, delta in report["comparison"].items():
+            if "p99_ms" not in delta:
+                print(f"{endpoint:45s} only in {'candidate' if delta['missing_in'] == 'baseline' else 'baseline'}")
+                continue
+            regressions += [endpoint] if delta["regression"] else []
+            print(
+                f"{endpoint:45s} p99 {delta['p99_ms'][0]:8.2f} -> {delta['p99_ms'][1]:8.2f} ms "
+                f"({delta['p99_change']:+.0%}) err {delta['error_rate'][0]:.2%} -> {delta['error_rate'][1]:.2%}"
+                f"{'  REGRESSION: ' + ', '.join(delta['notes']) if delta['regression'] else ''}"
+            )
+    else:
+        for endpoint, stats in report["baseline"]["endpoints"].items():
+            print(
+                f"{endpoint:45s} n={stats['requests']:6d} p50={stats['latency_ms']['p50']:8.2f}ms "
+                f"p99={stats['latency_ms']['p99']:8.2f}ms err={stats['error_rate']:.2%}"
+            )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    if regressions:
+        print(f"{len(regressions)} endpoint(s) regressed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Seed main and users databases with a reproducible dataset for load tests.
+
+Same --seed and --scale always produce the same users, follow graph, articles and comments
+(IDs included). Rows are bulk-inserted straight into Postgres; follow_counts and tag_counts
+are filled to match and, with --feeds, followers' Redis feeds are pre-populated as the
+fan-out task would. A manifest with IDs, emails and slugs is written for scripts/load_test.py.
+All seeded users have the password given by --password (hashed once).
+
+Usage:
+    python scripts/seed_data.py --scale small --seed 42 --reset --feeds --manifest seed.json
+
+--reset TRUNCATEs articles, comments, tag_counts, users, subscribers, follow_counts and
+notification_logs: point it at disposable local containers only.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passlib.hash import bcrypt  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from src.config import settings  # noqa: E402
+from src.models.database import Article, Comment, TagCount  # noqa: E402
+from src.tasks.feed import article_score, feed_key  # noqa: E402
+from src.tasks.users_db import FollowCount, Subscriber, User  # noqa: E402
+
+SCALES = {
+    # users, articles per user (mean), comments per article (mean), follows per user (mean)
+    "small": {"users": 200, "articles_per_user": 5, "comments_per_article": 3, "follows_per_user": 20},
+    "medium": {"users": 2000, "articles_per_user": 5, "comments_per_article": 3, "follows_per_user": 50},
+    "large": {"users": 20000, "articles_per_user": 5, "comments_per_article": 3, "follows_per_user": 100},
+}
+
+TAGS = [
+    "python", "fastapi", "postgres", "redis", "celery", "docker", "kubernetes", "linux",
+    "security", "testing", "performance", "architecture", "frontend", "career", "news",
+    "tutorial", "databases", "devops", "ml", "golang",
+]
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt "
+    "ut labore et dolore magna aliqua enim ad minim veniam quis nostrud exercitation"
+).split()
+
+INSERT_CHUNK = 5000
+
+
+def seeded_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def text_of(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate(seed: int, scale: dict, password_hash: str) -> dict:
+    """Build all rows in memory; depends only on seed and scale"""
+    rng = random.Random(seed)
+    epoch = datetime(2025, 1, 1)
+
+    users = []
+    for index in range(scale["users"]):
+        users.append({
+            "id": seeded_uuid(rng),
+            "email": f"bench{index}@example.com",
+            "username": f"bench{index}",
+            "password_hash": password_hash,
+            "bio": text_of(rng, 12),
+            "image_url": None,
+            "subscription_key": f"bench-key-{index:08d}",
+            "is_active": True,
+            "created_at": epoch,
+            "updated_at": epoch,
+        })
+    user_ids = [user["id"] for user in users]
+
+    # Power-law popularity: few authors get most followers (mega-author fan-out paths)
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(len(users))]
+    subscriptions = []
+    for subscriber_id in user_ids:
+        targets = set(rng.choices(user_ids, weights=weights, k=rng.randint(1, scale["follows_per_user"] * 2)))
+        targets.discard(subscriber_id)
+        for author_id in sorted(targets):
+            subscriptions.append({
+                "id": seeded_uuid(rng),
+                "subscriber_id": subscriber_id,
+                "author_id": author_id,
+                "created_at": epoch + timedelta(seconds=rng.randint(0, 86400 * 30)),
+            })
+
+    articles = []
+    for user in users:
+        for _ in range(rng.randint(0, scale["articles_per_user"] * 2)):
+            created_at = epoch + timedelta(seconds=rng.randint(0, 86400 * 365))
+            status = rng.choices(["PUBLISHED", "DRAFT", "REJECTED"], weights=[85, 12, 3])[0]
+            articles.append({
+                "id": seeded_uuid(rng),
+                "title": text_of(rng, 6).capitalize()[:200],
+                "description": text_of(rng, 15)[:500],
+                "body": text_of(rng, rng.randint(200, 1500)),
+                "tag_list": rng.sample(TAGS, rng.randint(0, 4)),
+                "slug": f"bench-{len(articles)}-{rng.getrandbits(32):08x}",
+                "author_id": user["id"],
+                "status": status,
+                "preview_url": None,
+                "created_at": created_at,
+                "updated_at": created_at,
+                "published_at": created_at if status == "PUBLISHED" else None,
+            })
+
+    comments = []
+    for article in articles:
+        if article["status"] != "PUBLISHED":
+            continue
+        for _ in range(rng.randint(0, scale["comments_per_article"] * 2)):
+            created_at = article["created_at"] + timedelta(seconds=rng.randint(60, 86400))
+            comments.append({
+                "id": seeded_uuid(rng),
+                "body": text_of(rng, rng.randint(5, 40)),
+                "article_id": article["id"],
+                "author_id": rng.choice(user_ids),
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+
+    return {"users": users, "subscriptions": subscriptions, "articles": articles, "comments": comments}
+
+
+def insert_chunked(connection, table, rows: list) -> None:
+    for start in range(0, len(rows), INSERT_CHUNK):
+        connection.execute(table.insert(), rows[start:start + INSERT_CHUNK])
+
+
+def follow_count_rows(subscriptions: list) -> list:
+    followers, following = Counter(), Counter()
+    for subscription in subscriptions:
+        followers[subscription["author_id"]] += 1
+        following[subscription["subscriber_id"]] += 1
+    return [
+        {"user_id": user_id, "followers_count": followers[user_id], "following_count": following[user_id]}
+        for user_id in set(followers) | set(following)
+    ]
+
+
+def tag_count_rows(articles: list) -> list:
+    counts = Counter(
+        tag for article in articles if article["status"] == "PUBLISHED" for tag in set(article["tag_list"])
+    )
+    return [{"tag": tag, "article_count": count} for tag, count in sorted(counts.items())]
+
+
+def seed_feeds(data: dict, redis_url: str) -> int:
+    """Fill followers' Redis feeds like fan_out_post does (mega-authors are merged on read)"""
+    import redis
+
+    client = redis.Redis.from_url(redis_url)
+    followers_of = defaultdict(list)
+    for subscription in data["subscriptions"]:
+        followers_of[subscription["author_id"]].append(subscription["subscriber_id"])
+
+    mega_authors = {
+        author_id for author_id, followers in followers_of.items()
+        if len(followers) > settings.feed_fanout_max_followers
+    }
+    pipe = client.pipeline(transaction=False)
+    pipe.delete("feed:mega-authors")
+    if mega_authors:
+        pipe.sadd("feed:mega-authors", *[str(author_id) for author_id in mega_authors])
+    entries = 0
+    for article in data["articles"]:
+        if article["status"] != "PUBLISHED" or article["author_id"] in mega_authors:
+            continue
+        score = article_score(article["published_at"] or article["created_at"])
+        for follower_id in followers_of[article["author_id"]]:
+            pipe.zadd(feed_key(follower_id), {str(article["id"]): score})
+            entries += 1
+            if entries % 5000 == 0:
+                pipe.execute()
+    for user in data["users"]:
+        pipe.zremrangebyrank(feed_key(user["id"]), 0, -(settings.feed_max_length + 1))
+    pipe.execute()
+    return entries
+
+
+def build_manifest(seed: int, scale_name: str, password: str, data: dict) -> dict:
+    followers = Counter(subscription["author_id"] for subscription in data["subscriptions"])
+    published = [article for article in data["articles"] if article["status"] == "PUBLISHED"]
+    return {
+        "seed": seed,
+        "scale": scale_name,
+        "password": password,
+        "users": [{"id": str(user["id"]), "email": user["email"]} for user in data["users"]],
+        "popular_authors": [str(author_id) for author_id, _ in followers.most_common(20)],
+        "published_slugs": [article["slug"] for article in published],
+        "tags": TAGS,
+        "counts": {key: len(rows) for key, rows in data.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", settings.database_url))
+    parser.add_argument("--users-database-url", default=os.getenv("USERS_DATABASE_URL", settings.users_database_url))
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", settings.redis_url))
+    parser.add_argument("--password", default="benchpass123")
+    parser.add_argument("--reset", action="store_true", help="truncate seeded tables first")
+    parser.add_argument("--feeds", action="store_true", help="pre-populate Redis feeds")
+    parser.add_argument("--manifest", default="seed.json", help="where to write IDs for load_test.py")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    # One bcrypt hash at the users service's minimum cost shared by all seeded users
+    data = generate(args.seed, SCALES[args.scale], bcrypt.using(rounds=10).hash(args.password))
+    print("Generated: " + ", ".join(f"{len(rows)} {key}" for key, rows in data.items()))
+
+    main_engine = create_engine(args.database_url)
+    users_engine = create_engine(args.users_database_url)
+
+    with users_engine.begin() as connection:
+        if args.reset:
+            connection.execute(text("TRUNCATE notification_logs, follow_counts, subscribers, users CASCADE"))
+        insert_chunked(connection, User.__table__, data["users"])
+        insert_chunked(connection, Subscriber.__table__, data["subscriptions"])
+        insert_chunked(connection, FollowCount.__table__, follow_count_rows(data["subscriptions"]))
+
+    with main_engine.begin() as connection:
+        if args.reset:
+            connection.execute(text("TRUNCATE comments, articles, tag_counts CASCADE"))
+        insert_chunked(connection, Article.__table__, data["articles"])
+        insert_chunked(connection, Comment.__table__, data["comments"])
+        insert_chunked(connection, TagCount.__table__, tag_count_rows(data["articles"]))
+
+    if args.feeds:
+        print(f"Feed entries written: {seed_feeds(data, args.redis_url)}")
+
+    with open(args.manifest, "w") as f:
+        json.dump(build_manifest(args.seed, args.scale, args.password, data), f, indent=2)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s, manifest: {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,57 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import String, cast, func
+from sqlalchemy.orm import Session, Query
 from sqlalchemy.exc import IntegrityError
-from src.models.database import Article, Comment
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from src.models.database import Article, Comment, TagCount
 from src.models.schemas import ArticleCreate, ArticleUpdate, CommentCreate
+from src.controllers.workflow_events import (
+    STEP_PUBLISH_REQUESTED,
+    STEP_PUBLISHED,
+    STEP_REJECTED,
+    WorkflowEventCRUD,
+)
 from src.utils.slug import generate_slug
-from typing import List, Optional
+from typing import Iterable, List, Optional
+from datetime import datetime
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
+
+# Columns loaded for list items in summary view (no unbounded body)
+ARTICLE_SUMMARY_COLUMNS = (
+    Article.id,
+    Article.slug,
+    Article.title,
+    Article.description,
+    Article.tag_list,
+    Article.author_id,
+    Article.status,
+    Article.preview_url,
+    Article.created_at,
+    Article.updated_at,
+)
+
+
+def _remove_from_feeds(author_id: uuid.UUID, article_id: uuid.UUID) -> None:
+    """Queue removal from followers' Redis feeds; feed reads skip the article meanwhile"""
+    from src.tasks.feed import enqueue_feed_removal
+    try:
+        enqueue_feed_removal(author_id, article_id)
+    except Exception as exc:
+        logger.warning("Failed to enqueue feed removal for article %s: %s", article_id, exc)
+
+
+def article_listing_query(db: Session, summary: bool = False, excerpt_length: int = 0) -> Query:
+    """Query full Article objects or summary rows (optionally with a body excerpt)"""
+    if not summary:
+        return db.query(Article)
+    columns = list(ARTICLE_SUMMARY_COLUMNS)
+    if excerpt_length:
+        columns.append(func.left(Article.body, excerpt_length).label("excerpt"))
+    return db.query(*columns)
+
 
 class ArticleCRUD:
     def __init__(self, db: Session):
@@ -45,17 +91,91 @@ class ArticleCRUD:
         """Get article by slug"""
         return self.db.query(Article).filter(Article.slug == slug).first()
 
-    def get_articles(self, skip: int = 0, limit: int = 100) -> List[Article]:
-        """Get all articles with pagination"""
-        return self.db.query(Article).offset(skip).limit(limit).all()
+    @staticmethod
+    def _filter_by_tags(query: Query, tags: Optional[List[str]], match_all: bool) -> Query:
+        """Restrict query to articles tagged with any (or all) of the given tags"""
+        if not tags:
+            return query
+        # Cast keeps both sides varchar[] so the GIN index on tag_list is usable
+        tags_param = cast(tags, ARRAY(String))
+        if match_all:
+            return query.filter(Article.tag_list.contains(tags_param))
+        return query.filter(Article.tag_list.overlap(tags_param))
 
-    def get_articles_count(self) -> int:
-        """Get total count of articles"""
-        return self.db.query(Article).count()
+    def get_articles(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        tags: Optional[List[str]] = None,
+        match_all: bool = False,
+        status: str = "PUBLISHED",
+        summary: bool = False,
+        excerpt_length: int = 0,
+    ) -> List[Article]:
+        """Get articles in given status (newest first), optionally filtered by tags.
+        
+        With summary=True returns rows with ARTICLE_SUMMARY_COLUMNS (+ excerpt) instead of Article objects.
+        """
+        query = article_listing_query(self.db, summary, excerpt_length).filter(Article.status == status)
+        query = self._filter_by_tags(query, tags, match_all)
+        return query.order_by(Article.created_at.desc()).offset(skip).limit(limit).all()
 
-    def get_user_articles(self, user_id: uuid.UUID, skip: int = 0, limit: int = 100) -> List[Article]:
-        """Get articles by specific user"""
-        return self.db.query(Article).filter(Article.author_id == user_id).offset(skip).limit(limit).all()
+    def get_articles_count(
+        self,
+        tags: Optional[List[str]] = None,
+        match_all: bool = False,
+        status: str = "PUBLISHED",
+    ) -> int:
+        """Get total count of articles in given status, optionally filtered by tags"""
+        query = self.db.query(Article).filter(Article.status == status)
+        return self._filter_by_tags(query, tags, match_all).count()
+
+    def _adjust_tag_counts(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> None:
+        """Apply tag counter deltas in the current transaction (caller commits)"""
+        deltas = {}
+        for tag in set(added or []):
+            deltas[tag] = deltas.get(tag, 0) + 1
+        for tag in set(removed or []):
+            deltas[tag] = deltas.get(tag, 0) - 1
+        # Stable order keeps concurrent upserts from deadlocking on row locks
+        rows = [
+            {"tag": tag, "article_count": delta, "updated_at": datetime.utcnow()}
+            for tag, delta in sorted(deltas.items())
+            if delta
+        ]
+        if not rows:
+            return
+        stmt = pg_insert(TagCount).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TagCount.tag],
+            set_={
+                "article_count": TagCount.article_count + stmt.excluded.article_count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        self.db.execute(stmt)
+
+    def get_user_articles(
+        self,
+        user_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = "PUBLISHED",
+        summary: bool = False,
+        excerpt_length: int = 0,
+    ) -> List[Article]:
+        """Get articles by specific user (newest first), optionally in given status"""
+        query = article_listing_query(self.db, summary, excerpt_length).filter(Article.author_id == user_id)
+        if status is not None:
+            query = query.filter(Article.status == status)
+        return query.order_by(Article.created_at.desc()).offset(skip).limit(limit).all()
+
+    def get_user_articles_count(self, user_id: uuid.UUID, status: Optional[str] = "PUBLISHED") -> int:
+        """Get total count of articles by specific user, optionally in given status"""
+        query = self.db.query(Article).filter(Article.author_id == user_id)
+        if status is not None:
+            query = query.filter(Article.status == status)
+        return query.count()
 
     def update_article(self, slug: str, article_data: ArticleUpdate, user_id: uuid.UUID) -> Optional[Article]:
         """Update article by slug (only by author)"""
@@ -88,6 +208,10 @@ class ArticleCRUD:
             db_article.body = article_data.body
         
         if article_data.tag_list is not None:
+            if db_article.status == "PUBLISHED":
+                old_tags = set(db_article.tag_list or [])
+                new_tags = set(article_data.tag_list)
+                self._adjust_tag_counts(added=new_tags - old_tags, removed=old_tags - new_tags)
             db_article.tag_list = article_data.tag_list
         
         try:
@@ -108,8 +232,14 @@ class ArticleCRUD:
         if db_article.author_id != user_id:
             raise ValueError("You can only delete your own articles")
         
+        was_published = db_article.status == "PUBLISHED"
+        author_id, article_id = db_article.author_id, db_article.id
+        if was_published:
+            self._adjust_tag_counts(removed=db_article.tag_list or [])
         self.db.delete(db_article)
         self.db.commit()
+        if was_published:
+            _remove_from_feeds(author_id, article_id)
         return True
     
     def get_article_by_id(self, article_id: uuid.UUID) -> Optional[Article]:
@@ -122,14 +252,27 @@ class ArticleCRUD:
         if not db_article:
             return None
         
+        old_status = db_article.status
+        if old_status != new_status:
+            if new_status == "PUBLISHED":
+                self._adjust_tag_counts(added=db_article.tag_list or [])
+                if db_article.published_at is None:
+                    db_article.published_at = datetime.utcnow()
+            elif old_status == "PUBLISHED":
+                self._adjust_tag_counts(removed=db_article.tag_list or [])
+            milestone = {"PUBLISHED": STEP_PUBLISHED, "REJECTED": STEP_REJECTED}.get(new_status)
+            if milestone:
+                WorkflowEventCRUD(self.db).add_milestone([db_article.id], milestone)
         db_article.status = new_status
         try:
             self.db.commit()
             self.db.refresh(db_article)
-            return db_article
         except Exception:
             self.db.rollback()
             raise
+        if old_status == "PUBLISHED" and new_status != "PUBLISHED":
+            _remove_from_feeds(db_article.author_id, db_article.id)
+        return db_article
     
     def update_article_preview(self, article_id: uuid.UUID, preview_url: str) -> Optional[Article]:
         """Update article preview URL (internal use)"""
@@ -161,6 +304,7 @@ class ArticleCRUD:
             raise ValueError(f"Article must be in DRAFT status to publish. Current status: {db_article.status}")
         
         db_article.status = "PENDING_PUBLISH"
+        WorkflowEventCRUD(self.db).add_milestone([db_article.id], STEP_PUBLISH_REQUESTED)
         try:
             self.db.commit()
             self.db.refresh(db_article)
@@ -170,6 +314,21 @@ class ArticleCRUD:
             raise
 
 
+class TagCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_tag_cloud(self, limit: int = 50) -> List[TagCount]:
+        """Get most used tags of PUBLISHED articles from the counter table"""
+        return (
+            self.db.query(TagCount)
+            .filter(TagCount.article_count > 0)
+            .order_by(TagCount.article_count.desc(), TagCount.tag)
+            .limit(limit)
+            .all()
+        )
+
+
 class CommentCRUD:
     def __init__(self, db: Session):
         self.db = db
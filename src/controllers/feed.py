@@ -0,0 +1,138 @@
+"""Personalized feed: fan-out-on-write into Redis with fan-out-on-read for mega-authors"""
+import logging
+from typing import List, Tuple
+import uuid
+
+from redis import RedisError
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.controllers.crud import article_listing_query
+from src.models.database import Article
+from src.tasks.feed import MEGA_AUTHORS_KEY, article_score, feed_key
+from src.tasks.users_db import Subscriber
+from src.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class FeedCRUD:
+    def __init__(self, db: Session, users_db: Session):
+        self.db = db
+        self.users_db = users_db
+
+    def _get_followed_authors(self, user_id: uuid.UUID, among: List[str] = None) -> List[uuid.UUID]:
+        """Get authors followed by user, optionally restricted to a subset"""
+        query = self.users_db.query(Subscriber.author_id).filter(Subscriber.subscriber_id == user_id)
+        if among is not None:
+            query = query.filter(Subscriber.author_id.in_([uuid.UUID(a) for a in among]))
+        return [row.author_id for row in query.all()]
+
+    def _get_recent_published(self, author_ids: List[uuid.UUID], limit: int) -> List[Tuple[float, str]]:
+        """Get (score, article id) of latest PUBLISHED articles of given authors"""
+        if not author_ids:
+            return []
+        # Same ordering as fan-out scores: first publication, created_at when unset
+        published_at = func.coalesce(Article.published_at, Article.created_at)
+        rows = (
+            self.db.query(Article.id, published_at.label("published_at"))
+            .filter(Article.author_id.in_(author_ids), Article.status == "PUBLISHED")
+            .order_by(published_at.desc())
+            .limit(limit)
+            .all()
+        )
+        return [(article_score(row.published_at), str(row.id)) for row in rows]
+
+    def _load_articles(self, article_ids: List[str], summary: bool, excerpt_length: int) -> List[Article]:
+        """Load PUBLISHED articles by ids preserving the given order"""
+        if not article_ids:
+            return []
+        articles = (
+            article_listing_query(self.db, summary, excerpt_length)
+            .filter(Article.id.in_([uuid.UUID(a) for a in article_ids]), Article.status == "PUBLISHED")
+            .all()
+        )
+        by_id = {str(article.id): article for article in articles}
+        return [by_id[a] for a in article_ids if a in by_id]
+
+    def get_feed(
+        self,
+        user_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 20,
+        summary: bool = False,
+        excerpt_length: int = 0,
+    ) -> List[Article]:
+        """Get PUBLISHED articles of followed authors, newest first"""
+        window = skip + limit
+        try:
+            redis_client = get_redis()
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.zrevrange(feed_key(user_id), 0, window - 1, withscores=True)
+            pipe.smembers(MEGA_AUTHORS_KEY)
+            feed_entries, mega_authors = pipe.execute()
+        except RedisError as exc:
+            # Redis is unavailable: build the whole feed on read
+            logger.warning("Feed cache unavailable, reading feed from DB: %s", exc)
+            entries = self._get_recent_published(self._get_followed_authors(user_id), window)
+            page = [article_id for _, article_id in entries[skip:window]]
+            return self._load_articles(page, summary, excerpt_length)
+
+        entries = self._live_entries(redis_client, user_id, feed_entries, window)
+        if mega_authors:
+            followed_mega = self._get_followed_authors(user_id, among=list(mega_authors))
+            entries.extend(self._get_recent_published(followed_mega, window))
+
+        entries.sort(reverse=True)
+        page, seen = [], set()
+        for _, article_id in entries:
+            if article_id in seen:
+                continue
+            seen.add(article_id)
+            page.append(article_id)
+        return self._load_articles(page[skip:window], summary, excerpt_length)
+
+    def _stale_ids(self, user_id: uuid.UUID, article_ids: List[str]) -> List[str]:
+        """Ids no longer PUBLISHED (unpublished, deleted) or of authors the user unfollowed"""
+        if not article_ids:
+            return []
+        rows = (
+            self.db.query(Article.id, Article.author_id)
+            .filter(Article.id.in_([uuid.UUID(a) for a in article_ids]), Article.status == "PUBLISHED")
+            .all()
+        )
+        followed = set()
+        if rows:
+            followed = set(self._get_followed_authors(user_id, among=list({str(row.author_id) for row in rows})))
+        live = {str(row.id) for row in rows if row.author_id in followed}
+        return [article_id for article_id in article_ids if article_id not in live]
+
+    def _live_entries(self, redis_client, user_id: uuid.UUID, feed_entries, window: int) -> List[Tuple[float, str]]:
+        """Newest `window` valid (score, id) feed entries.
+
+        Stale entries are filtered before the page is cut, so pages stay full and skip
+        offsets stable, and are removed from the Redis feed on the way.
+        """
+        key = feed_key(user_id)
+        entries: List[Tuple[float, str]] = []
+        offset = 0
+        batch = feed_entries
+        while batch:
+            stale = self._stale_ids(user_id, [article_id for article_id, _ in batch])
+            stale_set = set(stale)
+            entries.extend((score, article_id) for article_id, score in batch if article_id not in stale_set)
+            removed = 0
+            if stale:
+                try:
+                    removed = redis_client.zrem(key, *stale)
+                except RedisError as exc:
+                    logger.warning("Failed to drop stale entries from feed %s: %s", key, exc)
+            offset += len(batch) - removed
+            if len(entries) >= window or len(batch) < window:
+                break
+            try:
+                batch = redis_client.zrevrange(key, offset, offset + window - 1, withscores=True)
+            except RedisError as exc:
+                logger.warning("Feed cache unavailable while refilling page: %s", exc)
+                break
+        return entries
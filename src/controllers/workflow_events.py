@@ -0,0 +1,187 @@
+"""Article publication timeline (article_workflow_events) and publish-latency reports.
+
+Milestones are written in the same transaction as the status change they describe:
+publish_requested (DRAFT -> PENDING_PUBLISH), published / rejected (internal endpoints) and
+notifications_completed (last push wave of notify_followers done). Every run of a saga or
+notification task adds a row with its queue wait and run time (src/tasks/workflow_events.py).
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.models.database import ArticleWorkflowEvent
+
+STEP_PUBLISH_REQUESTED = "publish_requested"
+STEP_PUBLISHED = "published"
+STEP_REJECTED = "rejected"
+STEP_NOTIFIED = "notifications_completed"
+
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+# Latest milestone timestamps per article with a milestone inside the window. The window
+# only selects articles; their whole timeline is read, so an article requested before
+# :since and published after it still counts.
+_ARTICLE_LATENCY_SQL = """
+WITH windowed AS (
+    SELECT DISTINCT article_id
+    FROM article_workflow_events
+    WHERE created_at >= :since AND step IN (:requested, :published, :notified)
+), per_article AS (
+    SELECT
+        article_id,
+        max(created_at) FILTER (WHERE step = :requested) AS requested_at,
+        max(created_at) FILTER (WHERE step = :published) AS published_at,
+        max(finished_at) FILTER (WHERE step = :notified) AS notified_at
+    FROM article_workflow_events
+    WHERE article_id IN (SELECT article_id FROM windowed)
+        AND step IN (:requested, :published, :notified)
+    GROUP BY article_id
+), latencies AS (
+    SELECT
+        CASE WHEN published_at >= requested_at
+            THEN CAST(extract(epoch FROM published_at - requested_at) AS float8) END AS publish_seconds,
+        CASE WHEN notified_at >= published_at
+            THEN CAST(extract(epoch FROM notified_at - published_at) AS float8) END AS notify_seconds,
+        CASE WHEN notified_at >= requested_at
+            THEN CAST(extract(epoch FROM notified_at - requested_at) AS float8) END AS end_to_end_seconds
+    FROM per_article
+)
+SELECT
+    count(publish_seconds) AS publish_count,
+    percentile_cont(CAST(:percentiles AS float8[])) WITHIN GROUP (ORDER BY publish_seconds) AS publish,
+    count(notify_seconds) AS notify_count,
+    percentile_cont(CAST(:percentiles AS float8[])) WITHIN GROUP (ORDER BY notify_seconds) AS notify,
+    count(end_to_end_seconds) AS end_to_end_count,
+    percentile_cont(CAST(:percentiles AS float8[])) WITHIN GROUP (ORDER BY end_to_end_seconds) AS end_to_end
+FROM latencies
+"""
+
+_STEP_LATENCY_SQL = """
+SELECT
+    step,
+    count(*) AS runs,
+    count(*) FILTER (WHERE status <> 'SUCCESS') AS unsuccessful,
+    percentile_cont(CAST(:percentiles AS float8[])) WITHIN GROUP (ORDER BY queue_wait_ms) AS queue_wait_ms,
+    percentile_cont(CAST(:percentiles AS float8[])) WITHIN GROUP (ORDER BY run_ms) AS run_ms
+FROM article_workflow_events
+WHERE created_at >= :since AND task_id IS NOT NULL
+GROUP BY step
+ORDER BY step
+"""
+
+
+def _percentiles(values, scale: int = 3) -> Optional[dict]:
+    if values is None:
+        return None
+    return {
+        f"p{int(percentile * 100)}": round(value, scale) if value is not None else None
+        for percentile, value in zip(PERCENTILES, values)
+    }
+
+
+def _slo(percentiles: Optional[dict], target_seconds: float) -> dict:
+    observed = percentiles["p99"] if percentiles else None
+    return {
+        "percentile": "p99",
+        "target_seconds": target_seconds,
+        "observed_seconds": observed,
+        "breached": observed is not None and observed > target_seconds,
+    }
+
+
+class WorkflowEventCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_milestone(self, article_ids: Iterable[uuid.UUID], step: str) -> None:
+        """Add milestone rows to the session; committed with the caller's transaction"""
+        now = datetime.utcnow()
+        self.db.add_all([
+            ArticleWorkflowEvent(
+                article_id=article_id,
+                step=step,
+                status="done",
+                started_at=now,
+                finished_at=now,
+                created_at=now,
+            )
+            for article_id in article_ids
+        ])
+
+    def add_task_run(
+        self,
+        article_ids: Iterable[uuid.UUID],
+        step: str,
+        status: str,
+        task_id: str,
+        attempt: int,
+        enqueued_at: Optional[datetime],
+        started_at: datetime,
+        run_seconds: float,
+    ) -> None:
+        """Add one row per article for a task run (run time measured with a monotonic clock)"""
+        queue_wait_ms = None
+        if enqueued_at is not None:
+            queue_wait_ms = max((started_at - enqueued_at).total_seconds() * 1000, 0.0)
+        run_ms = run_seconds * 1000
+        finished_at = started_at + timedelta(seconds=run_seconds)
+        self.db.add_all([
+            ArticleWorkflowEvent(
+                article_id=article_id,
+                step=step,
+                status=status,
+                task_id=task_id,
+                attempt=attempt,
+                enqueued_at=enqueued_at,
+                started_at=started_at,
+                finished_at=finished_at,
+                queue_wait_ms=queue_wait_ms,
+                run_ms=run_ms,
+                created_at=finished_at,
+            )
+            for article_id in article_ids
+        ])
+
+    def latency_report(self, since: datetime) -> dict:
+        """Percentiles of publish / notify / end-to-end latency and per-step queue wait vs run time"""
+        params = {
+            "since": since,
+            "percentiles": list(PERCENTILES),
+            "requested": STEP_PUBLISH_REQUESTED,
+            "published": STEP_PUBLISHED,
+            "notified": STEP_NOTIFIED,
+        }
+        articles = self.db.execute(text(_ARTICLE_LATENCY_SQL), params).mappings().one()
+        publish = _percentiles(articles["publish"])
+        notify = _percentiles(articles["notify"])
+        steps = self.db.execute(text(_STEP_LATENCY_SQL), params).mappings().all()
+        return {
+            "since": since.isoformat(),
+            "publish_seconds": {
+                "articles": articles["publish_count"],
+                "percentiles": publish,
+                "slo": _slo(publish, settings.publish_latency_slo_seconds),
+            },
+            "notify_seconds": {
+                "articles": articles["notify_count"],
+                "percentiles": notify,
+                "slo": _slo(notify, settings.notify_latency_slo_seconds),
+            },
+            "end_to_end_seconds": {
+                "articles": articles["end_to_end_count"],
+                "percentiles": _percentiles(articles["end_to_end"]),
+            },
+            "steps": {
+                row["step"]: {
+                    "runs": row["runs"],
+                    "unsuccessful": row["unsuccessful"],
+                    "queue_wait_ms": _percentiles(row["queue_wait_ms"], 2),
+                    "run_ms": _percentiles(row["run_ms"], 2),
+                }
+                for row in steps
+            },
+        }
@@ -1,12 +1,24 @@
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
 import time
 import logging
+from datetime import datetime, timedelta
 from src.config import settings
-from src.models.database import engine, Base
-from src.routes import articles, comments, internal
+from src.controllers.workflow_events import WorkflowEventCRUD
+from src.middleware.query_stats import query_stats_middleware
+from src.middleware.rate_limit import rate_limit_requests
+from src.middleware.tracing import tracing_middleware
+from src.models.database import engine, Base, get_db
+from src.routes import articles, comments, feed, internal, profiles, tags
+from src.tasks.celery_app import celery_app
+from src.tasks.users_db import users_engine
+from src.utils.access_log import access_log
+from src.utils.query_stats import route_metrics
+from src.utils.readiness import check_broker, check_database, check_redis, readiness
+from src.utils.slow_queries import slow_query_log
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -37,27 +49,43 @@ app.add_middleware(
 )
 
 
-# Request logging middleware
+# Rate limiting middleware (per client IP, registered first so request logging wraps it)
+app.middleware("http")(rate_limit_requests)
+
+# Per-request SQL query counting (QUERY_STATS_ENABLED), inside request logging
+app.middleware("http")(query_stats_middleware)
+
+# Server span per request (TRACING_EXPORTER); DB spans and outgoing calls are its children
+app.middleware("http")(tracing_middleware)
+
+
+# Request logging middleware (one sampled JSON access line per request)
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Log request
-    logger.info(f"{request.method} {request.url.path} - Client: {request.client.host}")
-    
-    response = await call_next(request)
-    
-    # Log response
-    process_time = time.time() - start_time
-    logger.info(f"Response: {response.status_code} - Time: {process_time:.4f}s")
-    
-    return response
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        access_log.log(request, status_code, (time.perf_counter() - start_time) * 1000)
 
 
 # Include routers
 app.include_router(articles.router)
 app.include_router(comments.router, prefix="/api/articles", tags=["comments"])
 app.include_router(internal.router)
+app.include_router(tags.router)
+app.include_router(feed.router)
+app.include_router(profiles.router)
+
+
+# Dependencies checked for /ready
+readiness.register("db", check_database(engine))
+readiness.register("users_db", check_database(users_engine))
+readiness.register("redis", check_redis(settings.redis_url))
+readiness.register("broker", check_broker(celery_app))
 
 
 # Root endpoint
@@ -73,7 +101,7 @@ def root():
         "endpoints": {
             "articles": {
                 "POST /api/articles": "Create article",
-                "GET /api/articles": "Get all articles",
+                "GET /api/articles": "Get published articles (filter: ?tag=&tag_match=any|all)",
                 "GET /api/articles/{slug}": "Get article by slug",
                 "PUT /api/articles/{slug}": "Update article",
                 "DELETE /api/articles/{slug}": "Delete article"
@@ -82,12 +110,21 @@ def root():
                 "POST /api/articles/{slug}/comments": "Add comment to article",
                 "GET /api/articles/{slug}/comments": "Get comments for article",
                 "DELETE /api/articles/{slug}/comments/{id}": "Delete comment"
+            },
+            "tags": {
+                "GET /api/tags": "Get tag cloud of published articles"
+            },
+            "feed": {
+                "GET /api/feed": "Get published articles of followed authors"
+            },
+            "profiles": {
+                "GET /api/profiles/{author_id}/articles": "Get author articles (?status=, non-published: author only)"
             }
         }
     }
 
 
-# Health check endpoint
+# Health check endpoint (liveness: must not touch the DB or Redis)
 @app.get("/health", response_model=dict)
 def health_check():
     """Health check endpoint"""
@@ -98,6 +135,61 @@ def health_check():
     }
 
 
+# Readiness endpoint (cached dependency checks; 503 takes the instance out of rotation)
+@app.get("/ready", response_model=dict)
+def readiness_check():
+    """Readiness endpoint"""
+    status = readiness.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+# Metrics endpoint (in-process counters, not exposed through the gateway)
+@app.get("/metrics", response_model=dict)
+def metrics():
+    """Service metrics"""
+    return {
+        "db_queries": route_metrics.snapshot(),
+    }
+
+
+@app.get("/metrics/slow-queries", response_model=dict)
+def slow_queries(
+    limit: int = Query(settings.slow_query_report_size, ge=1, le=500),
+    order_by: str = Query("total_ms", pattern="^(total_ms|max_ms|count)$"),
+):
+    """Top slow statement shapes (SLOW_QUERY_THRESHOLD_MS) with parameter shape and last plan"""
+    return {
+        "threshold_ms": settings.slow_query_threshold_ms,
+        "queries": slow_query_log.report(limit, order_by),
+    }
+
+
+@app.get("/metrics/publish-latency", response_model=dict)
+def publish_latency(hours: int = Query(24, ge=1, le=24 * 90), db: Session = Depends(get_db)):
+    """Publish / notification latency percentiles and SLO status, per-step queue wait vs run time"""
+    return WorkflowEventCRUD(db).latency_report(datetime.utcnow() - timedelta(hours=hours))
+
+
+@app.on_event("startup")
+def start_readiness_checks():
+    readiness.start()
+
+
+@app.on_event("startup")
+def start_access_log():
+    access_log.start()
+
+
+@app.on_event("shutdown")
+def stop_access_log():
+    access_log.stop()
+
+
+@app.on_event("shutdown")
+def stop_readiness_checks():
+    readiness.stop()
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -112,11 +204,12 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+# Development server; production runs gunicorn with uvicorn workers (gunicorn.conf.py)
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
         "src.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
+        host=settings.host,
+        port=settings.port,
+        reload=settings.debug
     )
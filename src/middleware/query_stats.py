@@ -0,0 +1,32 @@
+"""Per-request SQL query accounting (see src/utils/query_stats.py).
+
+Identical to users_service/src/middleware/query_stats.py.
+"""
+from fastapi import Request
+
+from src.config import settings
+from src.utils.query_stats import end_scope, start_scope
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+
+
+async def query_stats_middleware(request: Request, call_next):
+    """Count queries of a request; adds X-DB-Query-Count / X-DB-Time-Ms headers"""
+    if not settings.query_stats_enabled:
+        return await call_next(request)
+
+    stats, token = start_scope(f"{request.method} {request.url.path}")
+    # Shared with outer middleware (request logging)
+    request.state.query_stats = stats
+    try:
+        response = await call_next(request)
+    finally:
+        route = request.scope.get("route")
+        if route is not None:
+            # Aggregate by route template, not by concrete path
+            stats.name = f"{request.method} {route.path}"
+        end_scope(stats, token)
+    response.headers[QUERY_COUNT_HEADER] = str(stats.count)
+    response.headers[QUERY_TIME_HEADER] = f"{stats.total_ms:.2f}"
+    return response
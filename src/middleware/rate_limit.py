@@ -0,0 +1,176 @@
+"""Rate limiting: sliding window in Redis, local token bucket when Redis is unavailable.
+
+`rate_limit_requests` middleware limits every client IP to settings.rate_limit_requests per
+settings.rate_limit_window (login throttling lives in the users service).
+
+The users service copy (users_service/src/middleware/rate_limit.py) shares the
+limiter and client IP logic and adds the login throttle.
+"""
+import ipaddress
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import redis.asyncio as aioredis
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from redis.exceptions import RedisError
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Paths used by probes, metrics scrapers and service-to-service calls
+EXEMPT_PATH_PREFIXES = ("/health", "/ready", "/metrics", "/internal")
+
+# After a Redis error use local buckets for this long before trying Redis again
+REDIS_RETRY_SECONDS = 5.0
+LOCAL_BUCKETS_MAX = 10000
+
+
+class TokenBucket:
+    def __init__(self, capacity: int, refill_per_second: float, now: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def take(self, now: float) -> Tuple[bool, int]:
+        allowed, retry_after = self.peek(now)
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+        if allowed:
+            self.tokens -= 1
+        return allowed, retry_after
+
+    def peek(self, now: float) -> Tuple[bool, int]:
+        tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        if tokens >= 1:
+            return True, 0
+        return False, max(1, int((1 - tokens) / self.refill_per_second) + 1)
+
+
+class RateLimiter:
+    def __init__(self, redis_url: Optional[str], prefix: str):
+        self.prefix = prefix
+        self._redis = (
+            aioredis.Redis.from_url(redis_url, socket_timeout=0.2, socket_connect_timeout=0.2)
+            if redis_url
+            else None
+        )
+        self._redis_down_until = 0.0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, limit: int, window: int) -> Tuple[bool, int]:
+        """Count a request for key; returns (allowed, retry_after_seconds)"""
+        now = time.time()
+        if self._redis is not None and now >= self._redis_down_until:
+            try:
+                return await self._hit_redis(key, limit, window, now)
+            except (RedisError, OSError) as exc:
+                logger.warning("Rate limiter falls back to local buckets: %s", exc)
+                self._redis_down_until = now + REDIS_RETRY_SECONDS
+        return self._hit_local(key, limit, window, now)
+
+    async def peek(self, key: str, limit: int, window: int) -> Tuple[bool, int]:
+        """Whether a request for key would be allowed, without counting it"""
+        now = time.time()
+        if self._redis is not None and now >= self._redis_down_until:
+            try:
+                redis_key = f"{self.prefix}:{key}"
+                pipe = self._redis.pipeline(transaction=True)
+                pipe.zremrangebyscore(redis_key, 0, now - window)
+                pipe.zcard(redis_key)
+                pipe.zrange(redis_key, 0, 0, withscores=True)
+                _, count, oldest = await pipe.execute()
+                if count < limit:
+                    return True, 0
+                oldest_score = oldest[0][1] if oldest else now
+                return False, max(1, int(oldest_score + window - now) + 1)
+            except (RedisError, OSError) as exc:
+                logger.warning("Rate limiter falls back to local buckets: %s", exc)
+                self._redis_down_until = now + REDIS_RETRY_SECONDS
+        with self._lock:
+            bucket = self._buckets.get(key)
+            return bucket.peek(now) if bucket is not None else (True, 0)
+
+    async def _hit_redis(self, key: str, limit: int, window: int, now: float) -> Tuple[bool, int]:
+        redis_key = f"{self.prefix}:{key}"
+        member = f"{now}:{uuid.uuid4().hex}"
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zremrangebyscore(redis_key, 0, now - window)
+        pipe.zadd(redis_key, {member: now})
+        pipe.zcard(redis_key)
+        pipe.zrange(redis_key, 0, 0, withscores=True)
+        pipe.expire(redis_key, window)
+        _, _, count, oldest, _ = await pipe.execute()
+        if count <= limit:
+            return True, 0
+        # Rejected requests don't occupy the window
+        await self._redis.zrem(redis_key, member)
+        oldest_score = oldest[0][1] if oldest else now
+        return False, max(1, int(oldest_score + window - now) + 1)
+
+    def _hit_local(self, key: str, limit: int, window: int, now: float) -> Tuple[bool, int]:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(limit, limit / window, now)
+                self._buckets[key] = bucket
+                if len(self._buckets) > LOCAL_BUCKETS_MAX:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.take(now)
+
+
+limiter = RateLimiter(settings.redis_url, prefix="ratelimit")
+
+
+TRUSTED_PROXIES = [ipaddress.ip_network(cidr) for cidr in settings.rate_limit_trusted_proxies]
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+
+def get_client_ip(request: Request) -> str:
+    """Client IP; X-Real-IP / X-Forwarded-For are honoured only from rate_limit_trusted_proxies"""
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(peer):
+        return peer
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip:
+        return real_ip.strip()
+    # Rightmost hop not added by a trusted proxy; entries further left are client-supplied
+    forwarded_for = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(forwarded_for):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return peer
+
+
+async def rate_limit_requests(request: Request, call_next):
+    """Per-IP sliding-window limit for all API requests"""
+    if not settings.rate_limit_enabled or request.url.path.startswith(EXEMPT_PATH_PREFIXES):
+        return await call_next(request)
+
+    allowed, retry_after = await limiter.hit(
+        f"ip:{get_client_ip(request)}", settings.rate_limit_requests, settings.rate_limit_window
+    )
+    if not allowed:
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": "Too many requests, try again later"},
+            headers={"Retry-After": str(retry_after)},
+        )
+    return await call_next(request)
+
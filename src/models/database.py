@@ -1,19 +1,38 @@
-from sqlalchemy import create_engine, Column, String, Text, DateTime, ARRAY, ForeignKey
+from sqlalchemy import create_engine, Column, String, Text, DateTime, Float, ForeignKey, Integer, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
 import uuid
 from datetime import datetime
 from src.config import settings
+from src.utils.query_stats import install_query_stats
+from src.utils.slow_queries import install_slow_query_log
+from src.utils.tracing import install_tracing
 
 # Database setup
-engine = create_engine(settings.database_url)
+engine = create_engine(
+    settings.database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+)
+install_query_stats(engine)
+install_slow_query_log(engine)
+install_tracing(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
 class Article(Base):
     __tablename__ = "articles"
+    __table_args__ = (
+        # GIN index serves tag filters (&& for any-of, @> for all-of)
+        Index("ix_articles_tag_list", "tag_list", postgresql_using="gin"),
+        # Author pages: author_id + status filter, newest first
+        Index("ix_articles_author_status_created", "author_id", "status", "created_at"),
+        # Public listings: status filter, newest first
+        Index("ix_articles_status_created", "status", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(200), nullable=False)
@@ -22,13 +41,15 @@ class Article(Base):
     tag_list = Column(ARRAY(String), nullable=True)
     slug = Column(String(255), unique=True, nullable=False, index=True)
     # user_id without foreign key - data ownership pattern
-    author_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    author_id = Column(UUID(as_uuid=True), nullable=False)
     # Status for publication workflow: DRAFT, PENDING_PUBLISH, PUBLISHED, REJECTED, ERROR
-    status = Column(String(32), nullable=False, default="DRAFT", index=True)
+    status = Column(String(32), nullable=False, default="DRAFT")
     # Preview URL for published articles
     preview_url = Column(String(500), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # First publication, never reset; partition key of notification_logs in the users DB
+    published_at = Column(DateTime, nullable=True)
 
     # Relationships
     comments = relationship("Comment", back_populates="article", cascade="all, delete-orphan")
@@ -56,6 +77,46 @@ class Comment(Base):
         return f"<Comment(id={self.id}, article_id='{self.article_id}', author_id='{self.author_id}')>"
 
 
+class TagCount(Base):
+    """Number of PUBLISHED articles per tag, maintained incrementally by ArticleCRUD"""
+    __tablename__ = "tag_counts"
+
+    tag = Column(Text, primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TagCount(tag='{self.tag}', article_count={self.article_count})>"
+
+
+class ArticleWorkflowEvent(Base):
+    """Publication timeline of an article: workflow milestones and saga/notification task runs"""
+    __tablename__ = "article_workflow_events"
+    __table_args__ = (
+        Index("ix_workflow_events_article_created", "article_id", "created_at"),
+        Index("ix_workflow_events_step_created", "step", "created_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # No foreign key: events outlive deleted articles for latency history
+    article_id = Column(UUID(as_uuid=True), nullable=False)
+    # Milestone (publish_requested, published, rejected, notifications_completed) or task step
+    step = Column(String(64), nullable=False)
+    # Milestones: done; task runs: Celery state (SUCCESS, RETRY, FAILURE)
+    status = Column(String(16), nullable=False)
+    task_id = Column(String(64), nullable=True)
+    attempt = Column(Integer, nullable=False, default=0)
+    enqueued_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    queue_wait_ms = Column(Float, nullable=True)
+    run_ms = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ArticleWorkflowEvent(article_id={self.article_id}, step='{self.step}', status='{self.status}')>"
+
+
 class ApiKey(Base):
     __tablename__ = "api_keys"
 
@@ -52,6 +52,10 @@ class UserResponse(UserBase):
 
 
 # Article schemas
+ARTICLE_STATUSES = ("DRAFT", "PENDING_PUBLISH", "PUBLISHED", "REJECTED", "ERROR")
+ARTICLE_STATUS_PATTERN = "^(" + "|".join(ARTICLE_STATUSES) + ")$"
+
+
 class ArticleBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200, description="Article title")
     description: str = Field(..., min_length=1, max_length=500, description="Article description")
@@ -99,11 +103,37 @@ class ArticleResponse(ArticleBase):
         from_attributes = True
 
 
+class ArticleSummaryResponse(BaseModel):
+    """Article list item without the body (optionally with a short excerpt)"""
+    id: UUID
+    slug: str
+    title: str
+    description: str
+    tag_list: Optional[List[str]] = []
+    author_id: UUID
+    status: str
+    preview_url: Optional[str] = None
+    excerpt: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class ArticleListResponse(BaseModel):
     articles: List[ArticleResponse]
     count: int
 
 
+class TagCountResponse(BaseModel):
+    tag: str
+    article_count: int
+
+    class Config:
+        from_attributes = True
+
+
 # Comment schemas
 class CommentBase(BaseModel):
     body: str = Field(..., min_length=1, description="Comment body content")
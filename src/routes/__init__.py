@@ -1,4 +1,4 @@
 # Routes package
-from . import articles, comments, internal
+from . import articles, comments, feed, internal, profiles, tags
 
-__all__ = ["articles", "comments", "internal"]
+__all__ = ["articles", "comments", "feed", "internal", "profiles", "tags"]
@@ -1,9 +1,9 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from pydantic import PositiveInt
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from src.models.database import get_db
 from src.models.schemas import (
@@ -20,6 +20,13 @@ from fastapi import HTTPException, status
 from jose import JWTError
 from src.config import settings
 from src.tasks.saga import enqueue_moderation_task
+from src.utils.users_client import users_client
+from src.utils.serializers import (
+    serialize_article,
+    serialize_article_summary,
+    serialize_many,
+    success_response,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +55,20 @@ def get_user_id_from_token(credentials: HTTPAuthorizationCredentials = Depends(s
         raise credentials_exception
 
 
+def serialize_articles(articles: list, summary: bool, include_author: bool = False) -> List[dict]:
+    """Serialize list items loaded by ArticleCRUD in full or summary view.
+
+    With include_author each item gets an "author" profile (or None) from the users service,
+    looked up with one batch call for the whole page.
+    """
+    items = serialize_many(serialize_article_summary if summary else serialize_article, articles)
+    if include_author and items:
+        profiles = users_client.get_profiles(item["author_id"] for item in items)
+        for item in items:
+            item["author"] = profiles.get(str(item["author_id"]))
+    return items
+
+
 @router.post("/", response_model=SuccessResponse, status_code=status.HTTP_201_CREATED)
 def create_article(
     article_data: ArticleCreate,
@@ -83,17 +104,31 @@ def create_article(
 def get_articles(
     skip: PositiveInt = 0,
     limit: PositiveInt = 100,
+    tag: Optional[List[str]] = Query(None, description="Filter by tag (repeat for several tags)"),
+    tag_match: str = Query("any", pattern="^(any|all)$", description="Match any or all of the tags"),
+    view: str = Query("full", pattern="^(full|summary)$", description="summary omits article body"),
+    excerpt_length: int = Query(0, ge=0, le=1000, description="Body excerpt length in summary view"),
+    include_author: bool = Query(False, description="Embed author profile in each article"),
     db: Session = Depends(get_db)
 ):
-    """Get all articles with pagination"""
+    """Get published articles with pagination, optionally filtered by tags"""
     try:
         crud = ArticleCRUD(db)
-        articles = crud.get_articles(skip=skip, limit=limit)
-        count = crud.get_articles_count()
+        match_all = tag_match == "all"
+        summary = view == "summary"
+        articles = crud.get_articles(
+            skip=skip,
+            limit=limit,
+            tags=tag,
+            match_all=match_all,
+            summary=summary,
+            excerpt_length=excerpt_length,
+        )
+        count = crud.get_articles_count(tags=tag, match_all=match_all)
         
-        articles_data = [ArticleResponse.from_orm(article).dict() for article in articles]
+        articles_data = serialize_articles(articles, summary, include_author)
         
-        return SuccessResponse(
+        return success_response(
             message="Articles retrieved successfully",
             data={
                 "articles": articles_data,
@@ -123,10 +158,10 @@ def get_article_by_slug(
                 detail="Article not found"
             )
         
-        return SuccessResponse(
+        return success_response(
             message="Article retrieved successfully",
             data={
-                "article": ArticleResponse.from_orm(article).dict()
+                "article": serialize_article(article)
             }
         )
     except HTTPException:
@@ -10,6 +10,7 @@ from src.models.database import get_db
 from src.models.schemas import CommentCreate, CommentResponse, CommentListResponse, SuccessResponse, ErrorResponse
 from src.controllers.crud import CommentCRUD, ArticleCRUD
 from src.config import settings
+from src.utils.serializers import serialize_comment, serialize_many, success_response
 
 router = APIRouter()
 security = HTTPBearer()
@@ -103,10 +104,10 @@ async def get_comments(
         )
         count = comment_crud.get_comments_count_by_article(article.id)
         
-        return SuccessResponse(
+        return success_response(
             message="Comments retrieved successfully",
             data={
-                "comments": [CommentResponse.from_orm(comment) for comment in comments],
+                "comments": serialize_many(serialize_comment, comments),
                 "count": count
             }
         )
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from pydantic import PositiveInt
+from uuid import UUID
+
+from src.models.database import get_db
+from src.models.schemas import SuccessResponse
+from src.controllers.feed import FeedCRUD
+from src.routes.articles import get_user_id_from_token, serialize_articles
+from src.utils.serializers import success_response
+from src.tasks.users_db import get_users_db
+from src.config import settings
+
+router = APIRouter(prefix="/api/feed", tags=["feed"])
+
+
+@router.get("/", response_model=SuccessResponse)
+def get_feed(
+    skip: PositiveInt = 0,
+    limit: PositiveInt = 20,
+    view: str = Query("full", pattern="^(full|summary)$", description="summary omits article body"),
+    excerpt_length: int = Query(0, ge=0, le=1000, description="Body excerpt length in summary view"),
+    include_author: bool = Query(False, description="Embed author profile in each article"),
+    user_id: UUID = Depends(get_user_id_from_token),
+    db: Session = Depends(get_db),
+    users_db: Session = Depends(get_users_db)
+):
+    """Get published articles of authors the current user follows"""
+    if skip + limit > settings.feed_max_length:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Feed is limited to {settings.feed_max_length} latest articles"
+        )
+    
+    try:
+        crud = FeedCRUD(db, users_db)
+        summary = view == "summary"
+        articles = crud.get_feed(
+            user_id, skip=skip, limit=limit, summary=summary, excerpt_length=excerpt_length
+        )
+        
+        return success_response(
+            message="Feed retrieved successfully",
+            data={
+                "articles": serialize_articles(articles, summary, include_author)
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+from pydantic import PositiveInt
+from typing import Optional
+from uuid import UUID
+
+from src.models.database import get_db
+from src.models.schemas import SuccessResponse, ARTICLE_STATUS_PATTERN
+from src.controllers.crud import ArticleCRUD
+from src.routes.articles import get_user_id_from_token, serialize_articles
+from src.utils.serializers import success_response
+
+router = APIRouter(prefix="/api/profiles", tags=["profiles"])
+
+optional_security = HTTPBearer(auto_error=False)
+
+
+def get_optional_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> Optional[UUID]:
+    """Extract user_id from JWT token if the request is authenticated"""
+    if credentials is None:
+        return None
+    return get_user_id_from_token(credentials)
+
+
+@router.get("/{author_id}/articles", response_model=SuccessResponse)
+def get_author_articles(
+    author_id: UUID,
+    skip: PositiveInt = 0,
+    limit: PositiveInt = 100,
+    article_status: str = Query("PUBLISHED", alias="status", pattern=ARTICLE_STATUS_PATTERN),
+    view: str = Query("full", pattern="^(full|summary)$", description="summary omits article body"),
+    excerpt_length: int = Query(0, ge=0, le=1000, description="Body excerpt length in summary view"),
+    include_author: bool = Query(False, description="Embed author profile in each article"),
+    user_id: Optional[UUID] = Depends(get_optional_user_id),
+    db: Session = Depends(get_db)
+):
+    """Get articles of an author; non-published statuses are visible to the author only"""
+    if article_status != "PUBLISHED" and user_id != author_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only list your own unpublished articles"
+        )
+    
+    try:
+        crud = ArticleCRUD(db)
+        summary = view == "summary"
+        articles = crud.get_user_articles(
+            author_id,
+            skip=skip,
+            limit=limit,
+            status=article_status,
+            summary=summary,
+            excerpt_length=excerpt_length,
+        )
+        count = crud.get_user_articles_count(author_id, status=article_status)
+        
+        return success_response(
+            message="Articles retrieved successfully",
+            data={
+                "articles": serialize_articles(articles, summary, include_author),
+                "count": count
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
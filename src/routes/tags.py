@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from pydantic import PositiveInt
+
+from src.models.database import get_db
+from src.models.schemas import SuccessResponse, TagCountResponse
+from src.controllers.crud import TagCRUD
+from src.utils.serializers import compile_serializer, serialize_many, success_response
+
+serialize_tag_count = compile_serializer(TagCountResponse)
+
+router = APIRouter(prefix="/api/tags", tags=["tags"])
+
+
+@router.get("/", response_model=SuccessResponse)
+def get_tag_cloud(
+    limit: PositiveInt = 50,
+    db: Session = Depends(get_db)
+):
+    """Get most popular tags of published articles"""
+    try:
+        crud = TagCRUD(db)
+        tags = crud.get_tag_cloud(limit=limit)
+        
+        return success_response(
+            message="Tags retrieved successfully",
+            data={
+                "tags": serialize_many(serialize_tag_count, tags)
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
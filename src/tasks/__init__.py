@@ -1,6 +1,9 @@
 """Background worker tasks for Lab 3 and Lab 4."""
 
+from .feed import enqueue_feed_fanout  # noqa: F401
+from .maintenance import maintain_notification_log_partitions, prune_workflow_events  # noqa: F401
 from .notifications import enqueue_article_notification  # noqa: F401
 from .saga import enqueue_moderation_task  # noqa: F401
 
 
+from . import workflow_events  # noqa: F401  (connects task run recording signals)
@@ -1,6 +1,24 @@
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import before_task_publish, task_postrun, task_prerun
 
 from src.config import settings
+from src.utils.query_stats import end_scope, start_scope
+from src.utils.tracing import (
+    KIND_CONSUMER,
+    TRACEPARENT_HEADER,
+    begin_span,
+    current_traceparent,
+    end_span,
+    tracing_enabled,
+)
+
+logger = logging.getLogger(__name__)
 
 
 celery_app = Celery(
@@ -14,6 +32,19 @@ celery_app.conf.update(
     task_routes={
         "src.tasks.notifications.*": {"queue": settings.notifications_queue},
         "src.tasks.saga.*": {"queue": settings.notifications_queue},
+        "src.tasks.feed.*": {"queue": settings.notifications_queue},
+        "src.tasks.maintenance.*": {"queue": settings.notifications_queue},
+    },
+    # Run by the `scheduler` service (celery beat)
+    beat_schedule={
+        "maintain-notification-log-partitions": {
+            "task": "src.tasks.maintenance.maintain_notification_log_partitions",
+            "schedule": crontab(hour=3, minute=15),
+        },
+        "prune-workflow-events": {
+            "task": "src.tasks.maintenance.prune_workflow_events",
+            "schedule": crontab(hour=3, minute=45),
+        },
     },
     task_serializer="json",
     result_serializer="json",
@@ -27,6 +58,89 @@ celery_app.conf.update(
     task_default_retry_delay=5,
 )
 
+# Per-task SQL query counting (QUERY_STATS_ENABLED); task_id -> (stats, context token)
+_task_query_stats = {}
+
+
+@task_prerun.connect
+def _start_task_query_stats(task_id=None, task=None, **kwargs):
+    if settings.query_stats_enabled:
+        _task_query_stats[task_id] = start_scope(f"task {task.name}")
+
+
+@task_postrun.connect
+def _finish_task_query_stats(task_id=None, task=None, state=None, **kwargs):
+    scope = _task_query_stats.pop(task_id, None)
+    if scope is None:
+        return
+    stats, token = scope
+    end_scope(stats, token)
+    logger.info(
+        "Task %s[%s] %s: %s queries, %.2f ms in DB",
+        task.name,
+        task_id,
+        state,
+        stats.count,
+        stats.total_ms,
+    )
+
+
+# Publish time travels in message headers so workers can measure broker queue wait
+PUBLISHED_AT_HEADER = "published_at"
+
+
+@before_task_publish.connect
+def _add_publish_headers(headers=None, **kwargs):
+    if headers is None:
+        return
+    headers[PUBLISHED_AT_HEADER] = time.time()
+    traceparent = current_traceparent()
+    if traceparent:
+        headers[TRACEPARENT_HEADER] = traceparent
+
+
+def ready_at(request) -> Optional[float]:
+    """Epoch time a received task became runnable: publish time or its countdown/ETA if later"""
+    published_at = getattr(request, PUBLISHED_AT_HEADER, None)
+    if not published_at:
+        return None
+    eta = request.eta
+    if eta:
+        eta = datetime.fromisoformat(eta) if isinstance(eta, str) else eta
+        return max(published_at, eta.timestamp())
+    return published_at
+
+
+# Tracing (TRACING_EXPORTER): one span per task run; task_id -> (span, context token)
+_task_spans = {}
+
+
+@task_prerun.connect
+def _start_task_span(task_id=None, task=None, **kwargs):
+    if not tracing_enabled():
+        return
+    request = task.request
+    span, token = begin_span(f"task {task.name}", KIND_CONSUMER, getattr(request, TRACEPARENT_HEADER, None))
+    span.set("celery.task_id", task_id)
+    span.set("celery.retries", request.retries or 0)
+    runnable_at = ready_at(request)
+    if runnable_at:
+        span.set("messaging.queue_wait_ms", round(max(time.time() - runnable_at, 0) * 1000, 2))
+    _task_spans[task_id] = (span, token)
+
+
+@task_postrun.connect
+def _finish_task_span(task_id=None, state=None, **kwargs):
+    scope = _task_spans.pop(task_id, None)
+    if scope is None:
+        return
+    span, token = scope
+    span.set("celery.state", state)
+    if state == "FAILURE":
+        span.error = "task failed"
+    end_span(span, token)
+
+
 __all__ = ["celery_app"]
 
 
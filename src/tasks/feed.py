@@ -0,0 +1,149 @@
+"""Feed fan-out task: push published articles into followers' Redis feeds"""
+import logging
+from datetime import datetime, timezone
+from uuid import UUID
+
+from redis import RedisError
+
+from src.config import settings
+from src.models.database import Article, SessionLocal as BackendSession
+from src.tasks.celery_app import celery_app
+from src.tasks.users_db import FollowCount, Subscriber, get_users_session
+from src.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+FANOUT_PIPELINE_CHUNK = 500
+
+# Authors whose posts are not fanned out on write (too many followers)
+MEGA_AUTHORS_KEY = "feed:mega-authors"
+
+
+def feed_key(user_id: UUID) -> str:
+    """Redis sorted set with article ids of a user's feed (score: publication timestamp)"""
+    return f"feed:{user_id}"
+
+
+def article_score(published_at: datetime) -> float:
+    """Feed score for an article: first publication time (naive UTC), created_at if unset"""
+    return published_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+@celery_app.task(
+    name="src.tasks.feed.fan_out_post",
+    bind=True,
+    max_retries=3,
+    default_retry_delay=5,
+    retry_backoff=True,
+    retry_jitter=True,
+)
+def fan_out_post(self, post_id: str, author_id: str):
+    """Add a PUBLISHED article to every follower's feed (idempotent: ZADD overwrites)."""
+    post_uuid = UUID(str(post_id).strip())
+    author_uuid = UUID(str(author_id).strip())
+
+    backend_session = BackendSession()
+    users_session = get_users_session()
+
+    try:
+        article = (
+            backend_session.query(Article.id, Article.status, Article.published_at, Article.created_at)
+            .filter(Article.id == post_uuid)
+            .one_or_none()
+        )
+        if not article or article.status != "PUBLISHED":
+            logger.info("Article %s is not published, skipping feed fan-out", post_id)
+            return
+
+        # Mega-author check reads the follow counter instead of loading followers
+        max_followers = settings.feed_fanout_max_followers
+        followers_count = (
+            users_session.query(FollowCount.followers_count)
+            .filter(FollowCount.user_id == author_uuid)
+            .scalar()
+        ) or 0
+
+        redis_client = get_redis()
+        if followers_count > max_followers:
+            # Followers will merge this author's posts on read
+            redis_client.sadd(MEGA_AUTHORS_KEY, str(author_uuid))
+            logger.info("Author %s has over %s followers, feed is built on read", author_id, max_followers)
+            return
+        redis_client.srem(MEGA_AUTHORS_KEY, str(author_uuid))
+
+        follower_ids = [
+            row.subscriber_id
+            for row in users_session.query(Subscriber.subscriber_id)
+            .filter(Subscriber.author_id == author_uuid)
+            .all()
+        ]
+
+        # A draft published long after it was written is still new in followers' feeds
+        score = article_score(article.published_at or article.created_at)
+        for start in range(0, len(follower_ids), FANOUT_PIPELINE_CHUNK):
+            pipe = redis_client.pipeline(transaction=False)
+            for follower_id in follower_ids[start:start + FANOUT_PIPELINE_CHUNK]:
+                key = feed_key(follower_id)
+                pipe.zadd(key, {str(post_uuid): score})
+                # Keep only the newest feed_max_length entries
+                pipe.zremrangebyrank(key, 0, -(settings.feed_max_length + 1))
+            pipe.execute()
+
+        logger.info("Article %s fanned out to %s feeds", post_id, len(follower_ids))
+    except RedisError as exc:
+        logger.error("Feed fan-out failed for article %s: %s", post_id, exc)
+        raise self.retry(exc=exc)
+    finally:
+        backend_session.close()
+        users_session.close()
+
+
+@celery_app.task(
+    name="src.tasks.feed.remove_post_from_feeds",
+    bind=True,
+    max_retries=3,
+    default_retry_delay=5,
+    retry_backoff=True,
+    retry_jitter=True,
+)
+def remove_post_from_feeds(self, post_id: str, author_id: str):
+    """Drop an unpublished or deleted article from every follower's feed (idempotent: ZREM)."""
+    author_uuid = UUID(str(author_id).strip())
+    users_session = get_users_session()
+
+    try:
+        follower_ids = [
+            row.subscriber_id
+            for row in users_session.query(Subscriber.subscriber_id)
+            .filter(Subscriber.author_id == author_uuid)
+            .all()
+        ]
+        redis_client = get_redis()
+        for start in range(0, len(follower_ids), FANOUT_PIPELINE_CHUNK):
+            pipe = redis_client.pipeline(transaction=False)
+            for follower_id in follower_ids[start:start + FANOUT_PIPELINE_CHUNK]:
+                pipe.zrem(feed_key(follower_id), str(post_id))
+            pipe.execute()
+
+        logger.info("Article %s removed from %s feeds", post_id, len(follower_ids))
+    except RedisError as exc:
+        logger.error("Feed removal failed for article %s: %s", post_id, exc)
+        raise self.retry(exc=exc)
+    finally:
+        users_session.close()
+
+
+def enqueue_feed_fanout(author_id: UUID, article_id: UUID) -> None:
+    """Helper for saga tasks."""
+    fan_out_post.apply_async(
+        kwargs={"post_id": str(article_id), "author_id": str(author_id)},
+        queue=settings.notifications_queue,
+    )
+
+
+def enqueue_feed_removal(author_id: UUID, article_id: UUID) -> None:
+    """Helper for the API layer: article left PUBLISHED (feed reads also skip it meanwhile)."""
+    remove_post_from_feeds.apply_async(
+        kwargs={"post_id": str(article_id), "author_id": str(author_id)},
+        queue=settings.notifications_queue,
+    )
@@ -0,0 +1,171 @@
+"""Periodic maintenance: notification_logs partitions and article_workflow_events retention.
+
+notification_logs is partitioned by month of article_published_at (users_service alembic
+004/005). maintain_notification_log_partitions, run daily by celery beat, creates partitions
+for the coming months so inserts never land in the DEFAULT partition, and detaches
+partitions entirely older than notification_log_retention_days. Detached partitions are
+dropped, or moved to notification_log_archive_schema when it is set. Rows that still end up
+in the DEFAULT partition (e.g. keyed before a migration) are deleted once past retention,
+and any left there are reported so a missing partition does not go unnoticed.
+prune_workflow_events deletes publication timeline rows older than
+workflow_event_retention_days from the main DB.
+"""
+import logging
+import re
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+from src.config import settings
+from src.models.database import ArticleWorkflowEvent, SessionLocal as BackendSession
+from src.tasks.celery_app import celery_app
+from src.tasks.users_db import users_engine
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "notification_logs"
+PARTITION_NAME_RE = re.compile(r"^notification_logs_p(\d{4})(\d{2})$")
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+
+def month_start(value: date, offset: int = 0) -> date:
+    month_index = value.year * 12 + value.month - 1 + offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def _list_partitions(connection) -> List[Tuple[str, date]]:
+    rows = connection.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :parent
+            """
+        ),
+        {"parent": PARENT_TABLE},
+    ).scalars()
+    partitions = []
+    for name in rows:
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+@celery_app.task(
+    name="src.tasks.maintenance.maintain_notification_log_partitions",
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    retry_backoff=True,
+    retry_jitter=True,
+)
+def maintain_notification_log_partitions(self):
+    """Create upcoming monthly partitions and drop or archive expired ones."""
+    today = datetime.utcnow().date()
+    cutoff = today - timedelta(days=settings.notification_log_retention_days)
+    archive_schema = settings.notification_log_archive_schema
+    created, removed = [], []
+
+    try:
+        with users_engine.begin() as connection:
+            existing = {name for name, _ in _list_partitions(connection)}
+            for offset in range(settings.notification_log_partitions_ahead + 1):
+                month = month_start(today, offset)
+                name = partition_name(month)
+                if name in existing:
+                    continue
+                connection.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{month_start(month, 1).isoformat()}')"
+                    )
+                )
+                created.append(name)
+
+        with users_engine.connect() as connection:
+            partitions = _list_partitions(connection)
+        for name, month in partitions:
+            # Whole month must be past the retention cutoff
+            if month_start(month, 1) > cutoff:
+                continue
+            with users_engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+                if archive_schema:
+                    connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+                    connection.execute(text(f'ALTER TABLE {name} SET SCHEMA "{archive_schema}"'))
+                else:
+                    connection.execute(text(f"DROP TABLE {name}"))
+            removed.append(name)
+
+        with users_engine.begin() as connection:
+            default_exists = connection.execute(
+                text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}
+            ).scalar()
+            default_deleted = default_rows = 0
+            if default_exists:
+                default_deleted = connection.execute(
+                    text(f"DELETE FROM {DEFAULT_PARTITION} WHERE article_published_at < :cutoff"),
+                    {"cutoff": cutoff},
+                ).rowcount
+                default_rows = connection.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}")).scalar()
+    except Exception as exc:
+        logger.error("notification_logs partition maintenance failed: %s", exc)
+        raise self.retry(exc=exc)
+
+    logger.info(
+        "notification_logs partitions: created %s, %s %s, expired DEFAULT rows deleted: %s",
+        created or "none",
+        "archived" if archive_schema else "dropped",
+        removed or "none",
+        default_deleted,
+    )
+    if default_rows:
+        logger.warning(
+            "%s rows in %s are outside every monthly partition",
+            default_rows,
+            DEFAULT_PARTITION,
+        )
+    return {
+        "created": created,
+        "removed": removed,
+        "default_deleted": default_deleted,
+        "default_rows": default_rows,
+    }
+
+
+@celery_app.task(
+    name="src.tasks.maintenance.prune_workflow_events",
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+    retry_backoff=True,
+    retry_jitter=True,
+)
+def prune_workflow_events(self):
+    """Delete article_workflow_events past the retention window."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.workflow_event_retention_days)
+    session = BackendSession()
+    try:
+        deleted = (
+            session.query(ArticleWorkflowEvent)
+            .filter(ArticleWorkflowEvent.created_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+        session.commit()
+    except Exception as exc:
+        session.rollback()
+        logger.error("article_workflow_events pruning failed: %s", exc)
+        raise self.retry(exc=exc)
+    finally:
+        session.close()
+
+    logger.info("article_workflow_events: deleted %s rows older than %s", deleted, cutoff)
+    return {"deleted": deleted}
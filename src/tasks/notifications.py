@@ -1,21 +1,24 @@
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-import requests
-from requests import HTTPError, RequestException
+from redis import RedisError, ResponseError
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
 from src.config import settings
+from src.controllers.workflow_events import STEP_NOTIFIED, WorkflowEventCRUD
 from src.models.database import Article, SessionLocal as BackendSession
 from src.tasks.celery_app import celery_app
+from src.tasks.push_delivery import PROBE, CircuitOpen, breaker, concurrency, send_wave
+from src.tasks.subscriber_cache import get_subscriber_ids, get_subscription_keys
 from src.tasks.users_db import (
     NotificationLog,
-    Subscriber,
-    User,
     get_users_session,
 )
+from src.utils.redis_client import get_redis
+from src.utils.tracing import KIND_CLIENT, start_span
 
 logger = logging.getLogger(__name__)
 
@@ -27,45 +30,179 @@ def _format_message(author_id: UUID, article: Article) -> str:
     )
 
 
-def _get_subscribers(session: Session, author_id: UUID):
-    return (
-        session.query(Subscriber.subscriber_id, User.subscription_key)
-        .join(User, User.id == Subscriber.subscriber_id)
-        .filter(Subscriber.author_id == author_id)
-        .all()
+def _format_digest_message(author_id: UUID, articles: List[Article]) -> str:
+    titles = ", ".join(
+        f"{((article.title or '').strip() or 'пост')[:10]}..." for article in articles[:3]
     )
+    more = f" и ещё {len(articles) - 3}" if len(articles) > 3 else ""
+    return f"Пользователь {author_id} выпустил {len(articles)} новых постов: {titles}{more}"
+
+
+def pending_notifications_key(author_id: UUID) -> str:
+    """Redis list of article ids waiting for the author's coalescing window to close"""
+    return f"notify:pending:{author_id}"
+
+
+def coalesce_window_key(author_id: UUID) -> str:
+    """Set while a flush is scheduled for the author's pending notifications"""
+    return f"notify:window:{author_id}"
+
+
+def _get_subscribers(session: Session, author_id: UUID):
+    """(subscriber_id, subscription_key) pairs from the version-stamped subscriber cache"""
+    subscriber_ids = get_subscriber_ids(session, author_id)
+    keys = get_subscription_keys(session, subscriber_ids)
+    return [(subscriber_id, keys.get(subscriber_id)) for subscriber_id in subscriber_ids]
+
+
+def _deliver(session: Session, deliveries: list, message: str, article_id: str) -> Optional[int]:
+    """Send pushes in waves sized by adaptive concurrency.
 
+    Returns retry countdown in seconds if some deliveries failed transiently, None when
+    every push was sent or permanently rejected. Raises CircuitOpen when the remaining
+    deliveries must wait for the push service to recover.
+    """
+    retry_after = None
+    index = 0
+    while index < len(deliveries):
+        try:
+            mode = breaker.allow()
+        except CircuitOpen:
+            logger.warning(
+                "Push circuit open, postponing %s notifications for article %s",
+                len(deliveries) - index,
+                article_id,
+            )
+            raise
 
-def _get_or_create_notification_log(
-    session: Session, *, subscriber_id: UUID, author_id: UUID, article_id: UUID
-) -> Optional[NotificationLog]:
-    log = (
+        size = 1 if mode == PROBE else concurrency.limit
+        wave = deliveries[index:index + size]
+        index += len(wave)
+
+        for _, _, log_entry in wave:
+            log_entry.status = "processing"
+            log_entry.updated_at = datetime.utcnow()
+        session.commit()
+        logger.info(
+            "Sending notification for article %s to %s subscribers", article_id, len(wave)
+        )
+
+        with start_span("push wave", KIND_CLIENT) as span:
+            results = send_wave([subscription_key for _, subscription_key, _ in wave], message)
+            if span is not None:
+                span.set("push.size", len(wave))
+                span.set("push.failed", sum(1 for result in results if not result.ok))
+        breaker.record(results, mode)
+        concurrency.on_wave(results)
+
+        for (subscriber_id, _, log_entry), result in zip(wave, results):
+            log_entry.updated_at = datetime.utcnow()
+            log_entry.status = "sent" if result.ok else "failed"
+            log_entry.last_error = None if result.ok else result.error
+            if result.ok:
+                continue
+            if result.transient:
+                logger.error("Push error for subscriber %s: %s", subscriber_id, result.error)
+                retry_after = settings.push_timeout_seconds
+            else:
+                logger.warning("Push rejected for subscriber %s: %s", subscriber_id, result.error)
+        session.commit()
+
+    return retry_after
+
+
+def _article_published_at(article: Article) -> datetime:
+    return article.published_at or article.created_at
+
+
+def _prepare_notification_logs(
+    session: Session,
+    *,
+    author_id: UUID,
+    subscriber_ids: List[UUID],
+    articles: List[Article],
+) -> Dict[UUID, NotificationLog]:
+    """Log row per subscriber still to be notified: one row per push, a digest included.
+
+    The row is keyed by the newest article; a digest lists all its articles in
+    coalesced_article_ids, so a re-enqueue of any of them is not sent again. Existing rows
+    are loaded with one query and the missing ones inserted with one commit.
+    """
+    newest = articles[-1]
+    article_ids = [article.id for article in articles]
+    of_articles = or_(
+        NotificationLog.article_id.in_(article_ids),
+        NotificationLog.coalesced_article_ids.overlap(article_ids),
+    )
+    oldest_published_at = min(map(_article_published_at, articles))
+    # Rows of these articles are keyed no earlier than the oldest one's publication, which
+    # prunes the older partitions
+    existing = (
         session.query(NotificationLog)
         .filter(
-            NotificationLog.subscriber_id == subscriber_id,
-            NotificationLog.article_id == article_id,
+            NotificationLog.subscriber_id.in_(subscriber_ids),
+            NotificationLog.article_published_at >= oldest_published_at,
+            of_articles,
         )
-        .one_or_none()
+        .all()
     )
-    if log and log.status == "sent":
-        return None
-    if not log:
-        log = NotificationLog(
-            subscriber_id=subscriber_id,
-            author_id=author_id,
-            article_id=article_id,
-            status="pending",
-            attempts=0,
+    # Rows written before articles.published_at existed (users_service alembic 004/005) are
+    # keyed by the log's or the draft's creation time, possibly earlier: look for those in
+    # the older partitions too, so a re-enqueued old article is not pushed twice
+    matched = {log.subscriber_id for log in existing}
+    unmatched = [subscriber_id for subscriber_id in subscriber_ids if subscriber_id not in matched]
+    if unmatched:
+        existing += (
+            session.query(NotificationLog)
+            .filter(
+                NotificationLog.subscriber_id.in_(unmatched),
+                NotificationLog.article_published_at < oldest_published_at,
+                of_articles,
+            )
+            .all()
         )
-        session.add(log)
-    else:
+    sent: Dict[UUID, set] = {}
+    reusable: Dict[UUID, NotificationLog] = {}
+    for log in existing:
+        if log.status == "sent":
+            sent.setdefault(log.subscriber_id, set()).update(log.coalesced_article_ids or [log.article_id])
+        if log.article_id == newest.id:
+            reusable[log.subscriber_id] = log
+
+    logs = {}
+    now = datetime.utcnow()
+    for subscriber_id in subscriber_ids:
+        if sent.get(subscriber_id, set()).issuperset(article_ids):
+            continue
+        log = reusable.get(subscriber_id)
+        if log is None:
+            log = NotificationLog(
+                subscriber_id=subscriber_id,
+                author_id=author_id,
+                article_id=newest.id,
+                article_published_at=_article_published_at(newest),
+                attempts=0,
+            )
+            session.add(log)
+        log.coalesced_article_ids = article_ids if len(articles) > 1 else None
         log.status = "pending"
-    log.attempts = (log.attempts or 0) + 1
-    log.last_error = None
-    log.updated_at = datetime.utcnow()
-    session.commit()
-    session.refresh(log)
-    return log
+        log.attempts = (log.attempts or 0) + 1
+        log.last_error = None
+        log.updated_at = now
+        logs[subscriber_id] = log
+    if logs:
+        session.commit()
+    return logs
+
+
+def _record_notified(session: Session, article_ids: List[UUID]) -> None:
+    """notifications_completed milestone (publish latency SLO); never fails the task"""
+    try:
+        WorkflowEventCRUD(session).add_milestone(article_ids, STEP_NOTIFIED)
+        session.commit()
+    except Exception as exc:
+        session.rollback()
+        logger.warning("Failed to record notification completion for %s: %s", article_ids, exc)
 
 
 @celery_app.task(
@@ -76,105 +213,177 @@ def _get_or_create_notification_log(
     retry_backoff=True,
     retry_jitter=True,
 )
-def notify_followers(self, author_id: str, article_id: str):
-    """Send push notifications to all subscribers of the author."""
+def notify_followers(self, author_id: str, article_id: Optional[str] = None, article_ids: Optional[List[str]] = None):
+    """Send push notifications to all subscribers of the author.
+
+    With article_ids (coalesced posts) every subscriber gets one digest push, logged once
+    under the newest article together with the ids of all coalesced ones.
+    """
     author_uuid = UUID(author_id)
-    article_uuid = UUID(article_id)
+    requested_ids = [UUID(a) for a in (article_ids or [article_id])]
 
     backend_session = BackendSession()
     users_session = get_users_session()
 
     try:
-        article = (
+        articles = (
             backend_session.query(Article)
-            .filter(Article.id == article_uuid)
-            .one_or_none()
+            .filter(Article.id.in_(requested_ids))
+            .order_by(func.coalesce(Article.published_at, Article.created_at))
+            .all()
         )
-        if not article:
-            logger.warning("Article %s not found, skipping notification", article_id)
+        if not articles:
+            logger.warning("Articles %s not found, skipping notification", requested_ids)
             return
+        if len(articles) == 1:
+            message = _format_message(author_uuid, articles[0])
+        else:
+            message = _format_digest_message(author_uuid, articles)
+        article_id = str(articles[-1].id)
 
         subscribers = _get_subscribers(users_session, author_uuid)
         if not subscribers:
             logger.info("No subscribers found for author %s", author_id)
+            _record_notified(backend_session, [article.id for article in articles])
             return
 
+        reachable = {}
         for subscriber_id, subscription_key in subscribers:
             if not subscription_key:
                 logger.warning(
                     "Skip subscriber %s: subscription key is missing", subscriber_id
                 )
                 continue
+            reachable[subscriber_id] = subscription_key
 
-            log_entry = _get_or_create_notification_log(
+        log_entries = (
+            _prepare_notification_logs(
                 users_session,
-                subscriber_id=subscriber_id,
                 author_id=author_uuid,
-                article_id=article_uuid,
+                subscriber_ids=list(reachable),
+                articles=articles,
             )
-            if not log_entry:
-                continue  # already sent
+            if reachable
+            else {}
+        )
+        # Subscribers without a log entry were already sent these articles
+        deliveries = [
+            (subscriber_id, reachable[subscriber_id], log_entry)
+            for subscriber_id, log_entry in log_entries.items()
+        ]
 
-            message = _format_message(author_uuid, article)
-            log_entry.status = "processing"
-            log_entry.updated_at = datetime.utcnow()
-            users_session.commit()
-            logger.info(
-                "Sending notification for article %s to subscriber %s",
-                article_id,
-                subscriber_id,
+        try:
+            retry_after = _deliver(users_session, deliveries, message, article_id)
+        except CircuitOpen as exc:
+            # Nothing failed yet: postponed as a fresh message so an outage longer than
+            # max_retries open periods does not drop the pending pushes
+            self.apply_async(
+                args=self.request.args,
+                kwargs=self.request.kwargs,
+                countdown=exc.retry_after,
+                queue=settings.notifications_queue,
             )
-
-            try:
-                response = requests.post(
-                    settings.push_service_url,
-                    headers={
-                        "Authorization": f"Bearer {subscription_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={"message": message},
-                    timeout=settings.push_timeout_seconds,
-                )
-                if 400 <= response.status_code < 500:
-                    logger.warning(
-                        "Push rejected for subscriber %s: %s",
-                        subscriber_id,
-                        response.text,
-                    )
-                    log_entry.status = "failed"
-                    log_entry.last_error = (
-                        f"{response.status_code}: {response.text[:200]}"
-                    )
-                    users_session.commit()
-                    continue
-                response.raise_for_status()
-                log_entry.status = "sent"
-                log_entry.last_error = None
-                log_entry.updated_at = datetime.utcnow()
-                users_session.commit()
-            except HTTPError as exc:
-                logger.error(
-                    "Push HTTP error for subscriber %s: %s", subscriber_id, exc
-                )
-                log_entry.status = "failed"
-                log_entry.last_error = str(exc)
-                users_session.commit()
-                raise self.retry(exc=exc)
-            except RequestException as exc:
-                logger.error(
-                    "Push network error for subscriber %s: %s", subscriber_id, exc
-                )
-                log_entry.status = "failed"
-                log_entry.last_error = str(exc)
-                users_session.commit()
-                raise self.retry(exc=exc)
+            return
+        if retry_after is not None:
+            raise self.retry(countdown=retry_after)
+        _record_notified(backend_session, [article.id for article in articles])
     finally:
         backend_session.close()
         users_session.close()
 
 
+@celery_app.task(
+    name="src.tasks.notifications.flush_author_notifications",
+    bind=True,
+    max_retries=5,
+    default_retry_delay=5,
+    retry_backoff=True,
+    retry_jitter=True,
+)
+def flush_author_notifications(self, author_id: str):
+    """Close the author's coalescing window and notify followers about all pending posts."""
+    author_uuid = UUID(author_id)
+    pending_key = pending_notifications_key(author_uuid)
+    # Claimed under a per-task key: posts pushed meanwhile start a fresh list, a concurrent
+    # flush finds nothing, and a retry of this task reads the same batch again
+    batch_key = f"{pending_key}:{self.request.id}"
+    redis_client = get_redis()
+    try:
+        # Posts published from now on open a new window
+        redis_client.delete(coalesce_window_key(author_uuid))
+        if not redis_client.exists(batch_key):
+            try:
+                redis_client.rename(pending_key, batch_key)
+            except ResponseError:
+                return  # no pending posts
+        pending = redis_client.lrange(batch_key, 0, -1)
+    except RedisError as exc:
+        logger.error("Failed to read pending notifications of author %s: %s", author_id, exc)
+        raise self.retry(exc=exc)
+
+    article_ids = list(dict.fromkeys(pending))
+    if article_ids:
+        logger.info("Coalesced %s posts of author %s into one notification", len(article_ids), author_id)
+        kwargs = {"author_id": author_id}
+        if len(article_ids) == 1:
+            kwargs["article_id"] = article_ids[0]
+        else:
+            kwargs["article_ids"] = article_ids
+        try:
+            notify_followers.apply_async(kwargs=kwargs, queue=settings.notifications_queue)
+        except Exception as exc:
+            logger.error("Failed to enqueue notification of author %s: %s", author_id, exc)
+            raise self.retry(exc=exc)
+    try:
+        redis_client.delete(batch_key)
+    except RedisError as exc:
+        logger.warning("Failed to delete notification batch %s: %s", batch_key, exc)
+
+
+def _schedule_flush(author_id: UUID, window: int) -> None:
+    flush_author_notifications.apply_async(
+        kwargs={"author_id": str(author_id)},
+        countdown=window,
+        queue=settings.notifications_queue,
+    )
+
+
 def enqueue_article_notification(author_id: UUID, article_id: UUID) -> None:
-    """Helper for API layer."""
+    """Helper for API layer.
+
+    Posts of one author published within notify_coalesce_window_seconds of the first one
+    are sent as a single digest when the window closes.
+    """
+    window = settings.notify_coalesce_window_seconds
+    if window > 0:
+        try:
+            window_was_open = bool(get_redis().exists(coalesce_window_key(author_id)))
+        except RedisError as exc:
+            logger.warning("Notification coalescing unavailable, notifying immediately: %s", exc)
+        else:
+            if not window_was_open:
+                # Scheduled before the window opens: if the broker is down nothing is left pending.
+                # A flush that loses the race below only closes the other window early.
+                _schedule_flush(author_id, window)
+            try:
+                pipe = get_redis().pipeline(transaction=True)
+                # No TTL: the list survives a backed-up queue until a flush reads it
+                pipe.rpush(pending_notifications_key(author_id), str(article_id))
+                # Expires on its own if the flush task is lost, so the next post schedules a new one
+                pipe.set(coalesce_window_key(author_id), "1", nx=True, ex=window * 2 + 60)
+                _, window_opened = pipe.execute()
+            except RedisError as exc:
+                logger.warning("Notification coalescing unavailable, notifying immediately: %s", exc)
+            else:
+                if window_opened and window_was_open:
+                    # The window closed between the check and the push: this post needs its own flush
+                    try:
+                        _schedule_flush(author_id, window)
+                    except Exception:
+                        get_redis().delete(coalesce_window_key(author_id))
+                        raise
+                return
+
     notify_followers.apply_async(
         kwargs={"author_id": str(author_id), "article_id": str(article_id)},
         queue=settings.notifications_queue,
@@ -0,0 +1,223 @@
+"""Push delivery with a Redis-shared circuit breaker and AIMD adaptive concurrency.
+
+Breaker states (shared by all worker processes):
+- closed: requests flow; outcomes are counted in per-window buckets and the breaker opens
+  when the error rate over the last two buckets exceeds push_breaker_error_threshold;
+- open: `push:breaker:open` exists (TTL push_breaker_cooldown_seconds), nothing is sent;
+- half-open: cooldown passed but `push:breaker:half-open` is still set; a single process
+  wins the probe lock and sends one request. Success closes the breaker, failure re-opens it.
+
+Concurrency per worker process follows AIMD: +1 in-flight request after a healthy wave,
+halved after a wave with transient errors or median latency above push_target_latency_ms.
+"""
+import logging
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+
+import requests
+from redis import RedisError
+from requests.adapters import HTTPAdapter
+
+from src.config import settings
+from src.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+BREAKER_PREFIX = "push:breaker"
+
+CLOSED = "closed"
+PROBE = "probe"
+
+
+class CircuitOpen(Exception):
+    """Push service is considered down; retry after retry_after seconds"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Push circuit is open, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PushResult(NamedTuple):
+    status_code: Optional[int]
+    error: Optional[str]
+    latency_ms: float
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code is not None and 200 <= self.status_code < 300
+
+    @property
+    def transient(self) -> bool:
+        """Failure caused by the push service rather than by the request (worth retrying)"""
+        if self.status_code is None:
+            return True
+        return self.status_code == 429 or self.status_code >= 500
+
+
+class PushCircuitBreaker:
+    def __init__(self, prefix: str = BREAKER_PREFIX):
+        self.open_key = f"{prefix}:open"
+        self.half_open_key = f"{prefix}:half-open"
+        self.probe_key = f"{prefix}:probe"
+        self.stats_prefix = f"{prefix}:stats"
+
+    def _bucket_key(self, bucket: int) -> str:
+        return f"{self.stats_prefix}:{bucket}"
+
+    def allow(self) -> str:
+        """CLOSED or PROBE if a request may be sent, raises CircuitOpen otherwise"""
+        try:
+            redis_client = get_redis()
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.ttl(self.open_key)
+            pipe.exists(self.half_open_key)
+            open_ttl, half_open = pipe.execute()
+            if open_ttl and open_ttl > 0:
+                raise CircuitOpen(open_ttl)
+            if not half_open:
+                return CLOSED
+            # Half-open: only the process holding the probe lock may send
+            if redis_client.set(self.probe_key, "1", nx=True, ex=settings.push_timeout_seconds * 2):
+                logger.info("Push circuit half-open, sending probe request")
+                return PROBE
+            raise CircuitOpen(1)
+        except RedisError as exc:
+            # Breaker state is unknown: deliver rather than stall notifications
+            logger.warning("Push circuit breaker unavailable: %s", exc)
+            return CLOSED
+
+    def trip(self) -> None:
+        cooldown = settings.push_breaker_cooldown_seconds
+        pipe = get_redis().pipeline(transaction=True)
+        pipe.set(self.open_key, "1", ex=cooldown)
+        pipe.set(self.half_open_key, "1", ex=cooldown * 10)
+        pipe.delete(self.probe_key)
+        pipe.execute()
+        logger.error("Push circuit opened for %ss", cooldown)
+
+    def close(self) -> None:
+        now_bucket = int(time.time() // settings.push_breaker_window_seconds)
+        get_redis().delete(
+            self.open_key,
+            self.half_open_key,
+            self.probe_key,
+            self._bucket_key(now_bucket),
+            self._bucket_key(now_bucket - 1),
+        )
+        logger.info("Push circuit closed")
+
+    def record(self, results: List[PushResult], mode: str) -> None:
+        """Count outcomes of a wave and open / close the breaker accordingly"""
+        if not results:
+            return
+        failures = sum(1 for result in results if result.transient)
+        try:
+            if mode == PROBE:
+                if failures:
+                    self.trip()
+                else:
+                    self.close()
+                return
+
+            window = settings.push_breaker_window_seconds
+            bucket = int(time.time() // window)
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.hincrby(self._bucket_key(bucket), "total", len(results))
+            pipe.hincrby(self._bucket_key(bucket), "failed", failures)
+            pipe.expire(self._bucket_key(bucket), window * 2)
+            pipe.hgetall(self._bucket_key(bucket - 1))
+            total, failed, _, previous = pipe.execute()
+            total += int(previous.get("total", 0))
+            failed += int(previous.get("failed", 0))
+            if (
+                total >= settings.push_breaker_min_requests
+                and failed / total >= settings.push_breaker_error_threshold
+            ):
+                self.trip()
+        except RedisError as exc:
+            logger.warning("Failed to update push circuit breaker: %s", exc)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit of concurrent push requests in this worker process"""
+
+    def __init__(self, initial: int, min_limit: int, max_limit: int, target_latency_ms: float):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency_ms = target_latency_ms
+        self._limit = float(max(min_limit, min(max_limit, initial)))
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_wave(self, results: List[PushResult]) -> None:
+        if not results:
+            return
+        congested = any(result.transient for result in results) or (
+            statistics.median(result.latency_ms for result in results) > self.target_latency_ms
+        )
+        with self._lock:
+            if congested:
+                self._limit = max(self.min_limit, self._limit / 2)
+            elif len(results) >= self.limit:
+                # Increase only when the whole window was in use
+                self._limit = min(self.max_limit, self._limit + 1)
+
+
+breaker = PushCircuitBreaker()
+concurrency = AdaptiveConcurrency(
+    initial=settings.push_initial_concurrency,
+    min_limit=settings.push_min_concurrency,
+    max_limit=settings.push_max_concurrency,
+    target_latency_ms=settings.push_target_latency_ms,
+)
+
+_session: Optional[requests.Session] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_init_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Created lazily so that each prefork worker process gets its own threads and sockets
+    global _session, _executor
+    with _init_lock:
+        if _executor is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=settings.push_max_concurrency)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.push_max_concurrency, thread_name_prefix="push"
+            )
+        return _executor
+
+
+def send_push(subscription_key: str, message: str) -> PushResult:
+    start = time.perf_counter()
+    try:
+        response = _session.post(
+            settings.push_service_url,
+            headers={
+                "Authorization": f"Bearer {subscription_key}",
+                "Content-Type": "application/json",
+            },
+            json={"message": message},
+            timeout=(settings.push_connect_timeout_seconds, settings.push_timeout_seconds),
+        )
+    except requests.RequestException as exc:
+        return PushResult(None, str(exc), (time.perf_counter() - start) * 1000)
+    latency_ms = (time.perf_counter() - start) * 1000
+    if 200 <= response.status_code < 300:
+        return PushResult(response.status_code, None, latency_ms)
+    return PushResult(response.status_code, f"{response.status_code}: {response.text[:200]}", latency_ms)
+
+
+def send_wave(subscription_keys: List[str], message: str) -> List[PushResult]:
+    """Send pushes concurrently; results are in input order"""
+    executor = _get_executor()
+    return list(executor.map(lambda key: send_push(key, message), subscription_keys))
@@ -3,6 +3,7 @@ import logging
 import random
 import requests
 from typing import Optional
+from urllib.parse import urlsplit
 from uuid import UUID
 from sqlalchemy.orm import Session
 
@@ -11,6 +12,7 @@ from src.models.database import Article, SessionLocal as BackendSession
 from src.tasks.celery_app import celery_app
 from src.tasks.users_db import get_users_session
 from src.tasks.dlq import enqueue_dlq_task
+from src.utils.tracing import KIND_CLIENT, inject_headers, start_span
 
 logger = logging.getLogger(__name__)
 
@@ -36,14 +38,21 @@ def _make_internal_request(method: str, url: str, data: dict = None) -> requests
         "Content-Type": "application/json"
     }
     
-    if method.upper() == "GET":
-        return requests.get(url, headers=headers, timeout=10)
-    elif method.upper() == "POST":
-        return requests.post(url, json=data, headers=headers, timeout=10)
-    elif method.upper() == "PUT":
-        return requests.put(url, json=data, headers=headers, timeout=10)
-    else:
+    if method.upper() not in ("GET", "POST", "PUT"):
         raise ValueError(f"Unsupported HTTP method: {method}")
+    
+    with start_span(f"HTTP {method.upper()} {urlsplit(url).path}", KIND_CLIENT) as span:
+        # Continue the task's trace in the internal endpoint
+        inject_headers(headers)
+        if method.upper() == "GET":
+            response = requests.get(url, headers=headers, timeout=10)
+        elif method.upper() == "POST":
+            response = requests.post(url, json=data, headers=headers, timeout=10)
+        else:
+            response = requests.put(url, json=data, headers=headers, timeout=10)
+        if span is not None:
+            span.set("http.status_code", response.status_code)
+        return response
 
 
 @celery_app.task(
@@ -284,10 +293,15 @@ def publish_post(self, post_id: str, author_id: str):
             logger.info("Article %s already published, skipping", post_id)
             # Still enqueue notification if not sent yet (handled by notification worker)
             from src.tasks.notifications import enqueue_article_notification
+            from src.tasks.feed import enqueue_feed_fanout
             try:
                 enqueue_article_notification(author_uuid, post_uuid)
             except Exception as notif_exc:
                 logger.warning("Failed to enqueue notification for already published article: %s", notif_exc)
+            try:
+                enqueue_feed_fanout(author_uuid, post_uuid)
+            except Exception as feed_exc:
+                logger.warning("Failed to enqueue feed fan-out for already published article: %s", feed_exc)
             return
         
         # Publish article
@@ -309,6 +323,14 @@ def publish_post(self, post_id: str, author_id: str):
         except Exception as notif_exc:
             logger.error("Failed to enqueue notification for article %s: %s", post_id, notif_exc)
             # Don't fail the whole task if notification fails
+        
+        # Enqueue feed fan-out into followers' Redis feeds
+        from src.tasks.feed import enqueue_feed_fanout
+        try:
+            enqueue_feed_fanout(author_uuid, post_uuid)
+            logger.info("Feed fan-out task enqueued for article %s", post_id)
+        except Exception as feed_exc:
+            logger.error("Failed to enqueue feed fan-out for article %s: %s", post_id, feed_exc)
     
     except Exception as exc:
         logger.error("Error in publication task for article %s: %s", post_id, exc)
@@ -0,0 +1,114 @@
+"""Per-author subscriber snapshot for the notifier, cached in Redis with version stamps.
+
+The users service bumps `notify:subscribers-version:{author_id}` whenever the author's
+subscriber list changes and writes new push keys to the `notify:subscription-keys` hash.
+A snapshot is reused only while its stamp matches the current version, so notifications for
+a prolific author's posts don't re-run the subscribers/users join every time.
+"""
+import json
+import logging
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from redis import RedisError
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.tasks.users_db import Subscriber, User
+from src.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Shared with users_service/src/utils/subscriber_cache.py
+SUBSCRIPTION_KEYS_KEY = "notify:subscription-keys"
+
+KEYS_LOOKUP_CHUNK = 1000
+
+
+def subscribers_key(author_id: UUID) -> str:
+    return f"notify:subscribers:{author_id}"
+
+
+def subscribers_version_key(author_id: UUID) -> str:
+    return f"notify:subscribers-version:{author_id}"
+
+
+def _load_subscriber_ids(session: Session, author_id: UUID) -> List[UUID]:
+    return [
+        row.subscriber_id
+        for row in session.query(Subscriber.subscriber_id).filter(Subscriber.author_id == author_id).all()
+    ]
+
+
+def get_subscriber_ids(session: Session, author_id: UUID) -> List[UUID]:
+    """Subscriber ids of an author from a version-stamped snapshot, rebuilt from DB when stale"""
+    try:
+        redis_client = get_redis()
+        version, snapshot = redis_client.mget(subscribers_version_key(author_id), subscribers_key(author_id))
+    except RedisError as exc:
+        logger.warning("Subscriber cache unavailable, reading subscribers from DB: %s", exc)
+        return _load_subscriber_ids(session, author_id)
+
+    version = version or "0"
+    if snapshot:
+        data = json.loads(snapshot)
+        if data.get("v") == version:
+            return [UUID(subscriber_id) for subscriber_id in data["ids"]]
+
+    subscriber_ids = _load_subscriber_ids(session, author_id)
+    try:
+        # Stamped with the version read before the query: a concurrent change bumps the
+        # version and this snapshot is ignored on the next read
+        redis_client.set(
+            subscribers_key(author_id),
+            json.dumps({"v": version, "ids": [str(subscriber_id) for subscriber_id in subscriber_ids]}),
+            ex=settings.notify_subscriber_cache_ttl_seconds,
+        )
+    except RedisError as exc:
+        logger.warning("Failed to store subscriber snapshot for author %s: %s", author_id, exc)
+    return subscriber_ids
+
+
+def _load_subscription_keys(session: Session, user_ids: List[UUID]) -> Dict[UUID, Optional[str]]:
+    keys = {}
+    for start in range(0, len(user_ids), KEYS_LOOKUP_CHUNK):
+        chunk = user_ids[start:start + KEYS_LOOKUP_CHUNK]
+        for row in session.query(User.id, User.subscription_key).filter(User.id.in_(chunk)).all():
+            keys[row.id] = row.subscription_key
+    return keys
+
+
+def get_subscription_keys(session: Session, user_ids: List[UUID]) -> Dict[UUID, Optional[str]]:
+    """Push subscription keys by user id (None when a user has no key)"""
+    if not user_ids:
+        return {}
+    try:
+        redis_client = get_redis()
+        cached = redis_client.hmget(SUBSCRIPTION_KEYS_KEY, [str(user_id) for user_id in user_ids])
+    except RedisError as exc:
+        logger.warning("Subscription key cache unavailable, reading keys from DB: %s", exc)
+        return _load_subscription_keys(session, user_ids)
+
+    keys: Dict[UUID, Optional[str]] = {}
+    missing = []
+    for user_id, key in zip(user_ids, cached):
+        if key is None:
+            missing.append(user_id)
+        else:
+            keys[user_id] = key or None  # "" caches "no key"
+    if not missing:
+        return keys
+
+    loaded = _load_subscription_keys(session, missing)
+    keys.update({user_id: loaded.get(user_id) for user_id in missing})
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for user_id in missing:
+            # HSETNX: never overwrite a key the users service wrote after our read
+            pipe.hsetnx(SUBSCRIPTION_KEYS_KEY, str(user_id), loaded.get(user_id) or "")
+        # Bounds staleness if the users service ever fails to update the hash
+        pipe.expire(SUBSCRIPTION_KEYS_KEY, settings.notify_subscriber_cache_ttl_seconds, nx=True)
+        pipe.execute()
+    except RedisError as exc:
+        logger.warning("Failed to cache subscription keys: %s", exc)
+    return keys
@@ -2,17 +2,28 @@
 Separate module for accessing Users DB without importing users_service config.
 This avoids Pydantic validation errors when worker imports users_service models.
 """
-from sqlalchemy import create_engine, Column, String, Text, DateTime, Boolean, Integer, UniqueConstraint, ForeignKey
+from sqlalchemy import create_engine, Column, String, Text, DateTime, Boolean, Integer, UniqueConstraint, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 import uuid
 from datetime import datetime
 
 from src.config import settings
+from src.utils.query_stats import install_query_stats
+from src.utils.slow_queries import install_slow_query_log
+from src.utils.tracing import install_tracing
 
 # Create engine for Users DB using URL from main config
-users_engine = create_engine(settings.users_database_url)
+users_engine = create_engine(
+    settings.users_database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+)
+install_query_stats(users_engine)
+install_slow_query_log(users_engine)
+install_tracing(users_engine)
 UsersSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=users_engine)
 UsersBase = declarative_base()
 
@@ -36,16 +47,14 @@ class Subscriber(UsersBase):
     __tablename__ = "subscribers"
     __table_args__ = (
         UniqueConstraint("subscriber_id", "author_id", name="uq_subscriber_author"),
+        Index("ix_subscribers_author_created", "author_id", "created_at", "id"),
+        Index("ix_subscribers_subscriber_created", "subscriber_id", "created_at", "id"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    subscriber_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
-    )
-    author_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
-    )
-    created_at = Column(DateTime, default=datetime.utcnow)
+    subscriber_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    author_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     subscriber = relationship(
         "User", back_populates="subscriptions", foreign_keys=[subscriber_id]
@@ -61,20 +70,35 @@ User.subscriptions = relationship(
 )
 
 
+class FollowCount(UsersBase):
+    __tablename__ = "follow_counts"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    followers_count = Column(Integer, default=0, nullable=False)
+    following_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class NotificationLog(UsersBase):
     __tablename__ = "notification_logs"
     __table_args__ = (
         UniqueConstraint(
             "subscriber_id",
             "article_id",
+            "article_published_at",
             name="uq_notification_subscriber_article",
         ),
+        {"postgresql_partition_by": "RANGE (article_published_at)"},
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    subscriber_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    author_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    article_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    subscriber_id = Column(UUID(as_uuid=True), nullable=False)
+    author_id = Column(UUID(as_uuid=True), nullable=False)
+    article_id = Column(UUID(as_uuid=True), nullable=False)
+    # Partition key, part of primary and unique keys
+    article_published_at = Column(DateTime, primary_key=True, nullable=False)
+    # Every article of a coalesced digest (the row is keyed by the newest one); NULL otherwise
+    coalesced_article_ids = Column(ARRAY(UUID(as_uuid=True)), nullable=True)
     status = Column(String(32), default="pending", nullable=False)
     attempts = Column(Integer, default=0, nullable=False)
     last_error = Column(Text, nullable=True)
@@ -87,3 +111,12 @@ def get_users_session():
     """Get a new Users DB session."""
     return UsersSessionLocal()
 
+
+# Dependency to get Users DB session in API routes
+def get_users_db():
+    db = UsersSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
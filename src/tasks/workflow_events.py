@@ -0,0 +1,80 @@
+"""Record every run of a publication workflow task in article_workflow_events.
+
+Connected to Celery task signals when the worker imports src.tasks: one row per article
+per task run with broker queue wait (publish or countdown/ETA -> start) and run time.
+Recording failures are logged and never affect the task.
+"""
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List
+from uuid import UUID
+
+from celery.signals import task_postrun, task_prerun
+
+from src.controllers.workflow_events import WorkflowEventCRUD
+from src.models.database import SessionLocal as BackendSession
+from src.tasks.celery_app import ready_at
+
+logger = logging.getLogger(__name__)
+
+# Task name -> workflow step
+WORKFLOW_TASKS = {
+    "src.tasks.saga.moderate_post": "moderate_post",
+    "src.tasks.saga.generate_preview": "generate_preview",
+    "src.tasks.saga.publish_post": "publish_post",
+    "src.tasks.notifications.notify_followers": "notify_followers",
+    "src.tasks.feed.fan_out_post": "fan_out_post",
+}
+
+# task_id -> (article ids, enqueued_at, started_at, perf_counter at start)
+_runs: Dict[str, tuple] = {}
+
+
+def _article_ids(kwargs: dict) -> List[UUID]:
+    ids = kwargs.get("article_ids") or [kwargs.get("post_id") or kwargs.get("article_id")]
+    result = []
+    for article_id in ids:
+        try:
+            result.append(UUID(str(article_id).strip()))
+        except (TypeError, ValueError):
+            continue
+    return result
+
+
+@task_prerun.connect
+def _start_workflow_run(task_id=None, task=None, kwargs=None, **extra):
+    if task.name not in WORKFLOW_TASKS:
+        return
+    article_ids = _article_ids(kwargs or {})
+    if not article_ids:
+        return
+    runnable_at = ready_at(task.request)
+    enqueued_at = datetime.utcfromtimestamp(runnable_at) if runnable_at else None
+    _runs[task_id] = (article_ids, enqueued_at, datetime.utcnow(), time.perf_counter())
+
+
+@task_postrun.connect
+def _finish_workflow_run(task_id=None, task=None, state=None, **extra):
+    run = _runs.pop(task_id, None)
+    if run is None:
+        return
+    article_ids, enqueued_at, started_at, started = run
+    session = BackendSession()
+    try:
+        WorkflowEventCRUD(session).add_task_run(
+            article_ids,
+            step=WORKFLOW_TASKS[task.name],
+            status=state or "UNKNOWN",
+            task_id=task_id,
+            attempt=task.request.retries or 0,
+            enqueued_at=enqueued_at,
+            started_at=started_at,
+            run_seconds=time.perf_counter() - started,
+        )
+        session.commit()
+    except Exception as exc:
+        session.rollback()
+        logger.warning("Failed to record workflow event for task %s[%s]: %s", task.name, task_id, exc)
+    finally:
+        session.close()
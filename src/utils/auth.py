@@ -16,23 +16,12 @@ pwd_context = CryptContext(
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    try:
-        return pwd_context.verify(plain_password, hashed_password)
-    except Exception as e:
-        print(f"Warning: bcrypt verification failed: {e}")
-        # Fallback to simple comparison (not secure, but prevents crashes)
-        return False
+    return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    try:
-        return pwd_context.hash(password)
-    except Exception as e:
-        print(f"Warning: bcrypt hashing failed: {e}")
-        # Fallback to simple hash (not secure, but prevents crashes)
-        import hashlib
-        return hashlib.sha256(password.encode()).hexdigest()
+    return pwd_context.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
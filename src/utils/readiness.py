@@ -0,0 +1,158 @@
+"""Readiness (/ready) from dependency checks cached and refreshed in the background.
+
+Probes only read the cached results, so they cost nothing and cannot pile up on a slow
+dependency. Each check runs in its own thread every ready_check_interval_seconds; a check
+that has not completed for ready_stale_seconds (e.g. blocked on an exhausted DB pool)
+counts as failed. The DB check runs SELECT 1 on its own connection and reports not-ready
+when the application pool has been exhausted for over ready_max_pool_saturation_ms, so the
+orchestrator sheds load from a saturated instance. /health stays a static liveness probe.
+
+users_service/src/utils/readiness.py is the same minus check_broker.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import redis
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def check_database(engine: Engine) -> Callable[[], dict]:
+    # Own single connection: the probe never takes a slot of the application pool
+    # (gunicorn.conf.py reserves it when splitting DB_MAX_CONNECTIONS)
+    probe = create_engine(engine.url, pool_size=1, max_overflow=0, pool_pre_ping=True)
+    saturated_since: List[Optional[float]] = [None]
+
+    def check() -> dict:
+        # Load shedding signal: every pooled connection has been checked out for a while,
+        # i.e. requests are queueing for one. Connect time (cold start, recycle) is not counted.
+        pool = engine.pool
+        capacity = pool.size() + settings.db_max_overflow
+        checked_out = pool.checkedout()
+        now = time.monotonic()
+        if checked_out < capacity:
+            saturated_since[0] = None
+        elif saturated_since[0] is None:
+            saturated_since[0] = now
+        saturated_ms = (now - saturated_since[0]) * 1000 if saturated_since[0] is not None else 0.0
+
+        started = time.perf_counter()
+        with probe.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        details = {
+            "query_ms": round((time.perf_counter() - started) * 1000, 2),
+            "pool": {"capacity": capacity, "checked_out": checked_out, "saturated_ms": round(saturated_ms)},
+        }
+        if saturated_ms > settings.ready_max_pool_saturation_ms:
+            details["error"] = (
+                f"connection pool exhausted for {saturated_ms:.0f} ms "
+                f"(over {settings.ready_max_pool_saturation_ms} ms)"
+            )
+        return details
+    return check
+
+
+def check_redis(url: str) -> Callable[[], dict]:
+    client = redis.Redis.from_url(
+        url,
+        socket_timeout=settings.ready_check_timeout_seconds,
+        socket_connect_timeout=settings.ready_check_timeout_seconds,
+    )
+
+    def check() -> dict:
+        client.ping()
+        return {}
+    return check
+
+
+def check_broker(celery_app) -> Callable[[], dict]:
+    def check() -> dict:
+        with celery_app.connection_for_write() as connection:
+            connection.ensure_connection(max_retries=1, timeout=settings.ready_check_timeout_seconds)
+        return {}
+    return check
+
+
+class ReadinessChecker:
+    def __init__(self):
+        self._checks: Dict[str, Callable[[], dict]] = {}
+        self._results: Dict[str, dict] = {}
+        self._running: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def register(self, name: str, check: Callable[[], dict]) -> None:
+        self._checks[name] = check
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=max(len(self._checks), 1), thread_name_prefix="ready")
+        self._thread = threading.Thread(target=self._run, name="readiness", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=settings.ready_check_interval_seconds + 1)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            for name in self._checks:
+                with self._lock:
+                    if name in self._running:
+                        continue  # previous run still blocked; staleness reports it
+                    self._running[name] = time.time()
+                self._executor.submit(self._run_check, name)
+            self._stop.wait(settings.ready_check_interval_seconds)
+
+    def _run_check(self, name: str) -> None:
+        started = time.perf_counter()
+        try:
+            result = {"ok": True, **self._checks[name]()}
+            if "error" in result:
+                result["ok"] = False
+        except Exception as exc:
+            result = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        result["checked_at"] = time.time()
+        if not result["ok"] and self._results.get(name, {}).get("ok", True):
+            logger.warning("Readiness check %s failed: %s", name, result.get("error"))
+        with self._lock:
+            self._results[name] = result
+            self._running.pop(name, None)
+
+    def status(self) -> dict:
+        """Cached results; not ready until every check has passed recently"""
+        now = time.time()
+        checks = {}
+        with self._lock:
+            for name in self._checks:
+                result = dict(self._results.get(name) or {"ok": False, "error": "not checked yet"})
+                checked_at = result.get("checked_at", 0.0)
+                if result["ok"] and now - checked_at > settings.ready_stale_seconds:
+                    result["ok"] = False
+                    result["error"] = f"no result for {now - checked_at:.0f}s"
+                if name in self._running and now - self._running[name] > settings.ready_stale_seconds:
+                    result["ok"] = False
+                    result["error"] = f"check running for {now - self._running[name]:.0f}s"
+                if "checked_at" in result:
+                    result["age_seconds"] = round(now - result.pop("checked_at"), 2)
+                checks[name] = result
+        return {"ready": all(check["ok"] for check in checks.values()), "checks": checks}
+
+
+readiness = ReadinessChecker()
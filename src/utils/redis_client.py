@@ -0,0 +1,21 @@
+"""Shared Redis client for caches and feeds (Celery keeps its own connections)"""
+from typing import Optional
+
+import redis
+
+from src.config import settings
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Get process-wide Redis client (connection pool is created lazily)"""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=1,
+            socket_connect_timeout=1,
+        )
+    return _client
@@ -0,0 +1,58 @@
+"""Single-pass serialization of ORM rows for hot list endpoints.
+
+Routes normally build SuccessResponse(data={... Schema.from_orm(x).dict() ...}) and FastAPI then
+validates it again against response_model and runs jsonable_encoder. For list endpoints we read
+the response schema fields once, copy attributes straight from ORM objects / rows into dicts and
+let orjson encode UUIDs and datetimes natively (same JSON as Pydantic produces).
+"""
+from typing import Any, Callable, Iterable, List, Optional, Type
+
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from src.models.schemas import ArticleResponse, ArticleSummaryResponse, CommentResponse
+
+_MISSING = object()
+
+
+def compile_serializer(schema: Type[BaseModel]) -> Callable[[Any], dict]:
+    """Build a function turning an ORM object/row into a dict with the schema's fields"""
+    fields = tuple(
+        (name, _MISSING if field.is_required() else field.get_default(call_default_factory=True))
+        for name, field in schema.model_fields.items()
+    )
+
+    def serialize(obj: Any) -> dict:
+        data = {}
+        for name, default in fields:
+            if default is _MISSING:
+                data[name] = getattr(obj, name)
+            else:
+                data[name] = getattr(obj, name, default)
+        return data
+
+    serialize.__name__ = f"serialize_{schema.__name__}"
+    return serialize
+
+
+serialize_article = compile_serializer(ArticleResponse)
+serialize_article_summary = compile_serializer(ArticleSummaryResponse)
+serialize_comment = compile_serializer(CommentResponse)
+
+
+def serialize_many(serializer: Callable[[Any], dict], items: Iterable[Any]) -> List[dict]:
+    """Apply a compiled serializer to every item"""
+    return [serializer(item) for item in items]
+
+
+def success_response(
+    message: str,
+    data: Optional[dict] = None,
+    status_code: int = status.HTTP_200_OK,
+) -> ORJSONResponse:
+    """SuccessResponse-shaped body encoded with orjson, bypassing response_model validation"""
+    return ORJSONResponse(
+        status_code=status_code,
+        content={"success": True, "message": message, "data": data},
+    )
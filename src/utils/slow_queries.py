@@ -0,0 +1,206 @@
+"""Slow statement log with optional EXPLAIN capture.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS (0 = off) are logged with their normalized
+SQL and bound-parameter shape (types, never values) and aggregated per shape for the
+/metrics/slow-queries report. A sampled share (SLOW_QUERY_EXPLAIN_SAMPLE_RATE) of slow plain
+SELECTs (no locking clause, no side-effect calls) is planned with EXPLAIN in a background
+thread on a separate connection; the request never waits for it and nothing is executed twice.
+"""
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from src.config import settings
+from src.utils.query_stats import normalize_sql
+
+logger = logging.getLogger(__name__)
+
+# Distinct statement shapes kept for the report; the least expensive are evicted first
+MAX_SHAPES = 500
+
+
+def param_shape(parameters, executemany: bool = False):
+    """Types of bound parameters, e.g. {"slug": "str", "ids": "list[25]"}"""
+    if executemany and parameters:
+        return {"rows": len(parameters), "row": param_shape(parameters[0])}
+
+    def describe(value) -> str:
+        if isinstance(value, (list, tuple, set)):
+            return f"{type(value).__name__}[{len(value)}]"
+        return type(value).__name__
+
+    if isinstance(parameters, dict):
+        return {name: describe(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [describe(value) for value in parameters]
+    return None
+
+
+class SlowQueryLog:
+    """Per-shape aggregates of slow statements"""
+
+    def __init__(self, max_shapes: int = MAX_SHAPES):
+        self.max_shapes = max_shapes
+        self._lock = threading.Lock()
+        self._shapes: Dict[str, dict] = {}
+
+    def record(self, shape: str, elapsed_ms: float, params) -> None:
+        with self._lock:
+            entry = self._shapes.get(shape)
+            if entry is None:
+                if len(self._shapes) >= self.max_shapes:
+                    cheapest = min(self._shapes, key=lambda key: self._shapes[key]["total_ms"])
+                    del self._shapes[cheapest]
+                entry = self._shapes[shape] = {
+                    "statement": shape,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "params": params,
+                    "last_seen": None,
+                    "plan": None,
+                    "plan_captured_at": None,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["last_seen"] = datetime.utcnow().isoformat()
+
+    def attach_plan(self, shape: str, plan: str) -> None:
+        with self._lock:
+            entry = self._shapes.get(shape)
+            if entry is not None:
+                entry["plan"] = plan
+                entry["plan_captured_at"] = datetime.utcnow().isoformat()
+
+    def report(self, limit: int, order_by: str = "total_ms") -> List[dict]:
+        """Top `limit` shapes by total_ms, max_ms or count"""
+        with self._lock:
+            entries = sorted(self._shapes.values(), key=lambda entry: entry[order_by], reverse=True)[:limit]
+            return [
+                {
+                    **entry,
+                    "total_ms": round(entry["total_ms"], 2),
+                    "max_ms": round(entry["max_ms"], 2),
+                    "mean_ms": round(entry["total_ms"] / entry["count"], 2),
+                    "seq_scan": bool(entry["plan"]) and "Seq Scan" in entry["plan"],
+                }
+                for entry in entries
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+# Never EXPLAINed: row locks, writes hidden in a SELECT, volatile functions with side effects
+_UNSAFE_SQL = re.compile(
+    r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|SHARE|KEY\s+SHARE)\b|\bINTO\b|\b(nextval|setval|pg_advisory\w*|"
+    r"pg_notify|pg_sleep\w*|set_config|lo_\w+|dblink\w*)\s*\(|\b(INSERT|UPDATE|DELETE|MERGE)\b",
+    re.IGNORECASE,
+)
+
+
+def is_explainable(statement: str) -> bool:
+    """Plain reads only: starts with SELECT, no locking clause or side-effect call"""
+    return statement.lstrip()[:6].upper() == "SELECT" and not _UNSAFE_SQL.search(statement)
+
+
+class PlanCapturer:
+    """Runs EXPLAIN off the request path: a background thread per process, own connections.
+
+    Plain EXPLAIN (no ANALYZE) only plans the statement, it never executes it. Plans are
+    taken on a NullPool engine per source engine, so they neither hold a slot of the
+    application pool nor run inside the caller's transaction. When the queue is full the
+    sample is dropped.
+    """
+
+    def __init__(self, max_queued: int = 16):
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._pid: Optional[int] = None
+        self._engines: Dict[str, Engine] = {}
+
+    def submit(self, url, shape: str, statement: str, parameters) -> None:
+        with self._lock:
+            if self._pid != os.getpid():  # first use, or forked (gunicorn preload)
+                self._pid = os.getpid()
+                self._engines = {}
+                self._queue = queue.Queue(maxsize=self.max_queued)
+                threading.Thread(target=self._run, args=(self._queue,), name="slow-query-explain", daemon=True).start()
+            work = self._queue
+        try:
+            work.put_nowait((url, shape, statement, parameters))
+        except queue.Full:
+            pass
+
+    def _engine(self, url) -> Engine:
+        key = url.render_as_string(hide_password=False)
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = self._engines[key] = create_engine(url, poolclass=NullPool)
+        return engine
+
+    def _run(self, work: queue.Queue) -> None:
+        while True:
+            url, shape, statement, parameters = work.get()
+            try:
+                connection = self._engine(url).raw_connection()
+                try:
+                    cursor = connection.cursor()
+                    cursor.execute(f"EXPLAIN {statement}", parameters)
+                    plan = "\n".join(row[0] for row in cursor.fetchall())
+                finally:
+                    connection.rollback()
+                    connection.close()
+            except Exception as exc:
+                logger.warning("EXPLAIN of slow query failed: %s", exc)
+                continue
+            logger.warning("Plan for slow query %s:\n%s", shape[:200], plan)
+            slow_query_log.attach_plan(shape, plan)
+
+
+plan_capturer = PlanCapturer()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._slow_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - context._slow_query_start) * 1000
+    if elapsed_ms < settings.slow_query_threshold_ms:
+        return
+
+    shape = normalize_sql(statement)
+    params = param_shape(parameters, executemany)
+    logger.warning("Slow query %.1f ms: %s params=%s", elapsed_ms, shape[:1000], params)
+    slow_query_log.record(shape, elapsed_ms, params)
+    if (
+        not executemany
+        and random.random() < settings.slow_query_explain_sample_rate
+        and is_explainable(statement)
+    ):
+        plan_capturer.submit(conn.engine.url, shape, statement, parameters)
+
+
+def install_slow_query_log(engine: Engine) -> None:
+    """Attach the slow statement hook to an engine (no-op unless SLOW_QUERY_THRESHOLD_MS > 0)"""
+    if settings.slow_query_threshold_ms <= 0 or event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
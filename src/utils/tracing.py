@@ -0,0 +1,309 @@
+"""Minimal distributed tracing: W3C traceparent propagation and span export.
+
+A trace starts at an incoming HTTP request (or continues the caller's `traceparent` header),
+is carried into Celery tasks through a `traceparent` message header and into internal HTTP
+calls through the same request header, so a publish request, its saga steps, notification
+tasks and their DB calls share one trace id. Spans are batched by a background thread and
+written as JSON lines to TRACING_FILE_PATH (TRACING_EXPORTER=file) or POSTed as OTLP/JSON
+to TRACING_OTLP_ENDPOINT (TRACING_EXPORTER=otlp, e.g. a local OpenTelemetry collector).
+With TRACING_EXPORTER=none (default) no spans are created and nothing is propagated.
+
+Sampling is decided once per trace at its root (TRACING_SAMPLE_RATE) and carried in the
+traceparent flags, so a trace is either recorded by every service or by none.
+
+users_service/src/utils/tracing.py is an identical copy; change both.
+"""
+import atexit
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import orjson
+import requests
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import settings
+from src.utils.query_stats import normalize_sql
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# OTLP span kinds
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT, KIND_PRODUCER, KIND_CONSUMER = 1, 2, 3, 4, 5
+
+EXPORT_QUEUE_SIZE = 10000
+EXPORT_BATCH_SIZE = 512
+EXPORT_INTERVAL_SECONDS = 1.0
+
+
+class Span:
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "sampled", "name", "kind",
+        "start_ns", "end_ns", "attributes", "error",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool, kind: int):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, object] = {}
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "service": settings.tracing_service_name,
+            "start": datetime.utcfromtimestamp(self.start_ns / 1e9).isoformat(timespec="microseconds") + "Z",
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class SpanExporter:
+    """Batches finished spans and writes them from a background thread"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._dropped = 0
+        self._session: Optional[requests.Session] = None
+
+    def submit(self, span: Span) -> None:
+        # Started lazily and per process: threads do not survive a prefork/gunicorn fork
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+            self._session = requests.Session()
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        while True:
+            self.flush(block=True)
+
+    def flush(self, block: bool = False) -> None:
+        batch: List[Span] = []
+        deadline = time.monotonic() + EXPORT_INTERVAL_SECONDS
+        while len(batch) < EXPORT_BATCH_SIZE:
+            try:
+                if block:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0.01)))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if block and time.monotonic() >= deadline:
+                break
+        if batch:
+            try:
+                self._export(batch)
+            except Exception as exc:
+                logger.warning("Failed to export %s spans: %s", len(batch), exc)
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            logger.warning("Dropped %s spans (export queue full)", dropped)
+
+    def _export(self, batch: List[Span]) -> None:
+        if settings.tracing_exporter == "file":
+            with open(settings.tracing_file_path, "ab") as f:
+                f.write(b"".join(orjson.dumps(span.to_dict()) + b"\n" for span in batch))
+        elif settings.tracing_exporter == "otlp":
+            payload = {
+                "resourceSpans": [{
+                    "resource": {"attributes": [_otlp_attribute("service.name", settings.tracing_service_name)]},
+                    "scopeSpans": [{"scope": {"name": "blog-platform"}, "spans": [span.to_otlp() for span in batch]}],
+                }]
+            }
+            response = self._session.post(
+                settings.tracing_otlp_endpoint,
+                data=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
+                timeout=5,
+            )
+            response.raise_for_status()
+
+
+exporter = SpanExporter()
+atexit.register(exporter.flush)
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def tracing_enabled() -> bool:
+    return settings.tracing_exporter != "none"
+
+
+def parse_traceparent(header: Optional[str]):
+    """(trace_id, parent span id, sampled) from a traceparent header, or None if invalid"""
+    match = TRACEPARENT_RE.match((header or "").strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2), int(match.group(3), 16) & 1 == 1
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_traceparent() -> Optional[str]:
+    """traceparent header value for outgoing calls made within the current span"""
+    span = _current_span.get()
+    return span.traceparent() if span is not None else None
+
+
+def begin_span(name: str, kind: int = KIND_INTERNAL, traceparent: Optional[str] = None):
+    """Start a span as a child of `traceparent` (if given) or of the current span.
+
+    Returns (span, token) for end_span, or (None, None) when tracing is off.
+    """
+    if not tracing_enabled():
+        return None, None
+    remote = parse_traceparent(traceparent) if traceparent else None
+    parent = _current_span.get()
+    if remote is not None:
+        trace_id, parent_id, sampled = remote
+    elif parent is not None:
+        trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+    else:
+        trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+        sampled = random.random() < settings.tracing_sample_rate
+    span = Span(name, trace_id, parent_id, sampled, kind)
+    return span, _current_span.set(span)
+
+
+def end_span(span: Optional[Span], token, error: Optional[BaseException] = None) -> None:
+    if span is None:
+        return
+    _current_span.reset(token)
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"
+    if span.sampled:
+        exporter.submit(span)
+
+
+@contextmanager
+def start_span(name: str, kind: int = KIND_INTERNAL, traceparent: Optional[str] = None) -> Iterator[Optional[Span]]:
+    span, token = begin_span(name, kind, traceparent)
+    try:
+        yield span
+    except BaseException as exc:
+        end_span(span, token, exc)
+        raise
+    else:
+        end_span(span, token)
+
+
+def inject_headers(headers: dict) -> dict:
+    """Add traceparent of the current span to outgoing request/message headers"""
+    traceparent = current_traceparent()
+    if traceparent:
+        headers[TRACEPARENT_HEADER] = traceparent
+    return headers
+
+
+# DB spans (one per statement, child of the current request/task span)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = _current_span.get()
+    if parent is None or not parent.sampled:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    span, token = begin_span(f"db {operation}", KIND_CLIENT)
+    span.set("db.system", conn.engine.dialect.name)
+    span.set("db.name", conn.engine.url.database or "")
+    span.set("db.statement", normalize_sql(statement)[:1000])
+    context._trace_span = (span, token)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span, token = getattr(context, "_trace_span", (None, None))
+    if span is not None:
+        span.set("db.rows", cursor.rowcount)
+        end_span(span, token)
+        context._trace_span = (None, None)
+
+
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    span, token = getattr(context, "_trace_span", (None, None)) if context is not None else (None, None)
+    if span is not None:
+        end_span(span, token, exception_context.original_exception)
+        context._trace_span = (None, None)
+
+
+def install_tracing(engine: Engine) -> None:
+    """Attach DB span listeners to an engine (no-op unless tracing is enabled)"""
+    if not tracing_enabled() or not settings.tracing_db_spans:
+        return
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
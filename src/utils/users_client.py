@@ -0,0 +1,111 @@
+"""Client for users service profile lookups used to embed author info in listings.
+
+Profiles are fetched with POST /api/users/batch, cached per ID for author_cache_ttl_seconds
+(unknown IDs too) and concurrent lookups of the same ID share one in-flight request.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from src.config import settings
+from src.utils.tracing import KIND_CLIENT, inject_headers, start_span
+
+logger = logging.getLogger(__name__)
+
+CACHE_MAX_ENTRIES = 10000
+
+
+class UsersClient:
+    def __init__(self, base_url: str, ttl: float, timeout: float, max_batch: int):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_batch = max_batch
+        self._session = requests.Session()
+        if settings.internal_api_key:
+            # Identifies the backend so its calls are not rate limited as one client IP
+            self._session.headers["Authorization"] = f"Token {settings.internal_api_key}"
+        self._lock = threading.Lock()
+        # user id -> (expires_at, profile or None)
+        self._cache: "OrderedDict[str, Tuple[float, Optional[dict]]]" = OrderedDict()
+        # user id -> future resolved by the thread that fetches it
+        self._inflight: Dict[str, Future] = {}
+
+    def _fetch(self, user_ids: List[str]) -> Dict[str, dict]:
+        profiles = {}
+        for start in range(0, len(user_ids), self.max_batch):
+            with start_span("HTTP POST /api/users/batch", KIND_CLIENT) as span:
+                response = self._session.post(
+                    f"{self.base_url}/api/users/batch",
+                    json={"ids": user_ids[start:start + self.max_batch]},
+                    headers=inject_headers({}),
+                    timeout=self.timeout,
+                )
+                if span is not None:
+                    span.set("http.status_code", response.status_code)
+            response.raise_for_status()
+            for profile in response.json()["data"]["users"]:
+                profiles[profile["id"]] = profile
+        return profiles
+
+    def _store(self, user_id: str, profile: Optional[dict], now: float) -> None:
+        # Called under self._lock
+        self._cache[user_id] = (now + self.ttl, profile)
+        self._cache.move_to_end(user_id)
+        if len(self._cache) > CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    def get_profiles(self, user_ids: Iterable) -> Dict[str, Optional[dict]]:
+        """Get profiles keyed by user id string; None for unknown users or when lookup fails"""
+        now = time.monotonic()
+        result: Dict[str, Optional[dict]] = {}
+        to_fetch: List[str] = []
+        waiting: Dict[str, Future] = {}
+
+        with self._lock:
+            for user_id in {str(user_id) for user_id in user_ids}:
+                cached = self._cache.get(user_id)
+                if cached and cached[0] > now:
+                    result[user_id] = cached[1]
+                elif user_id in self._inflight:
+                    waiting[user_id] = self._inflight[user_id]
+                else:
+                    self._inflight[user_id] = Future()
+                    to_fetch.append(user_id)
+
+        if to_fetch:
+            profiles = None
+            try:
+                profiles = self._fetch(to_fetch)
+            except Exception as exc:  # any failure (incl. malformed responses) degrades to None
+                logger.warning("Users service profile lookup failed: %s", exc)
+            finally:
+                # Waiters of these ids must always be released, or later lookups would block on them
+                with self._lock:
+                    for user_id in to_fetch:
+                        profile = profiles.get(user_id) if profiles is not None else None
+                        if profiles is not None:
+                            self._store(user_id, profile, now)
+                        self._inflight.pop(user_id).set_result(profile)
+                        result[user_id] = profile
+
+        for user_id, future in waiting.items():
+            try:
+                result[user_id] = future.result(timeout=self.timeout)
+            except Exception:
+                result[user_id] = None
+
+        return result
+
+
+users_client = UsersClient(
+    base_url=settings.users_service_url,
+    ttl=settings.author_cache_ttl_seconds,
+    timeout=settings.users_client_timeout_seconds,
+    max_batch=settings.users_batch_max_ids,
+)
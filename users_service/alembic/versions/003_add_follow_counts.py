@@ -0,0 +1,63 @@
+"""Add follow counters and keyset pagination indexes on subscribers
+
+Revision ID: 003_add_follow_counts
+Revises: 002_add_subscriptions
+Create Date: 2026-10-19 12:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "003_add_follow_counts"
+down_revision = "002_add_subscriptions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "follow_counts",
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("followers_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("following_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.DateTime(), nullable=True, server_default=sa.text("NOW()")),
+    )
+    op.execute(
+        """
+        INSERT INTO follow_counts (user_id, followers_count, following_count)
+        SELECT user_id, SUM(followers), SUM(following)
+        FROM (
+            SELECT author_id AS user_id, COUNT(*) AS followers, 0 AS following
+            FROM subscribers GROUP BY author_id
+            UNION ALL
+            SELECT subscriber_id AS user_id, 0 AS followers, COUNT(*) AS following
+            FROM subscribers GROUP BY subscriber_id
+        ) AS counts
+        GROUP BY user_id
+        """
+    )
+
+    # (author_id, created_at, id) and (subscriber_id, created_at, id) serve keyset pages
+    # and make the single-column indexes redundant
+    op.create_index(
+        "ix_subscribers_author_created", "subscribers", ["author_id", "created_at", "id"]
+    )
+    op.create_index(
+        "ix_subscribers_subscriber_created", "subscribers", ["subscriber_id", "created_at", "id"]
+    )
+    op.drop_index("ix_subscribers_author_id", table_name="subscribers")
+    op.drop_index("ix_subscribers_subscriber_id", table_name="subscribers")
+
+
+def downgrade():
+    op.create_index("ix_subscribers_subscriber_id", "subscribers", ["subscriber_id"])
+    op.create_index("ix_subscribers_author_id", "subscribers", ["author_id"])
+    op.drop_index("ix_subscribers_subscriber_created", table_name="subscribers")
+    op.drop_index("ix_subscribers_author_created", table_name="subscribers")
+    op.drop_table("follow_counts")
@@ -0,0 +1,132 @@
+"""Partition notification_logs by article publication month
+
+Revision ID: 004_partition_notification_logs
+Revises: 003_add_follow_counts
+Create Date: 2026-10-19 12:30:00.000000
+
+The table is recreated as PARTITION BY RANGE (article_created_at) with monthly partitions
+(notification_logs_pYYYYMM) plus a DEFAULT partition. Old months are dropped by the worker's
+maintain_notification_log_partitions task. A unique key on a partitioned table must contain
+the partition key, so the unique constraint becomes (subscriber_id, article_id,
+article_created_at); article_created_at is fixed per article, so it still allows one row per
+subscriber and article. Existing rows use their created_at as article_created_at.
+The single-column indexes are dropped: subscriber_id lookups are covered by the unique
+index, author_id and article_id are never queried alone.
+"""
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "004_partition_notification_logs"
+down_revision = "003_add_follow_counts"
+branch_labels = None
+depends_on = None
+
+PARTITIONS_AHEAD = 3
+
+
+def _month_start(value: date, offset: int = 0) -> date:
+    month_index = value.year * 12 + value.month - 1 + offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def upgrade():
+    op.execute("ALTER TABLE notification_logs RENAME TO notification_logs_legacy")
+    op.execute(
+        "ALTER TABLE notification_logs_legacy "
+        "DROP CONSTRAINT IF EXISTS uq_notification_subscriber_article"
+    )
+    op.execute("ALTER INDEX IF EXISTS notification_logs_pkey RENAME TO notification_logs_legacy_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_notification_logs_subscriber_id")
+    op.execute("DROP INDEX IF EXISTS ix_notification_logs_author_id")
+    op.execute("DROP INDEX IF EXISTS ix_notification_logs_article_id")
+
+    op.execute(
+        """
+        CREATE TABLE notification_logs (
+            id UUID NOT NULL,
+            subscriber_id UUID NOT NULL,
+            author_id UUID NOT NULL,
+            article_id UUID NOT NULL,
+            article_created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            status VARCHAR(32) NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW(),
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW(),
+            CONSTRAINT pk_notification_logs PRIMARY KEY (id, article_created_at),
+            CONSTRAINT uq_notification_subscriber_article
+                UNIQUE (subscriber_id, article_id, article_created_at)
+        ) PARTITION BY RANGE (article_created_at)
+        """
+    )
+
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text("SELECT MIN(created_at) FROM notification_logs_legacy")).scalar()
+    today = datetime.utcnow().date()
+    month = _month_start(oldest.date() if oldest else today)
+    last = _month_start(today, PARTITIONS_AHEAD)
+    while month <= last:
+        upper = _month_start(month, 1)
+        op.execute(
+            f"CREATE TABLE notification_logs_p{month:%Y%m} PARTITION OF notification_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute("CREATE TABLE notification_logs_default PARTITION OF notification_logs DEFAULT")
+
+    op.execute(
+        """
+        INSERT INTO notification_logs (
+            id, subscriber_id, author_id, article_id, article_created_at,
+            status, attempts, last_error, created_at, updated_at
+        )
+        SELECT id, subscriber_id, author_id, article_id, created_at,
+               status, attempts, last_error, created_at, updated_at
+        FROM notification_logs_legacy
+        """
+    )
+    op.execute("DROP TABLE notification_logs_legacy")
+
+
+def downgrade():
+    op.execute("ALTER TABLE notification_logs RENAME TO notification_logs_partitioned")
+    op.execute(
+        """
+        CREATE TABLE notification_logs (
+            id UUID PRIMARY KEY,
+            subscriber_id UUID NOT NULL,
+            author_id UUID NOT NULL,
+            article_id UUID NOT NULL,
+            status VARCHAR(32) NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW(),
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW()
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO notification_logs (
+            id, subscriber_id, author_id, article_id,
+            status, attempts, last_error, created_at, updated_at
+        )
+        SELECT DISTINCT ON (subscriber_id, article_id)
+               id, subscriber_id, author_id, article_id,
+               status, attempts, last_error, created_at, updated_at
+        FROM notification_logs_partitioned
+        ORDER BY subscriber_id, article_id, updated_at DESC
+        """
+    )
+    op.execute("DROP TABLE notification_logs_partitioned CASCADE")
+    op.create_index("ix_notification_logs_subscriber_id", "notification_logs", ["subscriber_id"])
+    op.create_index("ix_notification_logs_author_id", "notification_logs", ["author_id"])
+    op.create_index("ix_notification_logs_article_id", "notification_logs", ["article_id"])
+    op.create_unique_constraint(
+        "uq_notification_subscriber_article",
+        "notification_logs",
+        ["subscriber_id", "article_id"],
+    )
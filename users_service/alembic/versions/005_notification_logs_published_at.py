@@ -0,0 +1,30 @@
+"""Key notification_logs on article publication time
+
+Revision ID: 005_notification_logs_published_at
+Revises: 004_partition_notification_logs
+Create Date: 2026-10-20 10:00:00.000000
+
+article_created_at was the draft's creation time: a draft published after its month's
+partition was dropped landed in the DEFAULT partition and escaped retention. The partition
+key column is renamed to article_published_at and new rows use articles.published_at (main
+DB, set once on first publication). Existing rows keep their values (the log's creation
+time for rows copied by 004, the draft's creation time after it), which the users DB cannot
+map to articles.published_at; notify_followers looks such rows up in the older partitions
+when the publication-keyed lookup finds nothing. Expired rows left in the DEFAULT partition
+are deleted by maintain_notification_log_partitions.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "005_notification_logs_published_at"
+down_revision = "004_partition_notification_logs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TABLE notification_logs RENAME COLUMN article_created_at TO article_published_at")
+
+
+def downgrade():
+    op.execute("ALTER TABLE notification_logs RENAME COLUMN article_published_at TO article_created_at")
@@ -0,0 +1,30 @@
+"""Record the articles covered by a digest notification
+
+Revision ID: 006_notification_logs_digest
+Revises: 005_notification_logs_published_at
+Create Date: 2026-10-21 10:00:00.000000
+
+A coalesced digest is logged as a single row per subscriber, keyed by the newest article.
+coalesced_article_ids lists every article the push covered (NULL for a single-article
+push), so re-enqueueing any of them is recognised as already sent.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "006_notification_logs_digest"
+down_revision = "005_notification_logs_published_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "notification_logs",
+        sa.Column("coalesced_article_ids", postgresql.ARRAY(postgresql.UUID(as_uuid=True)), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column("notification_logs", "coalesced_article_ids")
@@ -1,24 +1,83 @@
+from sqlalchemy import delete, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional, Tuple
+from datetime import datetime
+import base64
 import uuid
 
-from src.models.database import Subscriber, User
+from src.models.database import FollowCount, Subscriber, User
 from src.models.schemas import UserCreate, UserUpdate
+from src.utils.subscriber_cache import bump_subscribers_version, set_subscription_key
+
+
+EMAIL_TAKEN = "Email already registered"
+USERNAME_TAKEN = "Username already taken"
+
+
+def _integrity_error_message(exc: IntegrityError) -> str:
+    """Map unique constraint violation on users to a user-facing message"""
+    diag = getattr(exc.orig, "diag", None)
+    constraint = (getattr(diag, "constraint_name", None) or str(exc.orig)).lower()
+    if "email" in constraint:
+        return EMAIL_TAKEN
+    if "username" in constraint:
+        return USERNAME_TAKEN
+    return "User with this email or username already exists"
+
+
+def encode_cursor(created_at: datetime, subscription_id: uuid.UUID) -> str:
+    """Opaque keyset cursor: position after (created_at, id) of the last returned row"""
+    raw = f"{created_at.isoformat()}|{subscription_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, subscription_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(subscription_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
 
 
 class UserCRUD:
     def __init__(self, db: Session):
         self.db = db
 
+    def _find_conflict(
+        self,
+        email: Optional[str] = None,
+        username: Optional[str] = None,
+        exclude_id: Optional[uuid.UUID] = None,
+    ) -> Optional[str]:
+        """Check email and username uniqueness in one query; returns error message or None"""
+        conditions = []
+        if email:
+            conditions.append(User.email == email)
+        if username:
+            conditions.append(User.username == username)
+        if not conditions:
+            return None
+        
+        query = self.db.query(User.email, User.username).filter(or_(*conditions))
+        if exclude_id is not None:
+            query = query.filter(User.id != exclude_id)
+        rows = query.limit(2).all()
+        
+        if email and any(row.email == email for row in rows):
+            return EMAIL_TAKEN
+        if username and any(row.username == username for row in rows):
+            return USERNAME_TAKEN
+        return None
+
     def create_user(self, user_data: UserCreate) -> User:
         """Create a new user"""
-        # Check if user already exists
-        if self.db.query(User).filter(User.email == user_data.email).first():
-            raise ValueError("Email already registered")
-        
-        if self.db.query(User).filter(User.username == user_data.username).first():
-            raise ValueError("Username already taken")
+        # Check if user already exists (before spending time on password hashing)
+        conflict = self._find_conflict(email=user_data.email, username=user_data.username)
+        if conflict:
+            raise ValueError(conflict)
         
         db_user = User(
             email=user_data.email,
@@ -33,9 +92,10 @@ class UserCRUD:
             self.db.commit()
             self.db.refresh(db_user)
             return db_user
-        except IntegrityError:
+        except IntegrityError as exc:
+            # Concurrent registration won the race on a unique constraint
             self.db.rollback()
-            raise ValueError("User with this email or username already exists")
+            raise ValueError(_integrity_error_message(exc))
 
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
@@ -49,21 +109,30 @@ class UserCRUD:
         """Get user by ID"""
         return self.db.query(User).filter(User.id == user_id).first()
 
+    def get_profiles_by_ids(self, user_ids: List[uuid.UUID]) -> list:
+        """Get public profile columns for many users in one query"""
+        if not user_ids:
+            return []
+        return (
+            self.db.query(User.id, User.username, User.bio, User.image_url)
+            .filter(User.id.in_(set(user_ids)))
+            .all()
+        )
+
     def update_user(self, user_id: uuid.UUID, user_data: UserUpdate) -> Optional[User]:
         """Update user by ID"""
         db_user = self.get_user_by_id(user_id)
         if not db_user:
             return None
         
-        # Check for email conflicts
-        if user_data.email and user_data.email != db_user.email:
-            if self.db.query(User).filter(User.email == user_data.email).first():
-                raise ValueError("Email already registered")
-        
-        # Check for username conflicts
-        if user_data.username and user_data.username != db_user.username:
-            if self.db.query(User).filter(User.username == user_data.username).first():
-                raise ValueError("Username already taken")
+        # Check email and username conflicts for changed values only
+        conflict = self._find_conflict(
+            email=user_data.email if user_data.email != db_user.email else None,
+            username=user_data.username if user_data.username != db_user.username else None,
+            exclude_id=db_user.id,
+        )
+        if conflict:
+            raise ValueError(conflict)
         
         # Update fields
         if user_data.email is not None:
@@ -81,9 +150,9 @@ class UserCRUD:
             self.db.commit()
             self.db.refresh(db_user)
             return db_user
-        except IntegrityError:
+        except IntegrityError as exc:
             self.db.rollback()
-            raise ValueError("User with this email or username already exists")
+            raise ValueError(_integrity_error_message(exc))
 
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Authenticate user with email and password"""
@@ -92,6 +161,13 @@ class UserCRUD:
             return None
         if not user.verify_password(password):
             return None
+        if self.db.is_modified(user):
+            # Hash was upgraded to the current policy; keep the login even if saving fails
+            try:
+                self.db.commit()
+                self.db.refresh(user)
+            except Exception:
+                self.db.rollback()
         return user
 
 
@@ -108,33 +184,183 @@ class SubscriptionCRUD:
         user.subscription_key = subscription_key
         self.db.commit()
         self.db.refresh(user)
+        set_subscription_key(user.id, subscription_key)
         return user
 
+    def _adjust_follow_counts(self, author_ids: List[uuid.UUID], subscriber_id: uuid.UUID, delta: int) -> None:
+        """Add delta to each author's followers and subscriber's following counters (caller commits)"""
+        rows = sorted(
+            [
+                {"user_id": author_id, "followers_count": delta, "following_count": 0}
+                for author_id in author_ids
+            ]
+            + [{"user_id": subscriber_id, "followers_count": 0, "following_count": delta * len(author_ids)}],
+            # Fixed lock order so concurrent subscribe/unsubscribe calls don't deadlock
+            key=lambda row: str(row["user_id"]),
+        )
+        stmt = pg_insert(FollowCount).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FollowCount.user_id],
+            set_={
+                "followers_count": FollowCount.followers_count + stmt.excluded.followers_count,
+                "following_count": FollowCount.following_count + stmt.excluded.following_count,
+                "updated_at": datetime.utcnow(),
+            },
+        )
+        self.db.execute(stmt)
+
     def subscribe(self, subscriber_id: uuid.UUID, author_id: uuid.UUID) -> None:
         if subscriber_id == author_id:
             raise ValueError("You cannot subscribe to yourself")
         
-        author = self.db.query(User).filter(User.id == author_id).first()
+        author = self.db.query(User.id).filter(User.id == author_id).first()
         if not author:
             raise ValueError("Target user not found")
         
-        existing = (
-            self.db.query(Subscriber)
-            .filter(
-                Subscriber.subscriber_id == subscriber_id,
-                Subscriber.author_id == author_id,
-            )
+        inserted = self.db.execute(
+            pg_insert(Subscriber)
+            .values(id=uuid.uuid4(), subscriber_id=subscriber_id, author_id=author_id, created_at=datetime.utcnow())
+            .on_conflict_do_nothing(constraint="uq_subscriber_author")
+            .returning(Subscriber.id)
+        ).first()
+        if inserted is None:
+            # Already subscribed
+            self.db.rollback()
+            return
+        self._adjust_follow_counts([author_id], subscriber_id, 1)
+        self.db.commit()
+        bump_subscribers_version([author_id])
+
+    def unsubscribe(self, subscriber_id: uuid.UUID, author_id: uuid.UUID) -> None:
+        """Remove subscription if it exists (idempotent)"""
+        deleted = self.db.execute(
+            delete(Subscriber)
+            .where(Subscriber.subscriber_id == subscriber_id, Subscriber.author_id == author_id)
+            .returning(Subscriber.id)
+        ).first()
+        if deleted is None:
+            self.db.rollback()
+            return
+        self._adjust_follow_counts([author_id], subscriber_id, -1)
+        self.db.commit()
+        bump_subscribers_version([author_id])
+
+    def subscribe_many(self, subscriber_id: uuid.UUID, author_ids: List[uuid.UUID]) -> dict:
+        """Subscribe to several authors: one IN lookup and one INSERT ... ON CONFLICT DO NOTHING"""
+        requested = list(dict.fromkeys(author_ids))
+        candidates = [author_id for author_id in requested if author_id != subscriber_id]
+        existing_users = {
+            row.id for row in self.db.query(User.id).filter(User.id.in_(candidates)).all()
+        } if candidates else set()
+        targets = [author_id for author_id in candidates if author_id in existing_users]
+
+        subscribed = set()
+        if targets:
+            now = datetime.utcnow()
+            rows = self.db.execute(
+                pg_insert(Subscriber)
+                .values(
+                    [
+                        {"id": uuid.uuid4(), "subscriber_id": subscriber_id, "author_id": author_id, "created_at": now}
+                        for author_id in targets
+                    ]
+                )
+                .on_conflict_do_nothing(constraint="uq_subscriber_author")
+                .returning(Subscriber.author_id)
+            ).all()
+            subscribed = {row.author_id for row in rows}
+            if subscribed:
+                self._adjust_follow_counts(list(subscribed), subscriber_id, 1)
+        self.db.commit()
+        bump_subscribers_version(subscribed)
+
+        return {
+            "subscribed": [author_id for author_id in targets if author_id in subscribed],
+            "already_subscribed": [author_id for author_id in targets if author_id not in subscribed],
+            "not_found": [author_id for author_id in candidates if author_id not in existing_users],
+            "skipped_self": subscriber_id in requested,
+        }
+
+    def unsubscribe_many(self, subscriber_id: uuid.UUID, author_ids: List[uuid.UUID]) -> dict:
+        """Unsubscribe from several authors with a single DELETE"""
+        requested = list(dict.fromkeys(author_ids))
+        rows = self.db.execute(
+            delete(Subscriber)
+            .where(Subscriber.subscriber_id == subscriber_id, Subscriber.author_id.in_(requested))
+            .returning(Subscriber.author_id)
+        ).all()
+        unsubscribed = {row.author_id for row in rows}
+        if unsubscribed:
+            self._adjust_follow_counts(list(unsubscribed), subscriber_id, -1)
+        self.db.commit()
+        bump_subscribers_version(unsubscribed)
+
+        return {
+            "unsubscribed": [author_id for author_id in requested if author_id in unsubscribed],
+            "not_subscribed": [author_id for author_id in requested if author_id not in unsubscribed],
+        }
+
+    def get_follow_counts(self, user_id: uuid.UUID) -> dict:
+        """Followers / following counts from the counter table (no COUNT over subscribers)"""
+        counts = (
+            self.db.query(FollowCount.followers_count, FollowCount.following_count)
+            .filter(FollowCount.user_id == user_id)
             .first()
         )
-        if existing:
-            return
-        
-        subscription = Subscriber(
-            subscriber_id=subscriber_id,
-            author_id=author_id,
+        return {
+            "followers": counts.followers_count if counts else 0,
+            "following": counts.following_count if counts else 0,
+        }
+
+    def _list_connections(
+        self,
+        user_id: uuid.UUID,
+        followers: bool,
+        limit: int,
+        cursor: Optional[str],
+    ) -> Tuple[list, Optional[str]]:
+        # followers: rows where user is the author, listing subscribers; following: the reverse
+        own_column, other_column = (
+            (Subscriber.author_id, Subscriber.subscriber_id)
+            if followers
+            else (Subscriber.subscriber_id, Subscriber.author_id)
         )
-        try:
-            self.db.add(subscription)
-            self.db.commit()
-        except IntegrityError:
-            self.db.rollback()
+        query = (
+            self.db.query(
+                User.id,
+                User.username,
+                User.bio,
+                User.image_url,
+                Subscriber.created_at.label("followed_at"),
+                Subscriber.id.label("subscription_id"),
+            )
+            .join(User, User.id == other_column)
+            .filter(own_column == user_id)
+        )
+        if cursor:
+            created_at, subscription_id = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(Subscriber.created_at, Subscriber.id) < tuple_(created_at, subscription_id)
+            )
+        rows = (
+            query.order_by(Subscriber.created_at.desc(), Subscriber.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].followed_at, rows[-1].subscription_id)
+        return rows, next_cursor
+
+    def get_followers(
+        self, user_id: uuid.UUID, limit: int = 20, cursor: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """Users following user_id, newest first; returns (rows, next_cursor)"""
+        return self._list_connections(user_id, followers=True, limit=limit, cursor=cursor)
+
+    def get_following(
+        self, user_id: uuid.UUID, limit: int = 20, cursor: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """Users followed by user_id, newest first; returns (rows, next_cursor)"""
+        return self._list_connections(user_id, followers=False, limit=limit, cursor=cursor)
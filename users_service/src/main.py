@@ -5,7 +5,15 @@ from fastapi.responses import JSONResponse
 import time
 import logging
 from src.config import settings
+from src.middleware.query_stats import query_stats_middleware
+from src.middleware.rate_limit import rate_limit_requests
+from src.middleware.tracing import tracing_middleware
+from src.models.database import engine
 from src.routes import users, user
+from src.utils.access_log import access_log
+from src.utils.password_hasher import password_hasher
+from src.utils.query_stats import route_metrics
+from src.utils.readiness import check_database, check_redis, readiness
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -36,21 +44,27 @@ app.add_middleware(
 )
 
 
-# Request logging middleware
+# Rate limiting middleware (per client IP, registered first so request logging wraps it)
+app.middleware("http")(rate_limit_requests)
+
+# Per-request SQL query counting (QUERY_STATS_ENABLED), inside request logging
+app.middleware("http")(query_stats_middleware)
+
+# Server span per request (TRACING_EXPORTER); DB spans and outgoing calls are its children
+app.middleware("http")(tracing_middleware)
+
+
+# Request logging middleware (one sampled JSON access line per request)
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Log request
-    logger.info(f"{request.method} {request.url.path} - Client: {request.client.host}")
-    
-    response = await call_next(request)
-    
-    # Log response
-    process_time = time.time() - start_time
-    logger.info(f"Response: {response.status_code} - Time: {process_time:.4f}s")
-    
-    return response
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        access_log.log(request, status_code, (time.perf_counter() - start_time) * 1000)
 
 
 # Include routers
@@ -58,6 +72,11 @@ app.include_router(users.router)
 app.include_router(user.router)
 
 
+# Dependencies checked for /ready
+readiness.register("db", check_database(engine))
+readiness.register("redis", check_redis(settings.redis_url))
+
+
 # Root endpoint
 @app.get("/", response_model=dict)
 def root():
@@ -81,7 +100,7 @@ def root():
     }
 
 
-# Health check endpoint
+# Health check endpoint (liveness: must not touch the DB or Redis)
 @app.get("/health", response_model=dict)
 def health_check():
     """Health check endpoint"""
@@ -92,6 +111,54 @@ def health_check():
     }
 
 
+# Readiness endpoint (cached dependency checks; 503 takes the instance out of rotation)
+@app.get("/ready", response_model=dict)
+def readiness_check():
+    """Readiness endpoint"""
+    status = readiness.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+# Metrics endpoint (in-process counters, not exposed through the gateway)
+@app.get("/metrics", response_model=dict)
+def metrics():
+    """Service metrics"""
+    return {
+        "password_hashing": password_hasher.stats(),
+        "db_queries": route_metrics.snapshot(),
+    }
+
+
+@app.on_event("startup")
+def start_readiness_checks():
+    readiness.start()
+
+
+@app.on_event("startup")
+def start_password_hasher():
+    password_hasher.start()
+
+
+@app.on_event("startup")
+def start_access_log():
+    access_log.start()
+
+
+@app.on_event("shutdown")
+def stop_password_hasher():
+    password_hasher.shutdown()
+
+
+@app.on_event("shutdown")
+def stop_access_log():
+    access_log.stop()
+
+
+@app.on_event("shutdown")
+def stop_readiness_checks():
+    readiness.stop()
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -106,12 +173,13 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+# Development server; production runs gunicorn with uvicorn workers (gunicorn.conf.py)
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
         "src.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
+        host=settings.host,
+        port=settings.port,
+        reload=settings.debug
     )
 
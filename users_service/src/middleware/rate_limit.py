@@ -0,0 +1,227 @@
+"""Rate limiting: sliding window in Redis, local token bucket when Redis is unavailable.
+
+`rate_limit_requests` middleware limits every client IP to settings.rate_limit_requests per
+settings.rate_limit_window. `enforce_login_rate_limit` adds stricter per-IP and per-email
+limits on login and runs before any DB lookup or password verification; the per-email limit
+counts failed logins only.
+
+Limiter and client IP handling mirror src/middleware/rate_limit.py in the backend;
+keep them in step.
+"""
+import ipaddress
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import anyio
+import redis.asyncio as aioredis
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from redis.exceptions import RedisError
+
+from src.config import settings
+from src.models.schemas import UserLogin
+
+logger = logging.getLogger(__name__)
+
+# Paths used by probes, metrics scrapers and service-to-service calls
+EXEMPT_PATH_PREFIXES = ("/health", "/ready", "/metrics", "/internal")
+
+# After a Redis error use local buckets for this long before trying Redis again
+REDIS_RETRY_SECONDS = 5.0
+LOCAL_BUCKETS_MAX = 10000
+
+
+class TokenBucket:
+    def __init__(self, capacity: int, refill_per_second: float, now: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def take(self, now: float) -> Tuple[bool, int]:
+        allowed, retry_after = self.peek(now)
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+        if allowed:
+            self.tokens -= 1
+        return allowed, retry_after
+
+    def peek(self, now: float) -> Tuple[bool, int]:
+        tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        if tokens >= 1:
+            return True, 0
+        return False, max(1, int((1 - tokens) / self.refill_per_second) + 1)
+
+
+class RateLimiter:
+    def __init__(self, redis_url: Optional[str], prefix: str):
+        self.prefix = prefix
+        self._redis = (
+            aioredis.Redis.from_url(redis_url, socket_timeout=0.2, socket_connect_timeout=0.2)
+            if redis_url
+            else None
+        )
+        self._redis_down_until = 0.0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, limit: int, window: int) -> Tuple[bool, int]:
+        """Count a request for key; returns (allowed, retry_after_seconds)"""
+        now = time.time()
+        if self._redis is not None and now >= self._redis_down_until:
+            try:
+                return await self._hit_redis(key, limit, window, now)
+            except (RedisError, OSError) as exc:
+                logger.warning("Rate limiter falls back to local buckets: %s", exc)
+                self._redis_down_until = now + REDIS_RETRY_SECONDS
+        return self._hit_local(key, limit, window, now)
+
+    async def peek(self, key: str, limit: int, window: int) -> Tuple[bool, int]:
+        """Whether a request for key would be allowed, without counting it"""
+        now = time.time()
+        if self._redis is not None and now >= self._redis_down_until:
+            try:
+                redis_key = f"{self.prefix}:{key}"
+                pipe = self._redis.pipeline(transaction=True)
+                pipe.zremrangebyscore(redis_key, 0, now - window)
+                pipe.zcard(redis_key)
+                pipe.zrange(redis_key, 0, 0, withscores=True)
+                _, count, oldest = await pipe.execute()
+                if count < limit:
+                    return True, 0
+                oldest_score = oldest[0][1] if oldest else now
+                return False, max(1, int(oldest_score + window - now) + 1)
+            except (RedisError, OSError) as exc:
+                logger.warning("Rate limiter falls back to local buckets: %s", exc)
+                self._redis_down_until = now + REDIS_RETRY_SECONDS
+        with self._lock:
+            bucket = self._buckets.get(key)
+            return bucket.peek(now) if bucket is not None else (True, 0)
+
+    async def _hit_redis(self, key: str, limit: int, window: int, now: float) -> Tuple[bool, int]:
+        redis_key = f"{self.prefix}:{key}"
+        member = f"{now}:{uuid.uuid4().hex}"
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zremrangebyscore(redis_key, 0, now - window)
+        pipe.zadd(redis_key, {member: now})
+        pipe.zcard(redis_key)
+        pipe.zrange(redis_key, 0, 0, withscores=True)
+        pipe.expire(redis_key, window)
+        _, _, count, oldest, _ = await pipe.execute()
+        if count <= limit:
+            return True, 0
+        # Rejected requests don't occupy the window
+        await self._redis.zrem(redis_key, member)
+        oldest_score = oldest[0][1] if oldest else now
+        return False, max(1, int(oldest_score + window - now) + 1)
+
+    def _hit_local(self, key: str, limit: int, window: int, now: float) -> Tuple[bool, int]:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(limit, limit / window, now)
+                self._buckets[key] = bucket
+                if len(self._buckets) > LOCAL_BUCKETS_MAX:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.take(now)
+
+
+limiter = RateLimiter(settings.redis_url, prefix="ratelimit")
+
+
+TRUSTED_PROXIES = [ipaddress.ip_network(cidr) for cidr in settings.rate_limit_trusted_proxies]
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+
+def get_client_ip(request: Request) -> str:
+    """Client IP; X-Real-IP / X-Forwarded-For are honoured only from rate_limit_trusted_proxies"""
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(peer):
+        return peer
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip:
+        return real_ip.strip()
+    # Rightmost hop not added by a trusted proxy; entries further left are client-supplied
+    forwarded_for = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(forwarded_for):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return peer
+
+
+def is_internal_request(request: Request) -> bool:
+    """Request from another service authenticated with the internal API key"""
+    return bool(settings.internal_api_key) and (
+        request.headers.get("authorization") == f"Token {settings.internal_api_key}"
+    )
+
+
+async def rate_limit_requests(request: Request, call_next):
+    """Per-IP sliding-window limit for all API requests"""
+    if (
+        not settings.rate_limit_enabled
+        or request.url.path.startswith(EXEMPT_PATH_PREFIXES)
+        or is_internal_request(request)
+    ):
+        return await call_next(request)
+
+    allowed, retry_after = await limiter.hit(
+        f"ip:{get_client_ip(request)}", settings.rate_limit_requests, settings.rate_limit_window
+    )
+    if not allowed:
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": "Too many requests, try again later"},
+            headers={"Retry-After": str(retry_after)},
+        )
+    return await call_next(request)
+
+
+def _login_email_key(email: str) -> str:
+    return f"login-email:{email.lower()}"
+
+
+async def enforce_login_rate_limit(request: Request, user_credentials: UserLogin) -> None:
+    """Per-IP and per-email login throttle, checked before user lookup and bcrypt.
+
+    Every attempt counts against the client IP; only failed ones (record_failed_login)
+    count against the email, so its owner logging in repeatedly is never locked out.
+    """
+    if not settings.rate_limit_enabled:
+        return
+
+    window = settings.login_rate_limit_window
+    allowed, retry_after = await limiter.hit(
+        f"login-ip:{get_client_ip(request)}", settings.login_rate_limit_ip_attempts, window
+    )
+    if allowed:
+        allowed, retry_after = await limiter.peek(
+            _login_email_key(user_credentials.email), settings.login_rate_limit_attempts, window
+        )
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def record_failed_login(email: str) -> None:
+    """Count a failed login against the email (called from the sync route's worker thread)"""
+    if settings.rate_limit_enabled:
+        anyio.from_thread.run(
+            limiter.hit, _login_email_key(email), settings.login_rate_limit_attempts, settings.login_rate_limit_window
+        )
@@ -0,0 +1,35 @@
+"""Server span per request, continuing the caller's traceparent (see src/utils/tracing.py).
+
+Identical to the backend's src/middleware/tracing.py.
+"""
+from fastapi import Request
+
+from src.utils.tracing import KIND_SERVER, TRACEPARENT_HEADER, begin_span, end_span, tracing_enabled
+
+
+async def tracing_middleware(request: Request, call_next):
+    if not tracing_enabled():
+        return await call_next(request)
+
+    span, token = begin_span(
+        f"{request.method} {request.url.path}", KIND_SERVER, request.headers.get(TRACEPARENT_HEADER)
+    )
+    span.set("http.method", request.method)
+    span.set("http.target", request.url.path)
+    try:
+        response = await call_next(request)
+    except Exception as exc:
+        span.set("http.status_code", 500)
+        end_span(span, token, exc)
+        raise
+    route = request.scope.get("route")
+    if route is not None:
+        span.name = f"{request.method} {route.path}"
+        span.set("http.route", route.path)
+    span.set("http.status_code", response.status_code)
+    if response.status_code >= 500:
+        span.error = f"HTTP {response.status_code}"
+    end_span(span, token)
+    # Lets clients (load tests, the replayer) look up the trace of a slow response
+    response.headers[TRACEPARENT_HEADER] = span.traceparent()
+    return response
@@ -3,6 +3,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -11,26 +12,26 @@ from sqlalchemy import (
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 import uuid
 from datetime import datetime
-from passlib.context import CryptContext
 from src.config import settings
+from src.utils.password_hasher import password_hasher
+from src.utils.query_stats import install_query_stats
+from src.utils.tracing import install_tracing
 
 # Database setup
-engine = create_engine(settings.database_url)
+engine = create_engine(
+    settings.database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+)
+install_query_stats(engine)
+install_tracing(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-# Password hashing
-pwd_context = CryptContext(
-    schemes=["bcrypt"], 
-    deprecated="auto",
-    bcrypt__rounds=12,
-    bcrypt__min_rounds=10,
-    bcrypt__max_rounds=15
-)
-
 
 class User(Base):
     __tablename__ = "users"
@@ -47,10 +48,16 @@ class User(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def verify_password(self, password: str) -> bool:
-        return pwd_context.verify(password, self.password_hash)
+        """Verify password; rehashes password_hash in place if policy requires (caller commits)"""
+        # Runs in the password hashing pool, may raise PasswordHasherBusy
+        verified, new_hash = password_hasher.verify_and_update(password, self.password_hash)
+        if verified and new_hash:
+            self.password_hash = new_hash
+        return verified
 
     def set_password(self, password: str):
-        self.password_hash = pwd_context.hash(password)
+        # Runs in the password hashing pool, may raise PasswordHasherBusy
+        self.password_hash = password_hasher.hash(password)
 
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>"
@@ -60,16 +67,15 @@ class Subscriber(Base):
     __tablename__ = "subscribers"
     __table_args__ = (
         UniqueConstraint("subscriber_id", "author_id", name="uq_subscriber_author"),
+        # Keyset pagination of followers / following lists, newest first
+        Index("ix_subscribers_author_created", "author_id", "created_at", "id"),
+        Index("ix_subscribers_subscriber_created", "subscriber_id", "created_at", "id"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    subscriber_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
-    )
-    author_id = Column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
-    )
-    created_at = Column(DateTime, default=datetime.utcnow)
+    subscriber_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    author_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     subscriber = relationship(
         "User", back_populates="subscriptions", foreign_keys=[subscriber_id]
@@ -93,20 +99,43 @@ User.subscriptions = relationship(
 )
 
 
+class FollowCount(Base):
+    """Denormalized follower / following counters, updated in the subscribe transaction"""
+    __tablename__ = "follow_counts"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    followers_count = Column(Integer, default=0, nullable=False)
+    following_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return (
+            f"<FollowCount(user_id={self.user_id}, followers={self.followers_count}, "
+            f"following={self.following_count})>"
+        )
+
+
 class NotificationLog(Base):
     __tablename__ = "notification_logs"
+    # Partitioned by month of article_published_at (alembic 004/005), old months dropped by the worker
     __table_args__ = (
         UniqueConstraint(
             "subscriber_id",
             "article_id",
+            "article_published_at",
             name="uq_notification_subscriber_article",
         ),
+        {"postgresql_partition_by": "RANGE (article_published_at)"},
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    subscriber_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    author_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    article_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    subscriber_id = Column(UUID(as_uuid=True), nullable=False)
+    author_id = Column(UUID(as_uuid=True), nullable=False)
+    article_id = Column(UUID(as_uuid=True), nullable=False)
+    # Partition key, part of primary and unique keys
+    article_published_at = Column(DateTime, primary_key=True, nullable=False)
+    # Every article of a coalesced digest (the row is keyed by the newest one); NULL otherwise
+    coalesced_article_ids = Column(ARRAY(UUID(as_uuid=True)), nullable=True)
     status = Column(String(32), default="pending", nullable=False)
     attempts = Column(Integer, default=0, nullable=False)
     last_error = Column(Text, nullable=True)
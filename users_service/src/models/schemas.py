@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -52,6 +52,26 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class UserProfileResponse(BaseModel):
+    """Public profile embedded by other services (no email or keys)"""
+    id: UUID
+    username: str
+    bio: Optional[str] = None
+    image_url: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FollowResponse(UserProfileResponse):
+    """Entry of a followers / following list"""
+    followed_at: datetime
+
+
+class UserBatchRequest(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, description="User IDs to look up")
+
+
 class SubscriptionKeyUpdate(BaseModel):
     subscription_key: str = Field(..., min_length=10, max_length=255)
 
@@ -60,6 +80,10 @@ class SubscribeRequest(BaseModel):
     target_user_id: UUID = Field(..., description="Author to follow")
 
 
+class BulkSubscribeRequest(BaseModel):
+    target_user_ids: List[UUID] = Field(..., min_length=1, description="Authors to follow or unfollow")
+
+
 # Auth schemas
 class Token(BaseModel):
     access_token: str
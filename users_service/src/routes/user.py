@@ -6,6 +6,7 @@ from src.models.schemas import (
 )
 from src.controllers.crud import UserCRUD
 from src.middleware.auth import get_current_active_user
+from src.utils.password_hasher import PasswordHasherBusy
 
 router = APIRouter(prefix="/api/user", tags=["user"])
 
@@ -53,6 +54,12 @@ def update_current_user(
         )
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many requests, try again later",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
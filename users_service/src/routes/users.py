@@ -1,18 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
+from typing import Optional
+from uuid import UUID
 from src.models.database import User, get_db
 from src.models.schemas import (
+    BulkSubscribeRequest,
+    FollowResponse,
     SubscribeRequest,
     SubscriptionKeyUpdate,
     SuccessResponse,
+    UserBatchRequest,
     UserCreate,
     UserLogin,
+    UserProfileResponse,
     UserResponse,
 )
 from src.controllers.crud import SubscriptionCRUD, UserCRUD
 from src.middleware.auth import get_current_active_user
+from src.middleware.rate_limit import enforce_login_rate_limit, record_failed_login
 from src.utils.auth import create_access_token
+from src.utils.password_hasher import PasswordHasherBusy
 from src.config import settings
 
 router = APIRouter(prefix="/api/users", tags=["users"])
@@ -30,6 +38,13 @@ def get_users_api_info():
             "POST /api/users/login": "Login user and get access token",
             "PUT /api/users/me/subscription-key": "Save push subscription key",
             "POST /api/users/subscribe": "Subscribe to another user",
+            "POST /api/users/unsubscribe": "Unsubscribe from another user",
+            "POST /api/users/subscribe/bulk": "Subscribe to several users at once",
+            "POST /api/users/unsubscribe/bulk": "Unsubscribe from several users at once",
+            "GET /api/users/{user_id}/followers": "List followers (keyset pagination via cursor)",
+            "GET /api/users/{user_id}/following": "List followed users (keyset pagination via cursor)",
+            "GET /api/users/{user_id}/follow-counts": "Get followers and following counts",
+            "POST /api/users/batch": "Get public profiles for a list of user IDs",
         }
     }
 
@@ -55,6 +70,12 @@ def register_user(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
         )
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many requests, try again later",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -62,6 +83,25 @@ def register_user(
         )
 
 
+@router.post("/batch", response_model=SuccessResponse)
+def get_users_batch(
+    payload: UserBatchRequest,
+    db: Session = Depends(get_db),
+):
+    """Get compact public profiles for up to batch_lookup_max_ids users in one query."""
+    if len(payload.ids) > settings.batch_lookup_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.batch_lookup_max_ids} IDs per request",
+        )
+    crud = UserCRUD(db)
+    profiles = crud.get_profiles_by_ids(payload.ids)
+    return SuccessResponse(
+        message="Users retrieved successfully",
+        data={"users": [UserProfileResponse.model_validate(profile).model_dump() for profile in profiles]},
+    )
+
+
 @router.put("/me/subscription-key", response_model=SuccessResponse)
 def save_subscription_key(
     payload: SubscriptionKeyUpdate,
@@ -100,9 +140,121 @@ def subscribe_user(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@router.post("/unsubscribe", status_code=status.HTTP_204_NO_CONTENT)
+def unsubscribe_user(
+    payload: SubscribeRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Unsubscribe current user from an author (no-op if not subscribed)."""
+    crud = SubscriptionCRUD(db)
+    crud.unsubscribe(current_user.id, payload.target_user_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def _check_bulk_size(payload: BulkSubscribeRequest) -> None:
+    if len(payload.target_user_ids) > settings.bulk_subscribe_max_targets:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.bulk_subscribe_max_targets} users per request",
+        )
+
+
+@router.post("/subscribe/bulk", response_model=SuccessResponse)
+def subscribe_users_bulk(
+    payload: BulkSubscribeRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Subscribe current user to several authors in one transaction."""
+    _check_bulk_size(payload)
+    crud = SubscriptionCRUD(db)
+    result = crud.subscribe_many(current_user.id, payload.target_user_ids)
+    return SuccessResponse(message="Subscriptions updated", data=result)
+
+
+@router.post("/unsubscribe/bulk", response_model=SuccessResponse)
+def unsubscribe_users_bulk(
+    payload: BulkSubscribeRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Unsubscribe current user from several authors in one transaction."""
+    _check_bulk_size(payload)
+    crud = SubscriptionCRUD(db)
+    result = crud.unsubscribe_many(current_user.id, payload.target_user_ids)
+    return SuccessResponse(message="Subscriptions updated", data=result)
+
+
+def _follow_list_response(message: str, user_id: UUID, rows: list, next_cursor: Optional[str], count: int):
+    return SuccessResponse(
+        message=message,
+        data={
+            "user_id": user_id,
+            "users": [FollowResponse.model_validate(row).model_dump() for row in rows],
+            "count": count,
+            "next_cursor": next_cursor,
+        },
+    )
+
+
+@router.get("/{user_id}/followers", response_model=SuccessResponse)
+def get_followers(
+    user_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db),
+):
+    """List users following user_id, newest first."""
+    crud = SubscriptionCRUD(db)
+    try:
+        rows, next_cursor = crud.get_followers(user_id, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    count = crud.get_follow_counts(user_id)["followers"]
+    return _follow_list_response("Followers retrieved successfully", user_id, rows, next_cursor, count)
+
+
+@router.get("/{user_id}/following", response_model=SuccessResponse)
+def get_following(
+    user_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db),
+):
+    """List users followed by user_id, newest first."""
+    crud = SubscriptionCRUD(db)
+    try:
+        rows, next_cursor = crud.get_following(user_id, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    count = crud.get_follow_counts(user_id)["following"]
+    return _follow_list_response("Following retrieved successfully", user_id, rows, next_cursor, count)
+
+
+@router.get("/{user_id}/follow-counts", response_model=SuccessResponse)
+def get_follow_counts(
+    user_id: UUID,
+    db: Session = Depends(get_db),
+):
+    """Get followers and following counts from the counter table."""
+    crud = SubscriptionCRUD(db)
+    return SuccessResponse(
+        message="Follow counts retrieved successfully",
+        data={"user_id": user_id, **crud.get_follow_counts(user_id)},
+    )
+
+
 @router.post("/login", response_model=SuccessResponse)
 def login_user(
     user_credentials: UserLogin,
+    _: None = Depends(enforce_login_rate_limit),
     db: Session = Depends(get_db)
 ):
     """Authenticate user and return access token"""
@@ -111,6 +263,7 @@ def login_user(
         user = crud.authenticate_user(user_credentials.email, user_credentials.password)
         
         if not user:
+            record_failed_login(user_credentials.email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -132,6 +285,12 @@ def login_user(
         )
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many requests, try again later",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
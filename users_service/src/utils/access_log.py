@@ -0,0 +1,87 @@
+"""Structured access log: one JSON line per request, written off the event loop.
+
+Successful fast requests are sampled (ACCESS_LOG_SAMPLE_RATE); responses with status >= 400,
+unhandled exceptions and requests slower than ACCESS_LOG_SLOW_MS are always logged. The
+sampling decision is taken before anything is formatted, and records go through a
+QueueHandler so serialization and the stdout write happen in the QueueListener thread.
+Each line carries `sample_rate` so counts can be re-weighted downstream.
+
+Kept identical to the backend's src/utils/access_log.py.
+"""
+import logging
+import queue
+import random
+import sys
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+import orjson
+from fastapi import Request
+
+from src.config import settings
+
+ACCESS_LOGGER_NAME = "access"
+
+
+class JsonFormatter(logging.Formatter):
+    """Renders the record's `access` dict as one JSON line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        timestamp = datetime.utcfromtimestamp(record.created).isoformat(timespec="milliseconds") + "Z"
+        return orjson.dumps({"ts": timestamp, **record.access}).decode()
+
+
+class AccessLog:
+    def __init__(self):
+        self._logger = logging.getLogger(ACCESS_LOGGER_NAME)
+        # Access lines go only to the JSON handler, never to the root (plain text) handlers
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._listener: Optional[QueueListener] = None
+
+    def start(self) -> None:
+        if self._listener is not None:
+            return
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JsonFormatter())
+        self._logger.addHandler(QueueHandler(self._queue))
+        self._listener = QueueListener(self._queue, handler)
+        self._listener.start()
+
+    def stop(self) -> None:
+        """Flush queued lines and stop the writer thread"""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        self._listener = None
+        for handler in list(self._logger.handlers):
+            self._logger.removeHandler(handler)
+
+    def log(self, request: Request, status_code: int, duration_ms: float) -> None:
+        if not settings.access_log_enabled:
+            return
+        always = status_code >= 400 or duration_ms >= settings.access_log_slow_ms
+        sample_rate = 1.0 if always else settings.access_log_sample_rate
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            return
+
+        route = request.scope.get("route")
+        record = {
+            "method": request.method,
+            "route": route.path if route is not None else None,
+            "path": request.url.path,
+            "status": status_code,
+            "duration_ms": round(duration_ms, 2),
+            "client": request.client.host if request.client else None,
+            "sample_rate": sample_rate,
+        }
+        query_stats = getattr(request.state, "query_stats", None)
+        if query_stats is not None:
+            record["db_queries"] = query_stats.count
+            record["db_ms"] = round(query_stats.total_ms, 2)
+        self._logger.info("access", extra={"access": record})
+
+
+access_log = AccessLog()
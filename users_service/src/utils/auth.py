@@ -1,36 +1,20 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from src.config import settings
-
-pwd_context = CryptContext(
-    schemes=["bcrypt"], 
-    deprecated="auto",
-    bcrypt__rounds=12,
-    bcrypt__min_rounds=10,
-    bcrypt__max_rounds=15
-)
+from src.utils.password_hasher import password_hasher
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    try:
-        return pwd_context.verify(plain_password, hashed_password)
-    except Exception as e:
-        print(f"Warning: bcrypt verification failed: {e}")
-        return False
+    verified, _ = password_hasher.verify_and_update(plain_password, hashed_password)
+    return verified
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    try:
-        return pwd_context.hash(password)
-    except Exception as e:
-        print(f"Warning: bcrypt hashing failed: {e}")
-        import hashlib
-        return hashlib.sha256(password.encode()).hexdigest()
+    """Hash a password with the current hashing policy"""
+    return password_hasher.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -0,0 +1,178 @@
+"""Password hashing in a dedicated bounded process pool.
+
+bcrypt is CPU bound (~250ms at 12 rounds), so running it inline in route handlers ties up
+the threadpool and starves cheap endpoints during login/register bursts. Hashing runs in
+`password_hash_workers` processes; at most `password_hash_max_pending` operations may be
+running or queued at once, further calls fail fast with PasswordHasherBusy (mapped to 503);
+calls waiting longer than `password_hash_timeout_seconds` fail the same way.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from src.config import settings
+from src.utils.password_policy import build_crypt_context, resolve_policy
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusy(Exception):
+    """Too many password hashing operations are already running or queued"""
+
+
+# CryptContext of the current process (pool worker or inline mode)
+_context: Optional[CryptContext] = None
+
+
+def _init_worker(policy: dict) -> None:
+    global _context
+    if _context is None:
+        _context = build_crypt_context(policy)
+
+
+def _warm_up() -> None:
+    pass
+
+
+def _hash(password: str) -> str:
+    return _context.hash(password)
+
+
+def _verify_and_update(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    return _context.verify_and_update(password, password_hash)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._policy: Optional[dict] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    def _get_policy(self) -> dict:
+        # Called under self._lock; calibration runs once per server process
+        if self._policy is None:
+            self._policy = resolve_policy()
+        return self._policy
+
+    def resolve_policy(self) -> dict:
+        """Calibrate now; gunicorn calls this in the master so forked workers share one policy"""
+        with self._lock:
+            return self._get_policy()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: workers must not inherit DB connections or locks of the server process
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._get_policy(),),
+            )
+        return self._executor
+
+    def start(self) -> None:
+        """Calibrate the policy and create the pool ahead of the first request"""
+        with self._lock:
+            if self.workers <= 0:
+                _init_worker(self._get_policy())
+                return
+            executor = self._get_executor()
+        # Force worker processes to spawn now rather than on the first login
+        futures = [executor.submit(_warm_up) for _ in range(self.workers)]
+        for future in futures:
+            future.result(timeout=self.timeout)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        logger.error("Password hashing pool is broken, recreating it")
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+
+    def _run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self._pending += 1
+        if self.workers <= 0:
+            try:
+                with self._lock:
+                    _init_worker(self._get_policy())
+                result = func(*args)
+            finally:
+                self._release()
+        else:
+            try:
+                with self._lock:
+                    executor = self._get_executor()
+                future = executor.submit(func, *args)
+            except Exception as exc:
+                self._release()
+                if isinstance(exc, BrokenProcessPool):
+                    self._discard_executor(executor)
+                raise
+            # The slot is held until the job leaves the pool, also after the caller timed out
+            future.add_done_callback(self._release)
+            try:
+                result = future.result(timeout=self.timeout)
+            except FuturesTimeoutError as exc:
+                future.cancel()  # still queued: dropped, its slot freed right away
+                with self._lock:
+                    self._timed_out += 1
+                raise PasswordHasherBusy("Password hashing timed out") from exc
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                raise
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """Verify password; also return a new hash if the stored one is below current policy"""
+        return self._run(_verify_and_update, password, password_hash)
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = self._pending
+            return {
+                "policy": self._policy,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": min(pending, max(self.workers, 1)),
+                "queue_depth": max(0, pending - max(self.workers, 1)),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+    timeout=settings.password_hash_timeout_seconds,
+)
@@ -0,0 +1,102 @@
+"""Password hashing policy: scheme, cost calibration and rehash rules.
+
+The cost is picked at startup: the highest bcrypt rounds / argon2 time_cost whose hash time
+fits into `password_hash_budget_ms` on this machine (or pinned via `password_hash_rounds`).
+Hashes made with a weaker cost or another scheme report needs_update, so they are rehashed
+transparently on the next successful login.
+"""
+import logging
+import time
+from typing import Dict, Optional
+
+from passlib.context import CryptContext
+from passlib.hash import argon2, bcrypt
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Allowed cost range per scheme (bcrypt: log2 rounds, argon2: time_cost)
+COST_BOUNDS: Dict[str, tuple] = {
+    "bcrypt": (10, 15),
+    "argon2": (2, 10),
+}
+
+# Verified for existing users but always rehashed (unsalted hashes from an old fallback)
+LEGACY_SCHEMES = ["hex_sha256"]
+
+_CALIBRATION_PASSWORD = "calibration-password"
+
+
+def _available_schemes() -> list:
+    return ["bcrypt"] + (["argon2"] if argon2.has_backend() else [])
+
+
+def _resolve_scheme(scheme: str) -> str:
+    if scheme not in COST_BOUNDS:
+        raise ValueError(f"Unsupported password hash scheme: {scheme}")
+    if scheme == "argon2" and not argon2.has_backend():
+        logger.warning("argon2 backend (argon2-cffi) is not installed, falling back to bcrypt")
+        return "bcrypt"
+    return scheme
+
+
+def _handler_options(scheme: str, cost: int) -> dict:
+    if scheme == "argon2":
+        return {
+            "type": "ID",
+            "rounds": cost,
+            "memory_cost": settings.password_argon2_memory_kib,
+            "parallelism": settings.password_argon2_parallelism,
+        }
+    return {"rounds": cost}
+
+
+def _measure_ms(scheme: str, cost: int) -> float:
+    handler = (argon2 if scheme == "argon2" else bcrypt).using(**_handler_options(scheme, cost))
+    start = time.perf_counter()
+    handler.hash(_CALIBRATION_PASSWORD)
+    return (time.perf_counter() - start) * 1000
+
+
+def calibrate_cost(scheme: str, budget_ms: float) -> int:
+    """Highest cost within bounds whose hash time fits the latency budget"""
+    min_cost, max_cost = COST_BOUNDS[scheme]
+    chosen = min_cost
+    for cost in range(min_cost, max_cost + 1):
+        elapsed = _measure_ms(scheme, cost)
+        logger.info("Password hash calibration: %s cost=%s took %.1fms", scheme, cost, elapsed)
+        if elapsed > budget_ms:
+            break
+        chosen = cost
+    return chosen
+
+
+def resolve_policy() -> dict:
+    """Pick scheme and cost for this deployment (once, in the gunicorn master before forking)"""
+    scheme = _resolve_scheme(settings.password_hash_scheme)
+    min_cost, max_cost = COST_BOUNDS[scheme]
+    if settings.password_hash_rounds is not None:
+        cost = max(min_cost, min(max_cost, settings.password_hash_rounds))
+    else:
+        cost = calibrate_cost(scheme, settings.password_hash_budget_ms)
+    logger.info("Password hash policy: scheme=%s cost=%s", scheme, cost)
+    return {"scheme": scheme, "cost": cost}
+
+
+def build_crypt_context(policy: Optional[dict] = None) -> CryptContext:
+    """CryptContext for a policy: hashes with the chosen scheme/cost, verifies all known schemes"""
+    policy = policy or resolve_policy()
+    scheme, cost = policy["scheme"], policy["cost"]
+    schemes = [scheme] + [s for s in ("argon2", "bcrypt") if s != scheme and s in _available_schemes()]
+
+    options = {f"{scheme}__{key}": value for key, value in _handler_options(scheme, cost).items()}
+    # Weaker hashes need update; allow one step above so mixed-hardware replicas don't flip-flop
+    options[f"{scheme}__min_rounds"] = cost
+    options[f"{scheme}__max_rounds"] = min(cost + 1, COST_BOUNDS[scheme][1])
+    return CryptContext(
+        schemes=schemes + LEGACY_SCHEMES,
+        default=scheme,
+        deprecated="auto",
+        **options,
+    )
@@ -0,0 +1,137 @@
+"""Opt-in SQL query accounting per request via SQLAlchemy engine events.
+
+Enabled with QUERY_STATS_ENABLED. Every statement executed while a request is handled
+(see src/middleware/query_stats.py) adds to that request's count and DB time. A
+statement shape (SQL with literals and IN lists collapsed) repeated more than
+query_stats_n_plus_one_threshold times in one request logs an N+1 warning. Per-route
+aggregates are kept in `route_metrics`.
+
+Request-only variant of the backend's src/utils/query_stats.py, which also
+covers Celery tasks; fixes to the shared parts go to both.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_VALUES_LIST_RE = re.compile(r"\bVALUES\s*(\([^()]*\))(?:\s*,\s*\([^()]*\))+", re.IGNORECASE)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(statement: str) -> str:
+    """Statement shape: literals replaced, IN / multi-row VALUES lists collapsed"""
+    shape = _STRING_RE.sub("?", statement)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("IN (...)", shape)
+    shape = _VALUES_LIST_RE.sub(r"VALUES \1, ...", shape)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Queries issued within one request"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+        self._warned = set()
+
+    def add(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        shape = normalize_sql(statement)
+        self.shapes[shape] += 1
+        threshold = settings.query_stats_n_plus_one_threshold
+        if self.shapes[shape] > threshold and shape not in self._warned:
+            self._warned.add(shape)
+            logger.warning(
+                "Possible N+1 in %s: statement repeated more than %s times: %s",
+                self.name,
+                threshold,
+                shape[:300],
+            )
+
+    @property
+    def n_plus_one(self) -> int:
+        return len(self._warned)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+class RouteMetrics:
+    """Process-wide per-route aggregates for /metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, dict] = defaultdict(
+            lambda: {"calls": 0, "queries": 0, "db_ms": 0.0, "max_queries": 0, "n_plus_one": 0}
+        )
+
+    def record(self, stats: QueryStats) -> None:
+        with self._lock:
+            route = self._routes[stats.name]
+            route["calls"] += 1
+            route["queries"] += stats.count
+            route["db_ms"] += stats.total_ms
+            route["max_queries"] = max(route["max_queries"], stats.count)
+            route["n_plus_one"] += stats.n_plus_one
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    **route,
+                    "db_ms": round(route["db_ms"], 2),
+                    "avg_queries": round(route["queries"] / route["calls"], 2),
+                }
+                for name, route in sorted(self._routes.items())
+            }
+
+
+route_metrics = RouteMetrics()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context so failed statements leave nothing behind
+    context._query_stats_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.add(statement, (time.perf_counter() - context._query_stats_start) * 1000)
+
+
+def install_query_stats(engine: Engine) -> None:
+    """Attach counting listeners to an engine (no-op unless QUERY_STATS_ENABLED)"""
+    if not settings.query_stats_enabled or event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def start_scope(name: str):
+    """Start counting for the current context; returns (stats, token) for end_scope"""
+    stats = QueryStats(name)
+    return stats, _current.set(stats)
+
+
+def end_scope(stats: QueryStats, token) -> None:
+    _current.reset(token)
+    route_metrics.record(stats)
+
@@ -0,0 +1,52 @@
+"""Invalidation of the notifier's subscriber cache (read side: src/tasks/subscriber_cache.py).
+
+Called after the DB transaction commits. Failures are logged only: snapshots and cached keys
+expire after the worker's notify_subscriber_cache_ttl_seconds anyway.
+"""
+import logging
+from typing import Iterable, Optional
+from uuid import UUID
+
+import redis
+from redis.exceptions import RedisError
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTION_KEYS_KEY = "notify:subscription-keys"
+
+_client: Optional[redis.Redis] = None
+
+
+def _get_redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+    return _client
+
+
+def subscribers_version_key(author_id: UUID) -> str:
+    return f"notify:subscribers-version:{author_id}"
+
+
+def bump_subscribers_version(author_ids: Iterable[UUID]) -> None:
+    """Mark subscriber snapshots of these authors as stale"""
+    author_ids = list(author_ids)
+    if not author_ids:
+        return
+    try:
+        pipe = _get_redis().pipeline(transaction=False)
+        for author_id in author_ids:
+            pipe.incr(subscribers_version_key(author_id))
+        pipe.execute()
+    except (RedisError, OSError) as exc:
+        logger.warning("Failed to invalidate subscriber cache for %s authors: %s", len(author_ids), exc)
+
+
+def set_subscription_key(user_id: UUID, subscription_key: Optional[str]) -> None:
+    """Publish a user's new push key to the notifier's key cache"""
+    try:
+        _get_redis().hset(SUBSCRIPTION_KEYS_KEY, str(user_id), subscription_key or "")
+    except (RedisError, OSError) as exc:
+        logger.warning("Failed to update cached subscription key of user %s: %s", user_id, exc)